@@ -0,0 +1,64 @@
+"""delta sync cursor indexes and tombstones
+
+Revision ID: 7a3c9e51d2b4
+Revises: 63ee51a58894
+Create Date: 2026-10-17 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3c9e51d2b4'
+down_revision: Union[str, Sequence[str], None] = '63ee51a58894'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ('hospitals', 'doctors', 'services', 'regions', 'districts')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_tombstones',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('modified_at', sa.DateTime(), nullable=True),
+    sa.Column('entity', sa.String(), nullable=False),
+    sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.PrimaryKeyConstraint('entity', 'entity_id')
+    )
+    op.create_index('ix_sync_tombstones_modified_at_entity_id', 'sync_tombstones', ['modified_at', 'entity_id'], unique=False)
+
+    # fires for ORM deletes and ON DELETE CASCADE alike
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (entity, entity_id, created_at, modified_at)
+            VALUES (TG_TABLE_NAME, OLD.id, now(), now())
+            ON CONFLICT (entity, entity_id) DO UPDATE SET modified_at = EXCLUDED.modified_at;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in SYNCED_TABLES:
+        # rows written before modified_at had a default would never be synced
+        op.execute(f"UPDATE {table} SET modified_at = created_at WHERE modified_at IS NULL")
+        op.create_index(f'ix_{table}_modified_at_id', table, ['modified_at', 'id'], unique=False)
+        op.execute(f"""
+            CREATE TRIGGER {table}_sync_tombstone
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_tombstone ON {table}")
+        op.drop_index(f'ix_{table}_modified_at_id', table_name=table)
+    op.execute("DROP FUNCTION IF EXISTS record_sync_tombstone()")
+    op.drop_index('ix_sync_tombstones_modified_at_entity_id', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -0,0 +1,91 @@
+"""compiled working hours schedule
+
+Revision ID: a9d4c7e2b815
+Revises: f3b6a2d91c47
+Create Date: 2026-10-17 15:22:08.914372
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4c7e2b815'
+down_revision: Union[str, Sequence[str], None] = 'f3b6a2d91c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('hospitals', 'doctors')
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+DAY, WEEK = 1440, 7 * 1440
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.strip().split(":")
+    value = int(hours) * 60 + int(minutes)
+    if len(minutes) != 2 or int(minutes) > 59 or value > DAY:
+        raise ValueError(hhmm)
+    return value
+
+
+def _compile(hours: dict) -> list:
+    # frozen copy of app.core.working_hours.compile_schedule
+    intervals = []
+    for day, name in enumerate(WEEKDAYS):
+        value = hours.get(name)
+        if not value or not value.strip():
+            continue
+        for part in value.split(","):
+            start, end = (_minutes(x) for x in part.split("-"))
+            if start == end:
+                raise ValueError(part)
+            if end < start:
+                end += DAY
+            start, end = start + day * DAY, end + day * DAY
+            if end > WEEK:
+                intervals.append((0, end - WEEK))
+                end = WEEK
+            intervals.append((start, end))
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [bound for pair in merged for bound in pair]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for table in TABLES:
+        op.add_column(table, sa.Column('schedule', postgresql.ARRAY(sa.Integer()), nullable=True))
+        rows = bind.execute(
+            sa.text(f"SELECT id, working_hours FROM {table} WHERE working_hours IS NOT NULL")
+        ).all()
+        updates, invalid = [], 0
+        for row_id, hours in rows:
+            if isinstance(hours, str):
+                hours = json.loads(hours)
+            try:
+                updates.append({"id": row_id, "schedule": _compile(hours or {})})
+            except (ValueError, AttributeError):
+                invalid += 1
+        if updates:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET schedule = :schedule WHERE id = :id").bindparams(
+                    sa.bindparam("schedule", type_=postgresql.ARRAY(sa.Integer()))
+                ),
+                updates,
+            )
+        print(f"{table}: compiled {len(updates)} schedules, {invalid} unparseable left empty")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'schedule')
@@ -0,0 +1,33 @@
+"""hospital list keyset indexes
+
+Revision ID: b41e6d0c8f27
+Revises: 7a3c9e51d2b4
+Create Date: 2026-10-17 11:02:18.530944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e6d0c8f27'
+down_revision: Union[str, Sequence[str], None] = '7a3c9e51d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_hospitals_name_id', 'hospitals', ['name', 'id'], unique=False)
+    op.create_index('ix_hospitals_region_id_name_id', 'hospitals', ['region_id', 'name', 'id'], unique=False)
+    op.create_index('ix_hospitals_district_id_name_id', 'hospitals', ['district_id', 'name', 'id'], unique=False)
+    op.create_index('ix_hospitals_reyting', 'hospitals', ['reyting'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hospitals_reyting', table_name='hospitals')
+    op.drop_index('ix_hospitals_district_id_name_id', table_name='hospitals')
+    op.drop_index('ix_hospitals_region_id_name_id', table_name='hospitals')
+    op.drop_index('ix_hospitals_name_id', table_name='hospitals')
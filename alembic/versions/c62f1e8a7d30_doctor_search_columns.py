@@ -0,0 +1,105 @@
+"""doctor search columns
+
+Revision ID: c62f1e8a7d30
+Revises: a9d4c7e2b815
+Create Date: 2026-10-17 16:48:33.207514
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c62f1e8a7d30'
+down_revision: Union[str, Sequence[str], None] = 'a9d4c7e2b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+# frozen copy of app.core.search.normalize
+_TRANSLATE = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    "ў": "o", "қ": "q", "ғ": "g", "ҳ": "h",
+})
+_APOSTROPHES = re.compile(r"['`‘’ʻʼ´]")
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def _normalize(*parts) -> str:
+    text = " ".join(p for p in parts if p).lower().translate(_TRANSLATE)
+    text = _APOSTROPHES.sub("", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('doctors', sa.Column('search_text', sa.Text(), nullable=True))
+    op.add_column('doctors', sa.Column('search_about', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, first_name, last_name, professional, about FROM doctors"
+                + (" WHERE id > :last_id" if last_id else "")
+                + " ORDER BY id LIMIT :batch"
+            ),
+            {"last_id": last_id, "batch": BATCH} if last_id else {"batch": BATCH},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE doctors SET search_text = :text, search_about = :about WHERE id = :id"),
+            [
+                {
+                    "id": row.id,
+                    "text": _normalize(row.first_name, row.last_name, row.professional),
+                    "about": _normalize(row.about),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    # generated after the backfill so the table is rewritten once
+    op.add_column(
+        'doctors',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', coalesce(search_text, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(search_about, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_doctors_search_vector', 'doctors', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_doctors_search_text_trgm',
+        'doctors',
+        ['search_text'],
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_doctors_search_text_trgm', table_name='doctors')
+    op.drop_index('ix_doctors_search_vector', table_name='doctors')
+    op.drop_column('doctors', 'search_vector')
+    op.drop_column('doctors', 'search_about')
+    op.drop_column('doctors', 'search_text')
@@ -0,0 +1,31 @@
+"""queues doctor/start index
+
+Revision ID: d17b5f3e9a62
+Revises: c62f1e8a7d30
+Create Date: 2026-10-17 17:31:45.662019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd17b5f3e9a62'
+down_revision: Union[str, Sequence[str], None] = 'c62f1e8a7d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_queues_doctor_id_appointment_start',
+        'queues',
+        ['doctor_id', 'appointment_start'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_queues_doctor_id_appointment_start', table_name='queues')
@@ -0,0 +1,68 @@
+"""hospital latitude/longitude
+
+Revision ID: d8e2f4a61c53
+Revises: b41e6d0c8f27
+Create Date: 2026-10-17 11:48:05.772410
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2f4a61c53'
+down_revision: Union[str, Sequence[str], None] = 'b41e6d0c8f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# frozen copy of app.core.geo.parse_coordinates
+_COORDS_RE = re.compile(r"(-?\d+(?:\.\d+)?)\s*[,; ]\s*(-?\d+(?:\.\d+)?)")
+
+
+def _parse(value):
+    m = _COORDS_RE.search(value or "")
+    if not m:
+        return None
+    a, b = float(m.group(1)), float(m.group(2))
+    if abs(a) > 90 >= abs(b):
+        a, b = b, a
+    if abs(a) > 90 or abs(b) > 180:
+        return None
+    return a, b
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hospitals', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('hospitals', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_doctors_hospital_id', 'doctors', ['hospital_id'], unique=False)
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, coordinates FROM hospitals WHERE coordinates IS NOT NULL")
+    ).all()
+    updates = []
+    for hospital_id, coordinates in rows:
+        parsed = _parse(coordinates)
+        if parsed:
+            updates.append({"id": hospital_id, "lat": parsed[0], "lon": parsed[1]})
+    if updates:
+        bind.execute(
+            # bump modified_at so delta-sync clients pick the new columns up
+            sa.text(
+                "UPDATE hospitals SET latitude = :lat, longitude = :lon, modified_at = now() "
+                "WHERE id = :id"
+            ),
+            updates,
+        )
+    print(f"hospital coordinates: parsed {len(updates)} of {len(rows)}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_doctors_hospital_id', table_name='doctors')
+    op.drop_column('hospitals', 'longitude')
+    op.drop_column('hospitals', 'latitude')
@@ -0,0 +1,106 @@
+"""move photos to blob store
+
+Revision ID: e5a71c3b9f08
+Revises: d8e2f4a61c53
+Create Date: 2026-10-17 12:37:52.104388
+
+"""
+import base64
+import binascii
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a71c3b9f08'
+down_revision: Union[str, Sequence[str], None] = 'd8e2f4a61c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must match config.BLOB_STORE_DIR of the app that will serve the files
+BLOB_ROOT = Path(os.getenv("BLOB_STORE_DIR", "media/blobs"))
+TABLES = ('hospitals', 'doctors')
+BATCH = 100
+
+
+def _blob_path(digest: str) -> Path:
+    return BLOB_ROOT / digest[:2] / digest[2:4] / digest
+
+
+def _put(data: bytes) -> str:
+    # frozen copy of BlobStore.put_bytes
+    digest = hashlib.sha256(data).hexdigest()
+    target = _blob_path(digest)
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        (BLOB_ROOT / "tmp").mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=BLOB_ROOT / "tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_name, target)
+    return digest
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for table in TABLES:
+        op.add_column(table, sa.Column('photo_digest', sa.String(length=64), nullable=True))
+
+        # keyset batches so only BATCH photos are in memory at a time
+        last_id, moved, skipped = None, 0, 0
+        while True:
+            rows = bind.execute(
+                sa.text(
+                    f"SELECT id, photo FROM {table} WHERE photo IS NOT NULL"
+                    + (" AND id > :last_id" if last_id else "")
+                    + " ORDER BY id LIMIT :batch"
+                ),
+                {"last_id": last_id, "batch": BATCH} if last_id else {"batch": BATCH},
+            ).all()
+            if not rows:
+                break
+            updates = []
+            for row_id, photo in rows:
+                try:
+                    data = base64.b64decode(photo, validate=False)
+                except (binascii.Error, ValueError):
+                    data = b""
+                if data:
+                    updates.append({"id": row_id, "digest": _put(data)})
+                    moved += 1
+                else:
+                    skipped += 1
+            if updates:
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET photo_digest = :digest WHERE id = :id"),
+                    updates,
+                )
+            last_id = rows[-1][0]
+        print(f"{table}: moved {moved} photos to {BLOB_ROOT}, skipped {skipped} undecodable")
+
+        op.drop_column(table, 'photo')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for table in TABLES:
+        op.add_column(table, sa.Column('photo', sa.Text(), nullable=True))
+        rows = bind.execute(
+            sa.text(f"SELECT id, photo_digest FROM {table} WHERE photo_digest IS NOT NULL")
+        ).all()
+        for row_id, digest in rows:
+            path = _blob_path(digest)
+            if path.exists():
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET photo = :photo WHERE id = :id"),
+                    {"id": row_id, "photo": base64.b64encode(path.read_bytes()).decode("ascii")},
+                )
+        op.drop_column(table, 'photo_digest')
@@ -0,0 +1,85 @@
+"""queues overlap constraint and idempotency key
+
+Revision ID: e8b3c5a1f924
+Revises: d17b5f3e9a62
+Create Date: 2026-10-17 18:12:07.418305
+
+"""
+import bisect
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3c5a1f924'
+down_revision: Union[str, Sequence[str], None] = 'd17b5f3e9a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # uuid equality inside a gist exclusion constraint
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.add_column('queues', sa.Column('idempotency_key', sa.String(length=128), nullable=True))
+    op.create_index(
+        'ux_queues_user_id_idempotency_key',
+        'queues',
+        ['user_id', 'idempotency_key'],
+        unique=True,
+    )
+
+    # bookings ending "before" they start ran past midnight on the same date
+    op.execute(
+        "UPDATE queues SET appointment_end = appointment_end + interval '1 day' "
+        "WHERE appointment_end < appointment_start"
+    )
+    # existing double bookings: walk each doctor's live bookings in creation
+    # order and keep the ones that do not overlap a booking already kept
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, doctor_id, appointment_start, appointment_end FROM queues "
+            "WHERE status <> 'cancelled' AND doctor_id IS NOT NULL "
+            "ORDER BY doctor_id, created_at, id"
+        )
+    )
+    cancel = []
+    doctor_id, kept_starts, kept_ends = None, [], []
+    for row in rows:
+        if row.doctor_id != doctor_id:
+            doctor_id, kept_starts, kept_ends = row.doctor_id, [], []
+        start, end = row.appointment_start, row.appointment_end
+        if start == end:
+            continue  # empty range, overlaps nothing
+        # kept ranges are disjoint and sorted: only the neighbours can overlap
+        i = bisect.bisect_left(kept_starts, start)
+        if (i > 0 and kept_ends[i - 1] > start) or (i < len(kept_starts) and kept_starts[i] < end):
+            cancel.append(row.id)
+        else:
+            kept_starts.insert(i, start)
+            kept_ends.insert(i, end)
+
+    for i in range(0, len(cancel), BATCH):
+        bind.execute(
+            sa.text("UPDATE queues SET status = 'cancelled' WHERE id = ANY(:ids)"),
+            {"ids": cancel[i:i + BATCH]},
+        )
+    print(f"queues: cancelled {len(cancel)} overlapping bookings")
+
+    op.execute(
+        "ALTER TABLE queues ADD CONSTRAINT ex_queues_doctor_id_appointment_range "
+        "EXCLUDE USING gist (doctor_id WITH =, tsrange(appointment_start, appointment_end) WITH &&) "
+        "WHERE (status <> 'cancelled')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ex_queues_doctor_id_appointment_range', 'queues')
+    op.drop_index('ux_queues_user_id_idempotency_key', table_name='queues')
+    op.drop_column('queues', 'idempotency_key')
@@ -0,0 +1,33 @@
+"""photo variants
+
+Revision ID: f3b6a2d91c47
+Revises: e5a71c3b9f08
+Create Date: 2026-10-17 14:05:21.530127
+
+Thumbnails for existing photos are rendered out of band:
+
+    python -m app.service.photos backfill-variants
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b6a2d91c47'
+down_revision: Union[str, Sequence[str], None] = 'e5a71c3b9f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hospitals', sa.Column('photo_variants', sa.JSON(), nullable=True))
+    op.add_column('doctors', sa.Column('photo_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('doctors', 'photo_variants')
+    op.drop_column('hospitals', 'photo_variants')
@@ -0,0 +1,78 @@
+"""
+Telegram bot + reminder scheduler worker.
+
+Runs separately from the web app so reminders are scheduled once, whatever
+the number of uvicorn workers:
+
+    python -m app.bot_worker                   # mode from TELEGRAM__MODE
+    python -m app.bot_worker --mode webhook
+"""
+import argparse
+import asyncio
+
+from aiohttp import web
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from loguru import logger
+
+from app.core.config import config
+from app.core.security import password_hasher
+from app.service.photos import purge_orphan_blobs
+from app.service.sync import purge_tombstones
+from app.service.telegram_reminder import create_bot, dp, scheduler
+
+
+async def run_polling() -> None:
+    bot = create_bot()
+    # polling and webhooks are mutually exclusive on Telegram's side
+    await bot.delete_webhook(drop_pending_updates=False)
+    await dp.start_polling(bot)
+
+
+async def run_webhook() -> None:
+    tg = config.telegram
+    if not tg.webhook_url:
+        raise RuntimeError("TELEGRAM__WEBHOOK_URL is required in webhook mode")
+
+    bot = create_bot()
+    await bot.set_webhook(
+        url=tg.webhook_url.rstrip("/") + tg.webhook_path,
+        secret_token=tg.webhook_secret,
+    )
+
+    app = web.Application()
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=tg.webhook_secret).register(
+        app, path=tg.webhook_path
+    )
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, tg.webhook_host, tg.webhook_port).start()
+    logger.info(f"Telegram webhook listening on {tg.webhook_host}:{tg.webhook_port}{tg.webhook_path}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def main(mode: str | None = None) -> None:
+    mode = mode or config.telegram.mode
+    scheduler.add_job(purge_tombstones, "interval", hours=24, id="purge_sync_tombstones")
+    scheduler.add_job(purge_orphan_blobs, "interval", hours=24, id="purge_orphan_blobs")
+    scheduler.start()
+    try:
+        if mode == "webhook":
+            await run_webhook()
+        elif mode == "polling":
+            await run_polling()
+        else:
+            raise RuntimeError(f"Unknown TELEGRAM__MODE {mode!r} (expected polling or webhook)")
+    finally:
+        scheduler.shutdown(wait=False)
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["polling", "webhook"], default=None)
+    asyncio.run(main(parser.parse_args().mode))
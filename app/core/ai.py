@@ -0,0 +1,111 @@
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+
+from app.core.config import config
+
+# openai/tiktoken are imported on first use to keep app startup light
+if TYPE_CHECKING:
+    import tiktoken
+    from openai import AsyncOpenAI
+
+# Pricing constants for gpt-3.5-turbo (change if you switch models)
+INPUT_PRICE_PER_K1 = 0.0015  # $0.0015 per 1K input tokens
+OUTPUT_PRICE_PER_K1 = 0.002  # $0.002  per 1K output tokens
+PER_CALL_DOLLAR_LIMIT = 0.01  # $0.01 max per call
+
+# one client per process: keeps the HTTP connection pool alive between messages
+_client: Optional["AsyncOpenAI"] = None
+
+
+def get_openai_client() -> "AsyncOpenAI":
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+
+        _client = AsyncOpenAI(
+            api_key=config.ai.openai_api_key,
+            base_url=config.ai.base_url,
+            timeout=config.ai.timeout,
+        )
+    return _client
+
+
+async def close_openai_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+@lru_cache(maxsize=8)
+def get_encoding(model_name: str) -> "tiktoken.Encoding":
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        # unknown/new model names: fall back to the current default vocabulary
+        return tiktoken.get_encoding("cl100k_base")
+
+
+async def warm_up() -> None:
+    """Import the client libraries and load the tokenizer in a worker thread."""
+    if not config.ai.model_name:
+        return
+    try:
+        await asyncio.to_thread(get_encoding, config.ai.model_name)
+        await asyncio.to_thread(get_openai_client)
+    except Exception as e:
+        # first chat request will retry and surface the error
+        logger.warning(f"AI warm-up failed: {e}")
+
+
+def _count_tokens(enc: "tiktoken.Encoding", messages: list[dict]) -> int:
+    return sum(len(enc.encode(m["content"])) for m in messages)
+
+
+async def count_tokens(messages: list[dict]) -> int:
+    """Token count of `messages`; long histories are encoded in a thread."""
+    enc = get_encoding(config.ai.model_name)
+    total_chars = sum(len(m["content"]) for m in messages)
+    if total_chars > config.ai.offload_tokenize_chars:
+        return await asyncio.to_thread(_count_tokens, enc, messages)
+    return _count_tokens(enc, messages)
+
+
+async def get_chat_response(messages: list[dict]) -> str:
+    # 1️⃣ Count input tokens
+    input_tokens = await count_tokens(messages)
+
+    # 2️⃣ Assume the full response budget
+    output_tokens = config.ai.max_tokens
+
+    # 3️⃣ Estimate cost
+    estimated_cost = (
+        input_tokens * INPUT_PRICE_PER_K1 / 1_000
+        + output_tokens * OUTPUT_PRICE_PER_K1 / 1_000
+    )
+
+    # 4️⃣ Enforce your per-call budget
+    if estimated_cost > PER_CALL_DOLLAR_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Estimated cost ${estimated_cost:.4f} exceeds "
+                f"per-call limit of ${PER_CALL_DOLLAR_LIMIT:.2f}"
+            ),
+        )
+
+    # 5️⃣ Perform the API call
+    resp = await get_openai_client().chat.completions.create(
+        model=config.ai.model_name,
+        temperature=config.ai.temperature,
+        messages=messages,
+        max_tokens=config.ai.max_tokens,
+    )
+
+    return resp.choices[0].message.content
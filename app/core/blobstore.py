@@ -0,0 +1,308 @@
+"""
+Content-addressed blob store on the local filesystem.
+
+A blob lives at ``<root>/<aa>/<bb>/<sha256>``; identical uploads share one
+file and a digest never changes meaning, so blobs are immutable and can be
+cached forever. Uploads are streamed in chunks to a temp file while being
+hashed, then renamed into place.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import config
+from app.core.etag import etag_matches
+from app.exc import LoggedHTTPException
+
+CHUNK_SIZE = 64 * 1024
+# room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# leading bytes -> content type; anything else is rejected
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, content_type in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+@dataclass(frozen=True)
+class Blob:
+    digest: str
+    size: int
+    content_type: str
+
+
+class BlobStore:
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        if not _DIGEST_RE.match(digest):
+            raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Blob not found")
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def _tmp_dir(self) -> Path:
+        tmp = self.root / "tmp"
+        tmp.mkdir(parents=True, exist_ok=True)
+        return tmp
+
+    async def save_upload(self, upload: UploadFile, max_bytes: int) -> Blob:
+        """
+        Stream `upload` into the store. Raises 413 past `max_bytes` and 415
+        for anything that is not a JPEG/PNG/WebP/GIF image.
+        """
+        fd, tmp_name = await asyncio.to_thread(tempfile.mkstemp, dir=self._tmp_dir())
+        tmp = os.fdopen(fd, "wb")
+        hasher = hashlib.sha256()
+        size = 0
+        content_type = None
+        try:
+            while chunk := await upload.read(CHUNK_SIZE):
+                if content_type is None:
+                    content_type = sniff_image_type(chunk)
+                    if content_type is None:
+                        raise LoggedHTTPException(
+                            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            "Photo must be a JPEG, PNG, WebP or GIF image",
+                        )
+                size += len(chunk)
+                if size > max_bytes:
+                    raise LoggedHTTPException(
+                        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        f"Photo exceeds {max_bytes // 1024} KiB",
+                    )
+                hasher.update(chunk)
+                await asyncio.to_thread(tmp.write, chunk)
+            if content_type is None:
+                raise LoggedHTTPException(status.HTTP_400_BAD_REQUEST, "Empty upload")
+            await asyncio.to_thread(tmp.close)
+            digest = hasher.hexdigest()
+            await asyncio.to_thread(self._commit, tmp_name, digest)
+            return Blob(digest=digest, size=size, content_type=content_type)
+        except BaseException:
+            tmp.close()
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def _commit(self, tmp_name: str, digest: str) -> None:
+        target = self.path(digest)
+        if target.exists():
+            # same content already stored; refresh its mtime so the GC grace
+            # period covers the row about to reference it
+            os.unlink(tmp_name)
+            os.utime(target)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_name, target)
+
+    def put_bytes(self, data: bytes) -> str:
+        """Synchronous write of an in-memory blob (used by migrations/scripts)."""
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path(digest)
+        if target.exists():
+            os.utime(target)
+            return digest
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp_dir())
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_name, target)
+        return digest
+
+    def content_type(self, digest: str) -> Optional[str]:
+        with open(self.path(digest), "rb") as f:
+            return sniff_image_type(f.read(16))
+
+    def iter_digests(self, older_than_seconds: float) -> Iterable[str]:
+        cutoff = time.time() - older_than_seconds
+        for path in self.root.glob("??/??/*"):
+            if _DIGEST_RE.match(path.name) and path.stat().st_mtime < cutoff:
+                yield path.name
+
+    def delete(self, digest: str, older_than_seconds: Optional[float] = None) -> bool:
+        """Remove a blob; with `older_than_seconds`, only if it was not touched since."""
+        path = self.path(digest)
+        try:
+            if older_than_seconds is not None and path.stat().st_mtime >= time.time() - older_than_seconds:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def purge_tmp(self, older_than_seconds: float) -> int:
+        """Remove temp files left behind by uploads that died mid-write."""
+        cutoff = time.time() - older_than_seconds
+        removed = 0
+        for path in (self.root / "tmp").glob("*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+blob_store = BlobStore(config.BLOB_STORE_DIR)
+
+
+class PhotoUploadLimitMiddleware:
+    """
+    Caps the request body of photo uploads (POST .../photo) before Starlette's
+    multipart parser spools the file part to disk, which it does in full and
+    without a size limit: a declared Content-Length over the cap is refused
+    up front, and a body that keeps coming is cut off as it streams in.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].endswith("/photo")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        max_body = config.PHOTO_MAX_BYTES + MULTIPART_OVERHEAD_BYTES
+        detail = f"Photo exceeds {config.PHOTO_MAX_BYTES // 1024} KiB"
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > max_body:
+            response = JSONResponse(
+                {"detail": detail},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def capped_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    raise LoggedHTTPException(
+                        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail
+                    )
+            return message
+
+        await self.app(scope, capped_receive, send)
+
+
+# _parse_range result for a well-formed range that lies outside the blob
+RANGE_NOT_SATISFIABLE = (-1, -1)
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Single `bytes=` range -> inclusive (start, end), or RANGE_NOT_SATISFIABLE.
+    None for anything else (multiple ranges, other units, malformed): such a
+    Range header is ignored and the full body served.
+    """
+    m = _RANGE_RE.match(header.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        return None
+    if not m.group(1):
+        # suffix range: the last N bytes
+        length = int(m.group(2))
+        if length == 0 or size == 0:
+            return RANGE_NOT_SATISFIABLE
+        return max(size - length, 0), size - 1
+    start = int(m.group(1))
+    if m.group(2) and int(m.group(2)) < start:
+        return None
+    if start >= size:
+        return RANGE_NOT_SATISFIABLE
+    end = int(m.group(2)) if m.group(2) else size - 1
+    return start, min(end, size - 1)
+
+
+class _WholeFileResponse(FileResponse):
+    """FileResponse that always sends the full body; ranges are handled above."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        headers = [(k, v) for k, v in scope["headers"] if k != b"range"]
+        await super().__call__({**scope, "headers": headers}, receive, send)
+
+
+def _read_range(path: Path, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+
+async def blob_response(
+    request: Request,
+    digest: str,
+    cache_control: str = IMMUTABLE_CACHE_CONTROL,
+) -> Response:
+    """
+    Serve a stored blob: strong ETag (the digest), 304 on If-None-Match,
+    206 for a single `Range`, 416 when the range cannot be satisfied, and the
+    full body for Range headers it does not support.
+    """
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = blob_store.path(digest)
+    try:
+        size = (await asyncio.to_thread(path.stat)).st_size
+        content_type = await asyncio.to_thread(blob_store.content_type, digest) or "application/octet-stream"
+    except FileNotFoundError:
+        raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Photo file is missing")
+
+    range_header = request.headers.get("range")
+    # If-Range: only honour the range when the client's copy is current
+    byte_range = None
+    if range_header and request.headers.get("if-range", etag) == etag:
+        byte_range = _parse_range(range_header, size)
+    if byte_range is not None:
+        if byte_range is RANGE_NOT_SATISFIABLE:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+        start, end = byte_range
+        body = await asyncio.to_thread(_read_range, path, start, end)
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return Response(
+            content=body,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            headers=headers,
+            media_type=content_type,
+        )
+
+    return _WholeFileResponse(path, media_type=content_type, headers=headers)
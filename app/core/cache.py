@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache with a per-entry time-to-live.
+
+    Entries expire `ttl` seconds after they were written; once `maxsize`
+    entries are stored the least recently used one is evicted.
+    Hit/miss/eviction counters are kept so the cache can be tuned.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class Snapshot(Generic[T]):
+    """
+    Process-wide immutable value built from the database.
+
+    Readers share the current value; `invalidate()` drops it and the next
+    reader rebuilds it (one build at a time, the rest wait for it). The
+    replacement is a single reference swap, so readers never see a partial
+    value. `ttl` bounds staleness for writes committed by other processes.
+
+    Builds run in their own session from `session_factory`, so they read
+    the primary whatever session the caller holds. A build that overlaps
+    an `invalidate()` may have read pre-commit rows; it is not stored and
+    the build is retried.
+    """
+
+    # builds retried while invalidations keep landing, then served uncached
+    MAX_BUILD_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        build: Callable[[Any], Awaitable[T]],
+        ttl: float,
+        session_factory: Callable[[], Any],
+    ) -> None:
+        self._build = build
+        self.ttl = ttl
+        self._session_factory = session_factory
+        self._value: Optional[T] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self.builds = 0
+        self.invalidations = 0
+        self.discarded_builds = 0
+
+    def _fresh(self) -> Optional[T]:
+        if self._value is not None and time.monotonic() - self._built_at < self.ttl:
+            return self._value
+        return None
+
+    async def get(self) -> T:
+        value = self._fresh()
+        if value is not None:
+            return value
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            value = self._fresh()
+            if value is not None:
+                return value
+            for _ in range(self.MAX_BUILD_ATTEMPTS):
+                generation = self._generation
+                async with self._session_factory() as db:
+                    value = await self._build(db)
+                self.builds += 1
+                if generation == self._generation:
+                    self._value, self._built_at = value, time.monotonic()
+                    break
+                self.discarded_builds += 1
+            return value
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._value = None
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._value is not None,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._value is not None else None,
+            "ttl_seconds": self.ttl,
+            "builds": self.builds,
+            "discarded_builds": self.discarded_builds,
+            "invalidations": self.invalidations,
+        }
@@ -1,18 +1,35 @@
-from typing import AsyncIterator
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar, Union
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.cache import TTLCache
 from app.core.config import config
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_pool
+from app.core.query_stats import instrument_queries
 
-async_engine = create_async_engine(
-    config.database.async_dsn,
-    echo=False,
-    pool_size=30,
-    max_overflow=20,
-    pool_timeout=60,
-    pool_recycle=1800,
-)
+
+def _create_engine(dsn: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        dsn,
+        echo=False,
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.database.pool_size,
+        max_overflow=config.database.max_overflow,
+        pool_timeout=config.database.pool_timeout,
+        pool_recycle=config.database.pool_recycle,
+    )
+    instrument_pool(engine.sync_engine, name)
+    if config.QUERY_STATS_ENABLED:
+        instrument_queries(engine.sync_engine)
+    return engine
+
+
+async_engine = _create_engine(config.database.async_dsn, "primary")
 
 AsyncSessionFactory = sessionmaker(
     bind=async_engine,
@@ -21,16 +38,196 @@ AsyncSessionFactory = sessionmaker(
     autoflush=False,
 )
 
+# read-replica engine; without a replica DSN reads simply go to the primary
+if config.database.replica_async_dsn:
+    read_engine = _create_engine(config.database.replica_async_dsn, "replica")
+else:
+    read_engine = async_engine
+
+# read-only variants: transactions start as BEGIN READ ONLY (no extra round
+# trip with asyncpg) and are never committed, only released on close
+ReadOnlySessionFactory = sessionmaker(
+    bind=async_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+ReadSessionFactory = sessionmaker(
+    bind=read_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+_READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+EndpointT = TypeVar("EndpointT", bound=Callable)
+
+
+def transaction_mode(*, read_only: bool) -> Callable[[EndpointT], EndpointT]:
+    """
+    Override the session mode `get_db` picks for a route.
+
+    By default GET/HEAD routes get a read-only session and everything else
+    a read-write one; decorate an endpoint to force either mode::
+
+        @router.get("/something")
+        @transaction_mode(read_only=False)
+        async def handler(db: AsyncSession = Depends(get_async_db)): ...
+    """
+
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        endpoint.__db_read_only__ = read_only
+        return endpoint
+
+    return decorator
+
+
+def is_read_only_request(request: Optional[Request]) -> bool:
+    if request is None:
+        return False
+    route = request.scope.get("route")
+    override = getattr(getattr(route, "endpoint", None), "__db_read_only__", None)
+    if override is not None:
+        return override
+    return request.method in _READ_ONLY_METHODS
+
+
+# set on the response after a write; while the client sends it back, its reads
+# go to the primary. _recent_writers only covers the worker that served the
+# write, the cookie also holds when the next request lands on another worker.
+PRIMARY_COOKIE = "db_primary"
+
+
+class ReadYourWrites:
+    """Replica stickiness of the current request (bound by middleware in app.main)."""
+
+    def __init__(self, client_key: Optional[str], pinned: bool = False) -> None:
+        self.client_key = client_key
+        self.pinned = pinned  # caller sent PRIMARY_COOKIE
+        self.wrote = False  # a session of this request flushed writes
+
+
+read_your_writes: ContextVar[Optional[ReadYourWrites]] = ContextVar(
+    "read_your_writes", default=None
+)
+
+# clients that wrote recently -> read from the primary until the entry expires
+_recent_writers = TTLCache(
+    maxsize=100_000, ttl=config.database.replica_sticky_seconds
+)
+
+
+def _mark_write(session) -> None:
+    session.info["has_writes"] = True
+    # flagged here, not on commit: get_db commits after the response is sent
+    state = read_your_writes.get()
+    if state is not None:
+        state.wrote = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context) -> None:
+    _mark_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state) -> None:
+    # bulk update()/delete()/insert() statements never go through flush
+    if not orm_execute_state.is_select:
+        _mark_write(orm_execute_state.session)
+
+
+# in-process caches to drop once a transaction touching their data commits
+_commit_hooks: dict[str, list[Callable[[], None]]] = defaultdict(list)
+_commit_id_hooks: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+
+
+def on_commit(key: str, hook: Callable, *, per_id: bool = False) -> None:
+    """
+    Run `hook` after any commit of a session flagged with `mark_changed(key)`;
+    with `per_id`, run `hook(id)` once for each id passed to `mark_changed`.
+    """
+    (_commit_id_hooks if per_id else _commit_hooks)[key].append(hook)
+
+
+def mark_changed(session: Union[AsyncSession, Session], key: str, *ids: Any) -> None:
+    session.info.setdefault("changed", {}).setdefault(key, set()).update(ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_hooks(session) -> None:
+    for key, ids in session.info.pop("changed", {}).items():
+        for hook in _commit_hooks.get(key, ()):
+            hook()
+        for hook in _commit_id_hooks.get(key, ()):
+            for changed_id in ids:
+                hook(changed_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_uncommitted_changes(session) -> None:
+    session.info.pop("changed", None)
+
+
+def _remember_writer(session: AsyncSession) -> None:
+    state = read_your_writes.get()
+    if state is None or state.client_key is None:
+        return
+    if session.info.get("has_writes"):
+        _recent_writers.set(state.client_key, True)
+
+
+def should_use_primary() -> bool:
+    """True when reads must not hit the replica (no replica, or replica lag)."""
+    if read_engine is async_engine:
+        return True
+    state = read_your_writes.get()
+    if state is None:
+        return False
+    return state.pinned or (
+        state.client_key is not None
+        and _recent_writers.get(state.client_key) is not None
+    )
+
+
+async def get_db(request: Request = None) -> AsyncIterator[AsyncSession]:
+    """
+    Request-scoped session.
+
+    Read-only routes (see `is_read_only_request`) get a READ ONLY transaction
+    that is released without a COMMIT; all others commit on success.
+    """
+    if is_read_only_request(request):
+        async with ReadOnlySessionFactory() as session:
+            yield session
+        return
 
-async def get_db() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionFactory() as session:
         try:
             yield session
             await session.commit()
+            _remember_writer(session)
         except:
             await session.rollback()
             raise
 
 
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only handlers, served by the read-replica.
+
+    Falls back to the primary for clients that wrote within
+    `replica_sticky_seconds` (tracked in-process and via `PRIMARY_COOKIE`),
+    so they always read their own writes.
+    Nothing is committed: the transaction is discarded on close.
+    """
+    factory = ReadOnlySessionFactory if should_use_primary() else ReadSessionFactory
+    async with factory() as session:
+        yield session
+
+
 get_async_session = get_db
 get_async_db = get_db
+get_async_read_db = get_read_db
@@ -0,0 +1,89 @@
+"""
+Conditional GET support (ETag / If-None-Match).
+
+A collection's ETag is derived from max(modified_at) and count(*) of every
+table that feeds its response, read in a single round-trip. Compute the ETag
+*before* loading the body: a write landing in between then yields a fresh
+body with an older tag, which only costs the client one extra download.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# responses sit behind auth: browsers/proxies may keep them but must revalidate
+CACHE_CONTROL = "private, no-cache"
+
+
+def fingerprint(model, *criteria) -> Select:
+    """`(max(modified_at), count(*))` of `model` rows matching `criteria`."""
+    return (
+        select(
+            func.max(model.modified_at).label("max_modified_at"),
+            func.count().label("row_count"),
+        )
+        .select_from(model)
+        .where(*criteria)
+    )
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+async def _fingerprint_row(db: AsyncSession, fingerprints: Iterable[Select]):
+    # every fingerprint aggregates to exactly one row, so cross-joining them
+    # returns one row with all (max, count) pairs
+    subs = [fp.subquery() for fp in fingerprints]
+    joined = subs[0]
+    for sub in subs[1:]:
+        joined = joined.join(sub, true())
+    stmt = select(*(col for sub in subs for col in sub.c)).select_from(joined)
+    return (await db.execute(stmt)).one()
+
+
+async def collection_etag(db: AsyncSession, *fingerprints: Select) -> str:
+    """Combine several fingerprints into one weak ETag with a single query."""
+    return make_etag(*await _fingerprint_row(db, fingerprints))
+
+
+async def entity_etag(db: AsyncSession, *fingerprints: Select) -> Optional[str]:
+    """Like `collection_etag`, but None when the first fingerprint matched no row."""
+    row = await _fingerprint_row(db, fingerprints)
+    if not row[1]:
+        return None
+    return make_etag(*row)
+
+
+def _parse_if_none_match(header: str) -> Iterable[str]:
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            yield tag
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Weak comparison against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return opaque in _parse_if_none_match(header)
+
+
+def etag_headers(etag: Optional[str]) -> dict:
+    if etag is None:
+        return {}
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
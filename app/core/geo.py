@@ -0,0 +1,156 @@
+"""
+Geo helpers: coordinate parsing, great-circle distance and an in-memory
+grid index for k-nearest lookups.
+"""
+import math
+import re
+from collections import defaultdict
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+EARTH_RADIUS_KM = 6371.0088
+
+_COORDS_RE = re.compile(r"(-?\d+(?:\.\d+)?)\s*[,; ]\s*(-?\d+(?:\.\d+)?)")
+
+T = TypeVar("T")
+
+
+def parse_coordinates(value: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    "41.2995, 69.2401" -> (41.2995, 69.2401). Accepts comma, semicolon or
+    space separators and swapped "lon, lat" pairs; None when unparseable.
+    """
+    if not value:
+        return None
+    m = _COORDS_RE.search(value)
+    if not m:
+        return None
+    a, b = float(m.group(1)), float(m.group(2))
+    if abs(a) > 90 >= abs(b):
+        a, b = b, a
+    if abs(a) > 90 or abs(b) > 180:
+        return None
+    return a, b
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+class GeoGrid(Generic[T]):
+    """
+    Immutable bucket grid over (lat, lon) points.
+
+    `nearest` scans rings of cells outward from the query cell and stops once
+    the k-th best distance is closer than anything the next ring could hold,
+    so a lookup touches a handful of cells instead of every point. Rings are
+    clipped to the grid's bounding box, so a query far outside it costs at
+    most one pass over the box (or over the points, if fewer). Cells do not
+    wrap at the antimeridian.
+    """
+
+    def __init__(self, points: Iterable[Tuple[float, float, T]], cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        cells: dict[Tuple[int, int], list] = defaultdict(list)
+        for lat, lon, item in points:
+            cells[self._cell(lat, lon)].append((lat, lon, item))
+        self._cells = {key: tuple(pts) for key, pts in cells.items()}
+        self.size = sum(len(pts) for pts in self._cells.values())
+        if self._cells:
+            rows = [r for r, _ in self._cells]
+            cols = [c for _, c in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = (0, -1, 0, -1)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _ring(self, row: int, col: int, r: int):
+        """Cells at Chebyshev distance `r` from (row, col) inside the bounds."""
+        min_row, max_row, min_col, max_col = self._bounds
+        if r == 0:
+            yield row, col
+            return
+        cols = range(max(col - r, min_col), min(col + r, max_col) + 1)
+        for rr in (row - r, row + r):
+            if min_row <= rr <= max_row:
+                for c in cols:
+                    yield rr, c
+        rows = range(max(row - r + 1, min_row), min(row + r - 1, max_row) + 1)
+        for cc in (col - r, col + r):
+            if min_col <= cc <= max_col:
+                for rr in rows:
+                    yield rr, cc
+
+    @staticmethod
+    def _min_km(lat: float, dlat_deg: float, dlon_deg: float) -> Tuple[float, float]:
+        """
+        Lower bounds on the distance from latitude `lat` to a point at least
+        `dlat_deg` away in latitude, and to one at least `dlon_deg` away in
+        longitude. Correct at any latitude, including next to the poles.
+        """
+        by_lat = EARTH_RADIUS_KM * math.radians(dlat_deg)
+        # distance to the meridian's great circle: asin(cos(lat) * sin(dlon))
+        dlon = math.radians(min(dlon_deg, 90.0))
+        by_lon = EARTH_RADIUS_KM * math.asin(
+            min(1.0, math.cos(math.radians(lat)) * math.sin(dlon))
+        )
+        return by_lat, by_lon
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        radius_km: Optional[float] = None,
+    ) -> List[Tuple[float, T]]:
+        """Up to `k` (distance_km, item) pairs, closest first."""
+        if not self._cells or k <= 0:
+            return []
+        cd = self.cell_deg
+        row, col = self._cell(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+
+        # nothing in the grid is closer than the bounding box
+        box_lat = max(min_row * cd - lat, lat - (max_row + 1) * cd, 0.0)
+        box_lon = max(min_col * cd - lon, lon - (max_col + 1) * cd, 0.0)
+        box_km = max(self._min_km(lat, box_lat, box_lon))
+        if radius_km is not None and box_km > radius_km:
+            return []
+
+        first_r = max(min_row - row, row - max_row, min_col - col, col - max_col, 0)
+        last_r = max(row - min_row, max_row - row, col - min_col, max_col - col, 0)
+
+        found: List[Tuple[float, T]] = []
+        box_cells = (max_row - min_row + 1) * (max_col - min_col + 1)
+        if first_r > 0 and box_cells > self.size:
+            # far outside a sparse box: measuring every point beats walking it
+            for pts in self._cells.values():
+                for p_lat, p_lon, item in pts:
+                    d = haversine_km(lat, lon, p_lat, p_lon)
+                    if radius_km is None or d <= radius_km:
+                        found.append((d, item))
+            found.sort(key=lambda pair: pair[0])
+            return found[:k]
+
+        for r in range(first_r, last_r + 1):
+            # anything in ring r or beyond is at least r - 1 whole cells away
+            # in latitude or in longitude
+            gap = max(r - 1, 0) * cd
+            reach_km = max(box_km, min(self._min_km(lat, gap, gap)))
+            if radius_km is not None and reach_km > radius_km:
+                break
+            if len(found) >= k and found[k - 1][0] <= reach_km:
+                break
+            for key in self._ring(row, col, r):
+                for p_lat, p_lon, item in self._cells.get(key, ()):
+                    d = haversine_km(lat, lon, p_lat, p_lon)
+                    if radius_km is None or d <= radius_km:
+                        found.append((d, item))
+            found.sort(key=lambda pair: pair[0])
+            del found[k:]
+        return found
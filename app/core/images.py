@@ -0,0 +1,72 @@
+"""
+Photo variants (thumbnails) rendered in pool workers.
+
+NOTE: keep this module free of other app imports - pool workers import it on
+spawn. Pillow is imported inside the worker functions so the web process
+never loads it.
+"""
+import io
+from typing import Dict
+
+from app.core.process_pool import BoundedProcessPool
+
+# size key -> longest side in px. List avatars are ~96 css px; "small" covers
+# 2x screens, "medium" detail headers.
+VARIANT_SIZES: Dict[str, int] = {"thumb": 96, "small": 192, "medium": 480}
+VARIANT_SIZE_PATTERN = "^(" + "|".join(VARIANT_SIZES) + ")$"
+
+# refuse decompression bombs well before Pillow's own limit
+MAX_IMAGE_PIXELS = 40_000_000
+
+_SAVE_OPTIONS = {
+    "WEBP": {"quality": 80, "method": 4},
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+}
+
+
+class ImageDecodeError(ValueError):
+    pass
+
+
+def render_variants(path: str, image_format: str = "WEBP") -> Dict[str, bytes]:
+    """
+    Decode the image at `path` once and encode every VARIANT_SIZES entry.
+
+    JPEG sources are decoded at a reduced DCT scale (`draft`) close to the
+    largest variant, which is most of the win for multi-megapixel photos.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    save_options = _SAVE_OPTIONS[image_format]
+    largest = max(VARIANT_SIZES.values())
+    try:
+        with Image.open(path) as img:
+            img.draft("RGB", (largest, largest))
+            img = ImageOps.exif_transpose(img)
+            img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") and image_format == "WEBP" else "RGB")
+            img.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ImageDecodeError(str(e)) from e
+
+    variants = {}
+    # largest first so each step downsamples an already smaller image
+    for key, size in sorted(VARIANT_SIZES.items(), key=lambda kv: -kv[1]):
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format=image_format, **save_options)
+        variants[key] = out.getvalue()
+    return variants
+
+
+class ImageProcessor(BoundedProcessPool):
+    """Thumbnail rendering in a bounded process pool."""
+
+    def __init__(self, max_workers: int, max_concurrency: int, image_format: str = "WEBP") -> None:
+        super().__init__(max_workers, max_concurrency)
+        if image_format not in _SAVE_OPTIONS:
+            raise ValueError(f"Unsupported variant format {image_format!r}")
+        self.image_format = image_format
+
+    async def render(self, path: str) -> Dict[str, bytes]:
+        return await self.run(render_variants, path, self.image_format)
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core.process_pool import BoundedProcessPool
+
+# NOTE: keep this module free of other app imports - pool workers import it on spawn
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context() -> "CryptContext":
+    # passlib/argon2 are only needed where hashing actually runs (pool workers)
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
+
+
+def hash_password_sync(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher(BoundedProcessPool):
+    """Argon2 hashing/verification in a bounded process pool."""
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password_sync, plain_password, hashed_password)
@@ -0,0 +1,163 @@
+import bisect
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# upper bounds (ms) of the latency histogram buckets; last bucket is +inf
+BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+SLOW_CHECKOUT_MS = 250.0
+
+
+class Histogram:
+    def __init__(self, bounds: List[float] = BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.n = 0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.total += value_ms
+        self.n += 1
+        self.max = max(self.max, value_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b:g}ms" for b in self.bounds] + ["le_inf"]
+        return {
+            "count": self.n,
+            "avg_ms": round(self.total / self.n, 3) if self.n else 0.0,
+            "max_ms": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PoolMetrics:
+    """Counters and histograms for one engine's connection pool."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.checkout_wait = Histogram()
+        self.hold_time = Histogram()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.overflow_high_water = 0
+        self.checked_out_high_water = 0
+        self.pool: Optional[AsyncAdaptedQueuePool] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        return {
+            "name": self.name,
+            "pool_size": pool.size() if pool is not None else None,
+            "checked_out": pool.checkedout() if pool is not None else None,
+            "overflow": pool.overflow() if pool is not None else None,
+            "checked_in": pool.checkedin() if pool is not None else None,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "overflow_high_water": self.overflow_high_water,
+            "checked_out_high_water": self.checked_out_high_water,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "hold_time": self.hold_time.snapshot(),
+        }
+
+
+# engine name -> metrics, served by /debug/pool
+registry: Dict[str, PoolMetrics] = {}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that times how long callers wait for a connection.
+
+    Pool events only fire once a connection was handed out, so the wait
+    (and timeouts) are measured around the internal checkout instead.
+    """
+
+    metrics: PoolMetrics
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same
+        # metrics and point the registry's snapshot at the live pool
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.pool = pool
+        return pool
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            logger.bind(
+                event="db_pool_timeout",
+                pool=self.metrics.name,
+                waited_ms=round((time.perf_counter() - t0) * 1000, 3),
+                checked_out=self.checkedout(),
+                overflow=self.overflow(),
+            ).error("DB pool checkout timed out")
+            raise
+        waited_ms = (time.perf_counter() - t0) * 1000
+        self.metrics.checkout_wait.observe(waited_ms)
+        if waited_ms >= SLOW_CHECKOUT_MS:
+            logger.bind(
+                event="db_pool_slow_checkout",
+                pool=self.metrics.name,
+                waited_ms=round(waited_ms, 3),
+                checked_out=self.checkedout(),
+                overflow=self.overflow(),
+            ).warning("Slow DB pool checkout")
+        return conn
+
+
+def instrument_pool(engine: Engine, name: str) -> PoolMetrics:
+    """Attach pool event listeners to `engine` and register its metrics."""
+    metrics = PoolMetrics(name)
+    pool = engine.pool
+    metrics.pool = pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics = metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_conn, record) -> None:
+        metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy) -> None:
+        metrics.checkouts += 1
+        record.info["checkout_at"] = time.perf_counter()
+        live = metrics.pool
+        metrics.overflow_high_water = max(metrics.overflow_high_water, live.overflow())
+        metrics.checked_out_high_water = max(
+            metrics.checked_out_high_water, live.checkedout()
+        )
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_conn, record) -> None:
+        metrics.checkins += 1
+        started = record.info.pop("checkout_at", None)
+        if started is not None:
+            metrics.hold_time.observe((time.perf_counter() - started) * 1000)
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception) -> None:
+        metrics.invalidations += 1
+
+    registry[name] = metrics
+    return metrics
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {name: m.snapshot() for name, m in registry.items()}
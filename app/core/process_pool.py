@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+# NOTE: keep this module free of app imports - pool workers import it on spawn
+
+
+class BoundedProcessPool:
+    """
+    Runs CPU-bound functions in a process pool, off the event loop.
+
+    At most `max_concurrency` calls are submitted to the pool at once;
+    further callers wait on a semaphore and are counted in `queue_depth`.
+    The pool is only started on first use.
+    """
+
+    def __init__(self, max_workers: int, max_concurrency: int) -> None:
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.completed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, fn, *args):
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        queued = True
+        try:
+            async with self._get_semaphore():
+                self.queue_depth -= 1
+                queued = False
+                self.in_flight += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._get_executor(), fn, *args)
+                finally:
+                    self.in_flight -= 1
+                    self.completed += 1
+        finally:
+            if queued:
+                self.queue_depth -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
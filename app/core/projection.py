@@ -0,0 +1,70 @@
+"""
+Column projection of ORM queries from the response schema.
+
+`select(Model)` fetches every column of the row; list endpoints then
+serialize a handful of them. `schema_options(Model, Schema)` turns the
+schema's fields into loader options so the query selects exactly what the
+response renders: `load_only` for columns, `selectinload` (itself
+projected) for nested schemas.
+"""
+import typing
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """HospitalBasicSchema, Optional[...] or List[...] of it -> the schema class."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _plan(model: type, schema: Type[BaseModel]) -> Tuple[list, list]:
+    """(column keys, relationship loaders) needed to render `schema`."""
+    mapper = inspect(model)
+    column_keys = {attr.key for attr in mapper.column_attrs}
+    keys = set()
+    loaders = []
+    for name, field in schema.model_fields.items():
+        if name in column_keys:
+            keys.add(name)
+        elif name in mapper.relationships:
+            prop = mapper.relationships[name]
+            # the FK the relationship loads through must be selected as well
+            keys.update(mapper.get_property_by_column(c).key for c in prop.local_columns)
+            loaders.append(_relationship_loader(model, prop, _nested_schema(field.annotation)))
+        # anything else is computed by the service (e.g. distance_km)
+    return sorted(keys), loaders
+
+
+def _relationship_loader(model: type, prop, nested: Optional[Type[BaseModel]]):
+    loader = selectinload(getattr(model, prop.key))
+    if nested is None:
+        return loader
+    target = prop.mapper
+    keys, inner_loaders = _plan(target.class_, nested)
+    keys = set(keys) | {target.get_property_by_column(c).key for c in prop.remote_side}
+    return loader.options(
+        load_only(*(getattr(target.class_, key) for key in sorted(keys)), raiseload=True),
+        *inner_loaders,
+    )
+
+
+@lru_cache(maxsize=None)
+def schema_options(model: type, schema: Type[BaseModel]) -> tuple:
+    """
+    Loader options selecting only what `schema` serializes from `model`.
+
+    Rows loaded this way are partial: use them for rendering only. Touching
+    an unloaded column raises under asyncio instead of lazy-loading.
+    """
+    keys, loaders = _plan(model, schema)
+    return (load_only(*(getattr(model, key) for key in keys), raiseload=True), *loaders)
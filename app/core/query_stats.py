@@ -0,0 +1,107 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# collapse bind placeholders so "IN ($1, $2)" and "IN ($1, $2, $3)" share a shape
+_PARAMS_RE = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _SPACE_RE.sub(" ", _PARAMS_RE.sub("?", statement)).strip()
+
+
+class RequestQueryStats:
+    """SQL statements issued while serving one request."""
+
+    def __init__(self) -> None:
+        self.statements: List[Tuple[str, float]] = []
+        self.db_ms = 0.0
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.statements.append((statement, elapsed_ms))
+        self.db_ms += elapsed_ms
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """Statement shapes executed at least `threshold` times (likely N+1)."""
+        shapes = Counter(statement_shape(s) for s, _ in self.statements)
+        return {shape: n for shape, n in shapes.items() if n >= threshold}
+
+
+class RouteQueryStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.queries = 0
+        self.db_ms = 0.0
+        self.max_queries = 0
+        self.n_plus_one_requests = 0
+        self.n_plus_one_shapes: Counter = Counter()
+
+    def add(self, stats: RequestQueryStats, repeated: Dict[str, int]) -> None:
+        self.requests += 1
+        self.queries += stats.count
+        self.db_ms += stats.db_ms
+        self.max_queries = max(self.max_queries, stats.count)
+        if repeated:
+            self.n_plus_one_requests += 1
+            self.n_plus_one_shapes.update(repeated.keys())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "avg_queries": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.db_ms / self.requests, 3) if self.requests else 0.0,
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "n_plus_one_shapes": dict(self.n_plus_one_shapes.most_common(5)),
+        }
+
+
+current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+# "METHOD /path/{param}" -> aggregate, served by /debug/queries
+route_stats: Dict[str, RouteQueryStats] = {}
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Feed every statement executed on `engine` into the current request's stats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["query_start"].pop()
+        stats = current_stats.get()
+        if stats is not None:
+            stats.record(statement, (time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+# route_stats key of requests no route matched (404s, scanners)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def record_route(route_key: str, stats: RequestQueryStats, repeated: Dict[str, int]) -> None:
+    route_stats.setdefault(route_key, RouteQueryStats()).add(stats, repeated)
+
+
+def query_stats() -> Dict[str, Any]:
+    return {key: agg.snapshot() for key, agg in sorted(route_stats.items())}
@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """Cached `TypeAdapter(List[schema])`; building one per request is costly."""
+    return TypeAdapter(List[schema])
+
+
+def json_list_response(
+    schema: Type[BaseModel],
+    items: Iterable[Any],
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Validate ORM rows against `schema` once and serialize them in pydantic-core.
+
+    Returning a Response bypasses FastAPI's response_model validation and
+    re-encoding; keep `response_model` on the route for the OpenAPI schema.
+    """
+    adapter = list_adapter(schema)
+    payload = adapter.validate_python(list(items), from_attributes=True)
+    return Response(
+        content=adapter.dump_json(payload),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,44 @@
+"""
+Search text normalization for Uzbek (Latin and Cyrillic) and Russian input.
+
+Stored search columns and queries both go through `normalize`, so
+"Шарипов", "Sharipov" and "sharipov" meet in the same form: lowercase
+Latin, Cyrillic transliterated, apostrophes of o‘/g‘ and ъ/ь dropped,
+punctuation collapsed to single spaces. Typos are left to trigram
+similarity on top of that.
+"""
+import re
+from typing import List, Optional
+
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    # Uzbek letters
+    "ў": "o", "қ": "q", "ғ": "g", "ҳ": "h",
+}
+_TRANSLATE = str.maketrans(_CYRILLIC)
+
+# o‘ g‘ written with any of the usual apostrophe look-alikes
+_APOSTROPHES = re.compile(r"['`‘’ʻʼ´]")
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+# shortest token worth a prefix match; shorter ones match half the table
+MIN_TOKEN_LENGTH = 2
+
+
+def normalize(*parts: Optional[str]) -> str:
+    text = " ".join(p for p in parts if p).lower().translate(_TRANSLATE)
+    text = _APOSTROPHES.sub("", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def tokens(query: str) -> List[str]:
+    return [t for t in normalize(query).split() if len(t) >= MIN_TOKEN_LENGTH]
+
+
+def prefix_tsquery(words: List[str]) -> str:
+    """["ali", "kardio"] -> "ali:* & kardio:*" (tokens are [0-9a-z] only, safe to splice)."""
+    return " & ".join(f"{word}:*" for word in words)
@@ -1,33 +1,47 @@
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Union
 
 import logging
 import jwt
 from fastapi import Depends, HTTPException, status, WebSocket
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import TTLCache
 from app.core.config import config
-from app.core.database import get_async_db
+from app.core.database import get_async_db, mark_changed, on_commit
+from app.core.passwords import PasswordHasher
 from app.models.users import UserModel
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+password_hasher = PasswordHasher(
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_concurrency=config.PASSWORD_HASH_MAX_CONCURRENCY,
+)
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/users/auth/token",
     scheme_name="Phone/Password",
 )
 
+SUPER_ADMIN_ROLE_ID = uuid.UUID("8497eb6c-0eea-40e7-8467-f8e393f56833")
+
+# user id -> column snapshot of the UserModel row; saves the per-request lookup
+principal_cache = TTLCache(
+    maxsize=config.PRINCIPAL_CACHE_MAXSIZE,
+    ttl=config.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -44,6 +58,55 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt, int(expire.timestamp())
 
 
+def invalidate_principal(user_id: Union[uuid.UUID, str]) -> None:
+    """Drop a cached principal after its user row was changed or deleted."""
+    if not isinstance(user_id, uuid.UUID):
+        user_id = uuid.UUID(str(user_id))
+    principal_cache.invalidate(user_id)
+
+
+# only once committed: dropping the entry earlier lets a concurrent request
+# re-cache the old row before the change becomes visible
+on_commit("users", invalidate_principal, per_id=True)
+
+
+@event.listens_for(UserModel, "after_update")
+def _invalidate_on_role_change(mapper, connection, target: UserModel) -> None:
+    # role/activation changes must be visible to the very next request
+    state = inspect(target)
+    attrs = state.attrs
+    if attrs.role_id.history.has_changes() or attrs.is_active.history.has_changes():
+        mark_changed(state.session, "users", target.id)
+
+
+async def _load_principal(db: AsyncSession, user_id: str) -> Optional[UserModel]:
+    """
+    Resolve the user behind a token, serving from `principal_cache` when possible.
+
+    Cache hits are rebuilt from the stored column snapshot and merged into the
+    current session without a query, so each request gets its own instance.
+    Note the cache is per process: other workers only see a change once
+    the entry's TTL expires.
+    """
+    try:
+        key = uuid.UUID(str(user_id))
+    except ValueError:
+        return None
+
+    cached = principal_cache.get(key)
+    if cached is not None:
+        user = UserModel(**cached)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    stmt = select(UserModel).where(UserModel.id == key)
+    result = await db.execute(stmt)
+    user = result.scalars().first()
+    if user is not None:
+        principal_cache.set(key, user.to_dict())
+    return user
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_async_db),
@@ -69,10 +132,8 @@ async def get_current_user(
         logger.warning("Invalid token")
         raise creds_exc
 
-    stmt = select(UserModel).where(UserModel.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalars().first()
-    logger.debug("DB lookup result user: %r", user)
+    user = await _load_principal(db, user_id)
+    logger.debug("Principal lookup result user: %r", user)
 
     if user is None:
         raise creds_exc
@@ -80,6 +141,14 @@ async def get_current_user(
     return user
 
 
+async def get_current_super_admin(
+    current_user: UserModel = Depends(get_current_user),
+) -> UserModel:
+    if current_user.role_id != SUPER_ADMIN_ROLE_ID:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Super admin only")
+    return current_user
+
+
 # ---------- WS-friendly auth dependency ----------
 async def get_current_user_ws(
     websocket: WebSocket,
@@ -122,9 +191,7 @@ async def get_current_user_ws(
         await websocket.close(code=1008)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    stmt = select(UserModel).where(UserModel.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalars().first()
+    user = await _load_principal(db, user_id)
 
     if user is None:
         await websocket.close(code=1008)
@@ -0,0 +1,104 @@
+"""
+Bitmap slot engine.
+
+A doctor-day is an int bitmask over a 5-minute grid (bit i = minutes
+[5i, 5i + 5) after midnight). Working hours give the mask of slot *starts*
+(one every SLOT_MINUTES from each range's start, while a whole slot fits);
+bookings give a mask of busy grid cells. Which starts are free is then a
+handful of shifts and ANDs for the whole day at once instead of a loop
+over slots and bookings.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.working_hours import MINUTES_PER_DAY, day_intervals
+
+GRID_MINUTES = 5
+SLOT_MINUTES = 30
+CELLS_PER_DAY = MINUTES_PER_DAY // GRID_MINUTES
+SLOT_CELLS = SLOT_MINUTES // GRID_MINUTES
+DAY_MASK = (1 << CELLS_PER_DAY) - 1
+
+
+def _cell_up(minute: int) -> int:
+    return -(-minute // GRID_MINUTES)
+
+
+@lru_cache(maxsize=4096)
+def _start_mask(intervals: Tuple[Tuple[int, int], ...]) -> int:
+    mask = 0
+    for start, end in intervals:
+        # off-grid starts are rounded up to the next 5 minutes
+        minute = _cell_up(start) * GRID_MINUTES
+        while minute + SLOT_MINUTES <= end:
+            mask |= 1 << (minute // GRID_MINUTES)
+            minute += SLOT_MINUTES
+    return mask
+
+
+def start_mask(schedule: Optional[Sequence[int]], day: date) -> int:
+    """Slot starts of `day` from a compiled schedule (cached per distinct day shape)."""
+    return _start_mask(tuple(day_intervals(schedule, day)))
+
+
+def busy_mask(ranges: Iterable[Tuple[int, int]]) -> int:
+    """Grid cells touched by any [start, end) range, in minutes of the day."""
+    mask = 0
+    for start, end in ranges:
+        first = max(start // GRID_MINUTES, 0)
+        last = min(_cell_up(end), CELLS_PER_DAY)
+        if last > first:
+            mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+def blocked_starts(busy: int) -> int:
+    """Starts whose slot would overlap a busy cell: busy dilated SLOT_CELLS - 1 cells back."""
+    blocked = busy
+    for shift in range(1, SLOT_CELLS):
+        blocked |= busy >> shift
+    return blocked
+
+
+def free_starts(starts: int, busy: int, not_before: int = 0) -> int:
+    """Free slot starts; `not_before` (minute of the day) drops the ones already past."""
+    free = starts & ~blocked_starts(busy)
+    if not_before > 0:
+        free &= DAY_MASK & ~((1 << _cell_up(not_before)) - 1)
+    return free
+
+
+def count(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def iter_minutes(mask: int) -> Iterator[int]:
+    """Set bits of `mask` as minutes of the day, earliest first."""
+    while mask:
+        low = mask & -mask
+        yield (low.bit_length() - 1) * GRID_MINUTES
+        mask ^= low
+
+
+def first_minute(mask: int) -> Optional[int]:
+    if not mask:
+        return None
+    return ((mask & -mask).bit_length() - 1) * GRID_MINUTES
+
+
+def minutes_of_day(moment: datetime) -> int:
+    return moment.hour * 60 + moment.minute
+
+
+def booking_ranges(
+    bookings: Iterable[Tuple[datetime, datetime]], day: date
+) -> List[Tuple[int, int]]:
+    """(start, end) datetimes -> [start, end) minutes of `day`, clipped to it."""
+    ranges = []
+    for start, end in bookings:
+        s = 0 if start.date() < day else minutes_of_day(start)
+        e = MINUTES_PER_DAY if end.date() > day else minutes_of_day(end)
+        if e > s:
+            ranges.append((s, e))
+    return ranges
@@ -0,0 +1,163 @@
+"""
+Helpers for the `working_hours` JSON columns and their compiled form.
+
+Values look like ``{"monday": "09:00-16:00", ..., "sunday": null}``: per
+weekday one or more comma separated "HH:MM-HH:MM" ranges ("09:00-13:00,
+14:00-18:00"), null when closed. A range ending before it starts runs past
+midnight into the next day; "24:00" is accepted as an end.
+
+Writes also store the compiled `schedule`: a flat, sorted int array of
+[start, end) pairs in minutes of the week (Monday 00:00 = 0), so nothing
+on the read path parses these strings again.
+"""
+import bisect
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.config import config
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+Interval = Tuple[int, int]
+
+
+@lru_cache(maxsize=1)
+def local_tz() -> ZoneInfo:
+    return ZoneInfo(config.TIMEZONE)
+
+
+def local_now() -> datetime:
+    """Wall-clock time where the clinics are; working hours are local."""
+    return datetime.now(local_tz()).replace(tzinfo=None)
+
+
+def to_local(moment: datetime) -> datetime:
+    """Naive local wall-clock time; naive input is taken as local already."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(local_tz()).replace(tzinfo=None)
+
+
+def _minutes(hhmm: str) -> int:
+    hours, _, minutes = hhmm.strip().partition(":")
+    if not (hours.isdigit() and minutes.isdigit() and len(minutes) == 2):
+        raise ValueError(f"Invalid time {hhmm!r}, expected HH:MM")
+    value = int(hours) * 60 + int(minutes)
+    if int(minutes) > 59 or value > MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time {hhmm!r}")
+    return value
+
+
+def parse_day(value: Optional[str]) -> List[Interval]:
+    """"09:00-13:00, 14:00-18:00" -> [(540, 780), (840, 1080)] minutes of the day."""
+    if not value or not value.strip():
+        return []
+    intervals = []
+    for part in value.split(","):
+        start, sep, end = part.partition("-")
+        if not sep:
+            raise ValueError(f"Invalid range {part.strip()!r}, expected HH:MM-HH:MM")
+        start_m, end_m = _minutes(start), _minutes(end)
+        if start_m == end_m:
+            raise ValueError(f"Empty range {part.strip()!r}")
+        if end_m < start_m:
+            end_m += MINUTES_PER_DAY  # past midnight
+        intervals.append((start_m, end_m))
+    return intervals
+
+
+def compile_schedule(working_hours: Optional[Dict[str, Optional[str]]]) -> Optional[List[int]]:
+    """working_hours dict -> flat [start, end, start, end, ...] minutes of the week."""
+    if working_hours is None:
+        return None
+    intervals = []
+    for day, name in enumerate(WEEKDAYS):
+        offset = day * MINUTES_PER_DAY
+        for start, end in parse_day(working_hours.get(name)):
+            start, end = start + offset, end + offset
+            if end > MINUTES_PER_WEEK:
+                # Sunday night into Monday morning
+                intervals.append((0, end - MINUTES_PER_WEEK))
+                end = MINUTES_PER_WEEK
+            intervals.append((start, end))
+
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [bound for pair in merged for bound in pair]
+
+
+def minute_of_week(moment: datetime) -> int:
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def is_open(schedule: Optional[Sequence[int]], minute: int) -> bool:
+    """Whether the compiled `schedule` covers `minute` of the week."""
+    # bounds alternate start, end: an odd insertion point is inside a pair
+    return bool(schedule) and bisect.bisect_right(schedule, minute) % 2 == 1
+
+
+def day_intervals(schedule: Optional[Sequence[int]], day: date) -> List[Interval]:
+    """Open [start, end) ranges of `day` in minutes of that day, clipped to it."""
+    if not schedule:
+        return []
+    day_start = day.weekday() * MINUTES_PER_DAY
+    day_end = day_start + MINUTES_PER_DAY
+    result = []
+    for i in range(0, len(schedule), 2):
+        start, end = max(schedule[i], day_start), min(schedule[i + 1], day_end)
+        if start < end:
+            result.append((start - day_start, end - day_start))
+    return result
+
+
+class ScheduleIndex:
+    """
+    Which entities are open at a given minute of the week.
+
+    The week is cut at every distinct schedule boundary; each elementary
+    segment stores the frozenset of ids open throughout it. A lookup is one
+    bisect. Clinics share a few dozen boundaries ("09:00", "16:00", ...), so
+    the segment count stays small whatever the number of rows.
+    """
+
+    def __init__(self, schedules: Iterable[Tuple[Hashable, Optional[Sequence[int]]]]) -> None:
+        events: Dict[int, List[Tuple[int, Hashable]]] = {}
+        self.size = 0
+        for entity_id, schedule in schedules:
+            if not schedule:
+                continue
+            self.size += 1
+            for i in range(0, len(schedule), 2):
+                events.setdefault(schedule[i], []).append((1, entity_id))
+                events.setdefault(schedule[i + 1], []).append((-1, entity_id))
+
+        self._bounds: List[int] = [0]
+        self._segments: List[FrozenSet[Hashable]] = []
+        current: set = set()
+        previous: FrozenSet[Hashable] = frozenset()
+        for point in sorted(events):
+            if point > self._bounds[-1]:
+                self._segments.append(previous)
+                self._bounds.append(point)
+            for delta, entity_id in events[point]:
+                if delta > 0:
+                    current.add(entity_id)
+                else:
+                    current.discard(entity_id)
+            previous = previous if previous == current else frozenset(current)
+        self._segments.append(previous)
+
+    def open_at(self, moment: datetime) -> FrozenSet[Hashable]:
+        minute = minute_of_week(moment)
+        return self._segments[bisect.bisect_right(self._bounds, minute) - 1]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entities": self.size, "segments": len(self._segments)}
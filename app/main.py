@@ -1,12 +1,21 @@
 import asyncio
+import math
 import uvicorn
 from fastapi import APIRouter, FastAPI, Request
+from loguru import logger
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
+from app.core.ai import close_openai_client, warm_up as warm_up_ai
+from app.core.blobstore import PhotoUploadLimitMiddleware
 from app.core.config import config
+from app.core.database import PRIMARY_COOKIE, ReadYourWrites, read_your_writes
+from app.core.query_stats import UNMATCHED_ROUTE, RequestQueryStats, current_stats, record_route
+from app.core.security import password_hasher
+from app.service.photos import image_processor
 from app.routers import (
     locations,
     users,
@@ -20,10 +29,23 @@ from app.routers import (
     reviews,
     clinic_chats,
     lawyers,
-    lawyers_users
+    lawyers_users,
+    sync,
+    photos,
+    debug,
 )
 from app.version import __version__
-from app.service.telegram_reminder import dp, bot
+
+
+def _route_key(request: Request) -> str:
+    """Method + route template; one shared key for anything no route served."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    methods = getattr(route, "methods", None)
+    if path is None or (methods is not None and request.method not in methods):
+        # raw URLs and methods of 404/405s would add a key per scanner probe
+        return UNMATCHED_ROUTE
+    return f"{request.method} {path}"
 
 
 def create_app() -> FastAPI:
@@ -33,6 +55,7 @@ def create_app() -> FastAPI:
         openapi_url="/openapi.json",
         docs_url="/docs",
         redoc_url=None,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
@@ -54,6 +77,60 @@ def create_app() -> FastAPI:
         app.add_middleware(HTTPSRedirectMiddleware)
 
     app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(PhotoUploadLimitMiddleware)
+
+    if config.QUERY_STATS_ENABLED:
+
+        @app.middleware("http")
+        async def count_queries(request: Request, call_next):
+            stats = RequestQueryStats()
+            token = current_stats.set(stats)
+            try:
+                return await call_next(request)
+            finally:
+                current_stats.reset(token)
+                route_key = _route_key(request)
+                repeated = stats.repeated_shapes(config.N_PLUS_ONE_THRESHOLD)
+                record_route(route_key, stats, repeated)
+                if (
+                    repeated
+                    or stats.count >= config.QUERY_LOG_MIN_STATEMENTS
+                    or stats.db_ms >= config.QUERY_LOG_MIN_DB_MS
+                ):
+                    logger.bind(
+                        event="db_heavy_request",
+                        route=route_key,
+                        queries=stats.count,
+                        db_ms=round(stats.db_ms, 3),
+                        n_plus_one=repeated,
+                        statements=[s for s, _ in stats.statements],
+                    ).warning(
+                        f"{route_key}: {stats.count} queries, {stats.db_ms:.1f}ms in DB"
+                    )
+
+    @app.middleware("http")
+    async def bind_client_key(request: Request, call_next):
+        # lets get_read_db keep recent writers on the primary (replica lag)
+        key = request.headers.get("authorization") or (
+            request.client.host if request.client else None
+        )
+        state = ReadYourWrites(key, pinned=PRIMARY_COOKIE in request.cookies)
+        token = read_your_writes.set(state)
+        try:
+            response = await call_next(request)
+        finally:
+            read_your_writes.reset(token)
+        if state.wrote:
+            # the next request may be served by another worker process
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=math.ceil(config.database.replica_sticky_seconds),
+                httponly=True,
+                samesite="lax",
+                secure=config.ENVIRONMENT == "production",
+            )
+        return response
 
     @app.middleware("http")
     async def add_security_headers(request: Request, call_next):
@@ -83,6 +160,10 @@ def create_app() -> FastAPI:
     api_router.include_router(clinic_chats.ws_router)
     api_router.include_router(lawyers.router)
     api_router.include_router(lawyers_users.router)
+    api_router.include_router(sync.router)
+    api_router.include_router(photos.router)
+    if config.DEBUG_ENDPOINTS_ENABLED:
+        api_router.include_router(debug.router)
     app.include_router(api_router)
 
     @app.get("/", include_in_schema=False)
@@ -96,8 +177,24 @@ app = create_app()
 
 
 @app.on_event("startup")
-async def start_bot():
-    asyncio.create_task(dp.start_polling(bot))
+async def start_ai_warm_up():
+    # keeps openai/tiktoken out of the import path without slowing the first chat
+    asyncio.create_task(warm_up_ai())
+
+
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+async def stop_image_processor():
+    image_processor.shutdown()
+
+
+@app.on_event("shutdown")
+async def stop_openai_client():
+    await close_openai_client()
 
 
 if __name__ == "__main__":
@@ -7,4 +7,5 @@ from .chat import ChatHistoryModel
 from .service_prices import ServiceModel
 from .clinic_chats import ClinicChatModel, ClinicChatMessageModel
 from .medicine_reminder import MedicineReminderModel
-from .lawyers import UserModelLawyer, RoleModelLawyer, RegionModelLawyer, DistrictModelLawyer, MiniCallCenterModelLawyer, LawyerModelLawyer
\ No newline at end of file
+from .lawyers import UserModelLawyer, RoleModelLawyer, RegionModelLawyer, DistrictModelLawyer, MiniCallCenterModelLawyer, LawyerModelLawyer
+from .sync import SyncTombstoneModel
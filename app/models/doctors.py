@@ -1,13 +1,29 @@
 import uuid
-from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, Float
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.orm import deferred, relationship, validates
+from sqlalchemy import Column, Computed, String, Integer, Text, ForeignKey, Float, Index, event
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID, JSON
+
+from app.core.search import normalize
+from app.core.working_hours import compile_schedule
 
 from .base import SQLModel
 
 
 class DoctorModel(SQLModel):
     __tablename__ = "doctors"
+    __table_args__ = (
+        Index("ix_doctors_modified_at_id", "modified_at", "id"),
+        Index("ix_doctors_hospital_id", "hospital_id"),
+        # /doctors/search: full text on the vector, typo-tolerant trigram
+        # matching on the normalized name + specialty
+        Index("ix_doctors_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_doctors_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
@@ -16,9 +32,29 @@ class DoctorModel(SQLModel):
     last_name = Column(String, nullable=False)
     professional = Column(String, nullable=True)
     about = Column(Text, nullable=True)
-    photo = Column(Text, nullable=True)
+    # sha256 of the image in app.core.blobstore
+    photo_digest = Column(String(64), nullable=True)
+    # size key ("thumb", "small", "medium") -> digest of the resized image
+    photo_variants = Column(JSON, nullable=True)
     reyting = Column(Float, nullable=True)
     working_hours = Column(JSON, nullable=True)
+    # compiled working_hours (app.core.working_hours); kept in sync by
+    # _compile_working_hours, read by the schedule index and slot search
+    schedule = Column(ARRAY(Integer), nullable=True)
+
+    # app.core.search.normalize()d copies, refreshed on every insert/update
+    search_text = Column(Text, nullable=True)
+    search_about = deferred(Column(Text, nullable=True))
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', coalesce(search_text, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(search_about, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     hospital_id = Column(
         UUID(as_uuid=True),
@@ -34,3 +70,15 @@ class DoctorModel(SQLModel):
         back_populates="doctor",
         cascade="all, delete-orphan",
     )
+
+    @validates("working_hours")
+    def _compile_working_hours(self, key, value):
+        self.schedule = compile_schedule(value)
+        return value
+
+
+@event.listens_for(DoctorModel, "before_insert")
+@event.listens_for(DoctorModel, "before_update")
+def _refresh_search_columns(mapper, connection, target: DoctorModel) -> None:
+    target.search_text = normalize(target.first_name, target.last_name, target.professional)
+    target.search_about = normalize(target.about)
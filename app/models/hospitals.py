@@ -1,13 +1,23 @@
 import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, Float
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, Float, Index
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, JSON
+
+from app.core.working_hours import compile_schedule
 
 from .base import SQLModel
 
 
 class HospitalModel(SQLModel):
     __tablename__ = "hospitals"
+    __table_args__ = (
+        Index("ix_hospitals_modified_at_id", "modified_at", "id"),
+        # keyset paging of /hospitals: (name, id) order, optionally per region/district
+        Index("ix_hospitals_name_id", "name", "id"),
+        Index("ix_hospitals_region_id_name_id", "region_id", "name", "id"),
+        Index("ix_hospitals_district_id_name_id", "district_id", "name", "id"),
+        Index("ix_hospitals_reyting", "reyting"),
+    )
 
     id = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
@@ -15,7 +25,10 @@ class HospitalModel(SQLModel):
     name = Column(String, nullable=False)
     address = Column(String, nullable=True)
     orientir = Column(String, nullable=True)
-    photo = Column(Text, nullable=True)
+    # sha256 of the image in app.core.blobstore
+    photo_digest = Column(String(64), nullable=True)
+    # size key ("thumb", "small", "medium") -> digest of the resized image
+    photo_variants = Column(JSON, nullable=True)
     reyting = Column(Float, nullable=True)
 
     region_id = Column(
@@ -32,8 +45,14 @@ class HospitalModel(SQLModel):
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
     coordinates = Column(String, nullable=True)
+    # parsed from / kept in sync with `coordinates`; what geo queries use
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     admin = relationship("UserModel", back_populates="admin_hospital")
     working_hours = Column(JSON, nullable=True)
+    # compiled working_hours (app.core.working_hours); kept in sync by
+    # _compile_working_hours, read by the schedule index and slot search
+    schedule = Column(ARRAY(Integer), nullable=True)
     phone_number = Column(String, nullable=True)
     region = relationship("RegionModel", back_populates="hospitals")
     district = relationship("DistrictModel", back_populates="hospitals")
@@ -55,3 +74,8 @@ class HospitalModel(SQLModel):
 
     reviews = relationship("ReviewsModel", back_populates="hospital")
     clinic_chats = relationship("ClinicChatModel", back_populates="hospital", cascade="all, delete-orphan")
+
+    @validates("working_hours")
+    def _compile_working_hours(self, key, value):
+        self.schedule = compile_schedule(value)
+        return value
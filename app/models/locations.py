@@ -1,5 +1,5 @@
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -8,6 +8,7 @@ from .base import SQLModel
 
 class RegionModel(SQLModel):
     __tablename__ = "regions"
+    __table_args__ = (Index("ix_regions_modified_at_id", "modified_at", "id"),)
 
     id = Column(
         UUID(as_uuid=True),
@@ -36,6 +37,7 @@ class RegionModel(SQLModel):
 
 class DistrictModel(SQLModel):
     __tablename__ = "districts"
+    __table_args__ = (Index("ix_districts_modified_at_id", "modified_at", "id"),)
 
     id = Column(
         UUID(as_uuid=True),
@@ -1,16 +1,21 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import relationship
 
 from .base import SQLModel
 
 
+# a cancelled booking frees its time range
+CANCELLED = "cancelled"
+OVERLAP_CONSTRAINT = "ex_queues_doctor_id_appointment_range"
+IDEMPOTENCY_INDEX = "ux_queues_user_id_idempotency_key"
+
+
 class QueueModel(SQLModel):
     __tablename__ = "queues"
-
     id = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
     )
@@ -32,6 +37,23 @@ class QueueModel(SQLModel):
     status = Column(String, default="waiting", nullable=False)
     called_at = Column(DateTime, nullable=True)
     served_at = Column(DateTime, nullable=True)
+    # client-supplied Idempotency-Key of the booking request, unique per user
+    idempotency_key = Column(String(128), nullable=True)
+
+    __table_args__ = (
+        # range scans of a doctor's bookings (slot search, availability)
+        Index("ix_queues_doctor_id_appointment_start", "doctor_id", "appointment_start"),
+        # no two live bookings of a doctor may overlap; enforced by Postgres
+        # (btree_gist) so concurrent book_slot calls cannot both win
+        ExcludeConstraint(
+            (doctor_id, "="),
+            (func.tsrange(appointment_start, appointment_end), "&&"),
+            name=OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text(f"status <> '{CANCELLED}'"),
+        ),
+        Index(IDEMPOTENCY_INDEX, "user_id", "idempotency_key", unique=True),
+    )
 
     hospital = relationship("HospitalModel", back_populates="queues")
     doctor = relationship("DoctorModel", back_populates="queues")
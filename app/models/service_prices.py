@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, ForeignKey, Text
+from sqlalchemy import Column, String, Float, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,7 @@ from .base import SQLModel
 
 class ServiceModel(SQLModel):
     __tablename__ = "services"
+    __table_args__ = (Index("ix_services_modified_at_id", "modified_at", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
 
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import SQLModel
+
+
+class SyncTombstoneModel(SQLModel):
+    """
+    One row per deleted catalog entity, written by an AFTER DELETE trigger
+    (see the delta_sync migration) so ON DELETE CASCADE removals are caught.
+    `modified_at` is the deletion time and shares the sync cursor with the
+    live tables.
+    """
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_modified_at_entity_id", "modified_at", "entity_id"),
+    )
+
+    entity = Column(String, primary_key=True)
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
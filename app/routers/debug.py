@@ -0,0 +1,60 @@
+# app/routers/debug.py
+from fastapi import APIRouter, Depends, status
+
+from app.core.pool_metrics import pool_stats
+from app.core.query_stats import query_stats
+from app.core.security import get_current_super_admin, password_hasher, principal_cache
+from app.service.doctors import schedule_index as doctor_schedule_index
+from app.service.facets import specialty_facets
+from app.service.hospitals import geo_index, schedule_index as hospital_schedule_index
+from app.service.locations import location_tree
+from app.service.photos import image_processor
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Debug"],
+    include_in_schema=False,
+    dependencies=[Depends(get_current_super_admin)],
+)
+
+
+@router.get("/principal-cache", status_code=status.HTTP_200_OK)
+async def get_principal_cache_stats():
+    """Hit/miss counters of the authenticated-user cache."""
+    return principal_cache.stats()
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_pool_stats():
+    """Checkout wait / hold time histograms and usage counters per engine pool."""
+    return pool_stats()
+
+
+@router.get("/queries", status_code=status.HTTP_200_OK)
+async def get_query_stats():
+    """Per-route SQL statement counts, DB time and suspected N+1 shapes."""
+    return query_stats()
+
+
+@router.get("/password-hasher", status_code=status.HTTP_200_OK)
+async def get_password_hasher_stats():
+    """Queue depth and throughput of the Argon2 process pool."""
+    return password_hasher.stats()
+
+
+@router.get("/image-processor", status_code=status.HTTP_200_OK)
+async def get_image_processor_stats():
+    """Queue depth and throughput of the thumbnail process pool."""
+    return image_processor.stats()
+
+
+@router.get("/snapshots", status_code=status.HTTP_200_OK)
+async def get_snapshot_stats():
+    """Age and rebuild counters of the in-memory catalog snapshots."""
+    return {
+        "location_tree": location_tree.stats(),
+        "geo_index": geo_index.stats(),
+        "hospital_schedule_index": hospital_schedule_index.stats(),
+        "doctor_schedule_index": doctor_schedule_index.stats(),
+        "specialty_facets": specialty_facets.stats(),
+    }
@@ -1,17 +1,23 @@
 # app/routers/doctor_bookings.py
 import uuid
-from typing import List
+from datetime import date, timedelta
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_read_db
+from app.core.responses import json_list_response
 from app.core.security import get_current_user
+from app.core.working_hours import local_now
+from app.exc import LoggedHTTPException
 from app.models.users import UserModel
 from app.service.doctor_bookings import DoctorBookingService
 from app.schemas.doctor_bookings import (
     WorkingHoursSchema,
+    AvailabilityResponse,
     AvailableSlotsResponse,
+    EarliestSlotsResponse,
     BookingCreateSchema,
     BookingResponseSchema,
     BookingUpdateSchema,
@@ -20,6 +26,8 @@ from app.schemas.doctor_bookings import (
 
 router = APIRouter(tags=["Doctor Bookings"], prefix="/bookings")
 
+MAX_AVAILABILITY_DAYS = 62
+
 
 # ---------- Bookings (CRUD over QueueModel) ----------
 
@@ -32,7 +40,8 @@ async def get_all_bookings(
     db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    return await DoctorBookingService(db).get_all_bookings()
+    bookings = await DoctorBookingService(db).get_all_bookings()
+    return json_list_response(BookingListResponse, bookings)
 
 
 @router.get(
@@ -45,7 +54,8 @@ async def get_bookings_for_doctor(
     db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    return await DoctorBookingService(db).get_bookings_for_doctor(doctor_id)
+    bookings = await DoctorBookingService(db).get_bookings_for_doctor(doctor_id)
+    return json_list_response(BookingListResponse, bookings)
 
 
 @router.post(
@@ -57,10 +67,16 @@ async def get_bookings_for_doctor(
 async def book_slot(
     doctor_id: uuid.UUID,
     payload: BookingCreateSchema,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=128,
+        description="Retries with the same key return the first booking instead of a new one",
+    ),
     db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    return await DoctorBookingService(db).book_slot(doctor_id, payload)
+    return await DoctorBookingService(db).book_slot(doctor_id, payload, idempotency_key)
 
 
 @router.patch(
@@ -117,3 +133,54 @@ async def get_available_slots(
     current_user: UserModel = Depends(get_current_user),
 ):
     return await DoctorBookingService(db).get_available_slots(doctor_id, date)
+
+
+@router.get(
+    "/{doctor_id:uuid}/availability",
+    response_model=AvailabilityResponse,
+    response_model_exclude_none=True,
+    summary="Free/booked slots of a doctor over a date range (month heatmap)",
+)
+async def get_availability(
+    doctor_id: uuid.UUID,
+    date_from: Optional[date] = Query(None, alias="from", description="Defaults to today"),
+    date_to: Optional[date] = Query(None, alias="to", description="Inclusive; defaults to from + 30 days"),
+    include_slots: bool = Query(True, description="false returns only the per-day counts"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    date_from = date_from or local_now().date()
+    date_to = date_to or date_from + timedelta(days=30)
+    if date_to < date_from or (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+        raise LoggedHTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"`to` must be on or after `from` and at most {MAX_AVAILABILITY_DAYS} days later",
+        )
+    return await DoctorBookingService(db).availability(doctor_id, date_from, date_to, include_slots)
+
+
+@router.get(
+    "/earliest-free",
+    response_model=EarliestSlotsResponse,
+    summary="Earliest free half-hour slots across all matching doctors",
+)
+async def get_earliest_free_slots(
+    professional: Optional[str] = Query(None, description="Specialty, substring match"),
+    region_id: Optional[uuid.UUID] = Query(None),
+    district_id: Optional[uuid.UUID] = Query(None),
+    date_from: Optional[date] = Query(None, description="Defaults to today"),
+    days: int = Query(7, ge=1, le=14),
+    limit: int = Query(10, ge=1, le=50),
+    per_doctor: int = Query(1, ge=1, le=5),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    return await DoctorBookingService(db).earliest_free_slots(
+        professional=professional,
+        region_id=region_id,
+        district_id=district_id,
+        date_from=date_from,
+        days=days,
+        limit=limit,
+        per_doctor=per_doctor,
+    )
@@ -1,20 +1,27 @@
 import uuid, traceback
+from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.service.doctors import DoctorService
+from app.service.facets import FacetService
 from app.schemas.doctors import (
     DoctorCreateSchema,
     DoctorUpdateSchema,
     DoctorResponseSchema,
+    DoctorSearchResponseSchema,
+    SpecialtyFacetsSchema,
 
 )
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_read_db
+from app.core.blobstore import blob_response
+from app.core.images import VARIANT_SIZE_PATTERN
+from app.core.etag import CACHE_CONTROL, etag_headers, etag_matches, not_modified
+from app.core.responses import json_list_response
 from app.exc import LoggedHTTPException, raise_with_log
 from fastapi import UploadFile, File
-from fastapi.responses import JSONResponse
 import traceback
 from fastapi import Depends
 from app.core.security import get_current_user
@@ -30,12 +37,23 @@ router = APIRouter(prefix="/doctors", tags=["Doctors"])
     status_code=status.HTTP_200_OK,
 )
 async def get_doctors(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    available_at: Optional[datetime] = Query(
+        None, description="Only doctors working at this moment (local time unless an offset is given)"
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """List all doctors."""
     try:
-        return await DoctorService(db).list_doctors()
+        svc = DoctorService(db)
+        etag = await svc.list_etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        doctors = await svc.list_doctors(available_at)
+        return json_list_response(
+            DoctorResponseSchema, doctors, headers=etag_headers(etag)
+        )
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -50,10 +68,11 @@ async def get_doctors(
     status_code=status.HTTP_200_OK,
 )
 async def list_doctors_by_location(
+    request: Request,
     region_id: Optional[uuid.UUID] = Query(None),
     district_id: Optional[uuid.UUID] = Query(None),
     hospital_id: Optional[uuid.UUID] = Query(None),
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
@@ -61,9 +80,17 @@ async def list_doctors_by_location(
     Returns 400 if none or more than one are provided.
     """
     try:
-        return await DoctorService(db).list_by_location(
+        svc = DoctorService(db)
+        # whole-catalog fingerprint: coarser than the filter, but never stale
+        etag = await svc.list_etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        doctors = await svc.list_by_location(
             region_id=region_id, district_id=district_id, hospital_id=hospital_id
         )
+        return json_list_response(
+            DoctorResponseSchema, doctors, headers=etag_headers(etag)
+        )
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -73,6 +100,47 @@ async def list_doctors_by_location(
             f"Failed to list doctors by location: {e}",
         )
 
+@router.get(
+    "/facets",
+    response_model=SpecialtyFacetsSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_specialty_facets(
+    request: Request,
+    response: Response,
+    region_id: Optional[uuid.UUID] = Query(None),
+    district_id: Optional[uuid.UUID] = Query(None),
+    professional: Optional[str] = Query(None, description="Count only this specialty (case-insensitive)"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Doctor counts by specialty, overall and per region and district."""
+    svc = FacetService(db)
+    etag = await svc.etag()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return await svc.specialty_facets(
+        region_id=region_id, district_id=district_id, professional=professional
+    )
+
+
+@router.get(
+    "/search",
+    response_model=DoctorSearchResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def search_doctors(
+    q: str = Query(..., min_length=2, max_length=100, description="Name, specialty or words from `about`; Latin or Cyrillic"),
+    offset: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Ranked, typo-tolerant doctor search; page with `next_offset`."""
+    return await DoctorService(db).search(q, offset=offset, limit=limit)
+
+
 @router.get(
     "/{doctor_id}",
     response_model=DoctorResponseSchema,
@@ -80,12 +148,19 @@ async def list_doctors_by_location(
 )
 async def get_doctor(
     doctor_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """Get a single doctor by ID."""
     try:
-        return await DoctorService(db).get_doctor(doctor_id)
+        svc = DoctorService(db)
+        etag = await svc.etag(doctor_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.get_doctor(doctor_id)
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -176,8 +251,7 @@ async def upload_doctor_photo(
     current_user: UserModel = Depends(get_current_user),
 ):
     try:
-        data = await file.read()
-        await DoctorService(db).upload_photo(doctor_id, data)
+        await DoctorService(db).upload_photo(doctor_id, file)
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -194,13 +268,19 @@ async def upload_doctor_photo(
 )
 async def get_doctor_photo(
     doctor_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    size: Optional[str] = Query(None, pattern=VARIANT_SIZE_PATTERN),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    """Return JSON `{ "photo": "<base64-string>" }`."""
+    """
+    Raw image bytes; Range and If-None-Match aware. `size` picks a
+    thumbnail (thumb/small/medium), falling back to the original.
+    """
     try:
-        b64 = await DoctorService(db).get_photo(doctor_id)
-        return JSONResponse(content={"photo": b64})
+        digest = await DoctorService(db).get_photo_digest(doctor_id, size)
+        # this URL changes content on re-upload: revalidate; /photos/{digest} is immutable
+        return await blob_response(request, digest, cache_control=CACHE_CONTROL)
     except LoggedHTTPException:
         raise
     except Exception as e:
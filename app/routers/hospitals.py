@@ -1,7 +1,7 @@
 import uuid, traceback
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.service.hospitals import HospitalService
@@ -9,16 +9,25 @@ from app.schemas.hospitals import (
     HospitalCreateSchema,
     HospitalUpdateSchema,
     HospitalResponseSchema,
+    HospitalPageSchema,
+    NearbyResponseSchema,
+    PAGE_SECTIONS,
 )
 import base64
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_read_db
+from app.core.blobstore import blob_response
+from app.core.images import VARIANT_SIZE_PATTERN
+from app.core.etag import CACHE_CONTROL, etag_headers, etag_matches, not_modified
+from app.core.responses import json_list_response
 from app.exc import LoggedHTTPException, raise_with_log
 from fastapi import UploadFile, File
-from fastapi.responses import JSONResponse
 from fastapi import Depends
 from app.core.security import get_current_user
 from app.models.users import UserModel
 
+# page size when a client pages with `cursor` but gives no `limit`
+PAGE_SIZE = 100
+
 router = APIRouter(
     prefix="/hospitals",
     tags=["Locations - Hospitals"],
@@ -31,12 +40,43 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
 )
 async def get_hospitals(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    region_id: Optional[uuid.UUID] = Query(None),
+    district_id: Optional[uuid.UUID] = Query(None),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    open_now: bool = Query(False),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=500, description=f"Page size; defaults to {PAGE_SIZE} once paging"
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    """List all hospitals."""
+    """
+    List hospitals ordered by name. Without `cursor` and `limit` the whole
+    list comes back, as it always has; with either, one page at a time, and
+    while more pages exist the response carries an `X-Next-Cursor` header.
+    """
+    if limit is None and cursor:
+        limit = PAGE_SIZE
     try:
-        return await HospitalService(db).list_hospitals()
+        svc = HospitalService(db)
+        # open_now depends on the clock, not only on the rows
+        etag = None if open_now else await svc.list_etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        hospitals, next_cursor = await svc.list_hospitals(
+            region_id=region_id,
+            district_id=district_id,
+            min_rating=min_rating,
+            open_now=open_now,
+            cursor=cursor,
+            limit=limit,
+        )
+        headers = etag_headers(etag)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return json_list_response(HospitalResponseSchema, hospitals, headers=headers)
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -47,6 +87,37 @@ async def get_hospitals(
         )
 
 
+@router.get(
+    "/nearby",
+    response_model=NearbyResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_nearby_hospitals(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: Optional[float] = Query(None, gt=0, le=1000, description="km"),
+    limit: int = Query(10, ge=1, le=100),
+    specialty: Optional[str] = Query(
+        None, min_length=2, description="also return the nearest doctors of this specialty"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Nearest hospitals to (lat, lon), closest first."""
+    try:
+        return await HospitalService(db).nearby(
+            lat, lon, radius_km=radius, limit=limit, specialty=specialty
+        )
+    except LoggedHTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise_with_log(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            f"Failed to find nearby hospitals: {e}",
+        )
+
+
 @router.get(
     "/{hospital_id}",
     response_model=HospitalResponseSchema,
@@ -54,12 +125,19 @@ async def get_hospitals(
 )
 async def get_hospital(
     hospital_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """Get a single hospital by ID."""
     try:
-        return await HospitalService(db).get_hospital(hospital_id)
+        svc = HospitalService(db)
+        etag = await svc.etag(hospital_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.get_hospital(hospital_id)
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -70,6 +148,45 @@ async def get_hospital(
         )
 
 
+_SECTION = f"(?:{'|'.join(PAGE_SECTIONS)})"
+
+
+@router.get(
+    "/{hospital_id}/page",
+    response_model=HospitalPageSchema,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+async def get_hospital_page(
+    hospital_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    include: str = Query(
+        ",".join(PAGE_SECTIONS),
+        # known names, comma separated; empty for the hospital alone
+        pattern=f"^(?:{_SECTION}(?:,{_SECTION})*)?$",
+        description="Comma separated sections to return besides the hospital",
+    ),
+    reviews_limit: int = Query(3, ge=0, le=20),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Everything the hospital screen shows in one round trip: the hospital,
+    its doctors, its services and the newest reviews with their total.
+    Photos are referenced by digest (`/photos/{digest}`, cached forever).
+    """
+    svc = HospitalService(db)
+    etag = await svc.page_etag(hospital_id)
+    if etag is None:
+        raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Hospital not found")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    sections = [name for name in include.split(",") if name]
+    return await svc.get_page(hospital_id, sections, reviews_limit)
+
+
 @router.post(
     "",
     response_model=HospitalResponseSchema,
@@ -148,9 +265,8 @@ async def upload_hospital_photo(
     db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    """Read bytes, Base64-encode & save as TEXT."""
-    data = await file.read()
-    await HospitalService(db).upload_photo(hospital_id, data)
+    """Stream the image into the blob store (JPEG/PNG/WebP/GIF, size-capped)."""
+    await HospitalService(db).upload_photo(hospital_id, file)
 
 
 @router.get(
@@ -159,11 +275,18 @@ async def upload_hospital_photo(
 )
 async def get_hospital_photo(
     hospital_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    size: Optional[str] = Query(None, pattern=VARIANT_SIZE_PATTERN),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    b64 = await HospitalService(db).get_photo(hospital_id)
-    return JSONResponse(content={"photo": b64})
+    """
+    Raw image bytes; Range and If-None-Match aware. `size` picks a
+    thumbnail (thumb/small/medium), falling back to the original.
+    """
+    digest = await HospitalService(db).get_photo_digest(hospital_id, size)
+    # this URL changes content on re-upload: revalidate; /photos/{digest} is immutable
+    return await blob_response(request, digest, cache_control=CACHE_CONTROL)
 
 
 @router.delete(
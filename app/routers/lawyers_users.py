@@ -60,7 +60,7 @@ async def login(
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid phone number or password",
@@ -88,7 +88,7 @@ async def token(
     stmt = select(UserModel).where(UserModel.phone_number == form_data.username)
     result = await db.execute(stmt)
     user = result.scalars().first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
     access_token, expires_at = create_access_token(data={"sub": str(user.id)})
     return SignInResponseSchema(
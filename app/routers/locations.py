@@ -3,20 +3,23 @@ import uuid
 import traceback
 from typing import List
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.service.locations import LocationService
 from app.schemas.locations import (
     RegionResponseSchema,
     RegionWithDistrictsSchema,
+    LocationTreeSchema,
+    LocationVersionSchema,
     RegionCreateSchema,
     RegionUpdateSchema,
     DistrictResponseSchema,
     DistrictCreateSchema,
     DistrictUpdateSchema,
 )
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_read_db
+from app.core.etag import etag_headers, etag_matches, not_modified
 from app.exc import LoggedHTTPException, raise_with_log
 from fastapi import Depends
 from app.core.security import get_current_user
@@ -25,6 +28,58 @@ from app.models.users import UserModel
 router = APIRouter(prefix="/locations")
 
 
+@router.get(
+    "/tree",
+    tags=["Locations - Regions"],
+    response_model=LocationTreeSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_location_tree(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """All regions with their districts, plus the tree version."""
+    try:
+        svc = LocationService(db)
+        etag = await svc.etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.get_tree()
+    except LoggedHTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise_with_log(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, f"Failed to get location tree: {e}"
+        )
+
+
+@router.get(
+    "/version",
+    tags=["Locations - Regions"],
+    response_model=LocationVersionSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_location_version(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Current tree version; refetch /locations/tree only when it changes."""
+    try:
+        return {"version": (await LocationService(db).get_tree()).version}
+    except LoggedHTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise_with_log(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            f"Failed to get location version: {e}",
+        )
+
+
 @router.get(
     "/regions",
     tags=["Locations - Regions"],
@@ -32,12 +87,19 @@ router = APIRouter(prefix="/locations")
     status_code=status.HTTP_200_OK,
 )
 async def get_regions(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """List all regions."""
     try:
-        return await LocationService(db).list_regions()
+        svc = LocationService(db)
+        etag = await svc.etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.list_regions()
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -54,18 +116,20 @@ async def get_regions(
     status_code=status.HTTP_200_OK,
 )
 async def get_region(
+    request: Request,
+    response: Response,
     region_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """Get one region plus its districts."""
     try:
         svc = LocationService(db)
-        region = await svc.get_region(region_id)
-        # manually attach districts list for the richer schema
-        districts = await svc.list_districts_by_region(region_id)
-        region.districts = districts
-        return region
+        etag = await svc.etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.get_region_with_districts(region_id)
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -156,12 +220,19 @@ async def delete_region(
     status_code=status.HTTP_200_OK,
 )
 async def get_districts(
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """List all districts."""
     try:
-        return await LocationService(db).list_districts()
+        svc = LocationService(db)
+        etag = await svc.etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.list_districts()
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -178,13 +249,20 @@ async def get_districts(
     status_code=status.HTTP_200_OK,
 )
 async def get_districts_by_region(
+    request: Request,
+    response: Response,
     region_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """List all districts in a given region."""
     try:
-        return await LocationService(db).list_districts_by_region(region_id)
+        svc = LocationService(db)
+        etag = await svc.etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+        return await svc.list_districts_by_region(region_id)
     except LoggedHTTPException:
         raise
     except Exception as e:
@@ -203,7 +281,7 @@ async def get_districts_by_region(
 )
 async def get_district(
     district_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     try:
         return await LocationService(db).get_district(district_id)
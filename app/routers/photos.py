@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Request, status
+
+from app.core.blobstore import blob_response
+from app.core.security import get_current_user
+from app.models.users import UserModel
+
+router = APIRouter(prefix="/photos", tags=["Photos"])
+
+
+@router.get(
+    "/{digest}",
+    status_code=status.HTTP_200_OK,
+)
+async def get_photo(
+    digest: str,
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Image by content hash (`photo_digest`); immutable, cache it forever."""
+    return await blob_response(request, digest)
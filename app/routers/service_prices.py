@@ -1,9 +1,10 @@
 import uuid
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_read_db
+from app.core.etag import etag_headers, etag_matches, not_modified
 from app.service.service_prices import ServicePriceService
 from app.schemas.service_prices import (
     ServicePriceCreate,
@@ -45,19 +46,33 @@ async def delete_service_price(
 @router.get("/{service_id}", response_model=ServicePriceResponse)
 async def get_service_price(
     service_id: uuid.UUID,
-    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await ServicePriceService(db).get_by_id(service_id)
+    svc = ServicePriceService(db)
+    etag = await svc.etag(service_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return await svc.get_by_id(service_id)
 
 
 @router.get("", response_model=ServicePriceListResponse)
 async def list_service_prices(
+    request: Request,
+    response: Response,
     hospital_id: Optional[uuid.UUID] = Query(None),
     doctor_id: Optional[uuid.UUID] = Query(None),
 
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    items, total = await ServicePriceService(db).list(
+    svc = ServicePriceService(db)
+    etag = await svc.list_etag(hospital_id=hospital_id, doctor_id=doctor_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    items, total = await svc.list(
         hospital_id=hospital_id,
         doctor_id=doctor_id,
 
@@ -0,0 +1,40 @@
+import traceback
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.core.security import get_current_user
+from app.exc import LoggedHTTPException, raise_with_log
+from app.models.users import UserModel
+from app.schemas.sync import SyncChangesSchema
+from app.service.sync import SyncService
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get(
+    "/changes",
+    response_model=SyncChangesSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_changes(
+    cursor: Optional[str] = Query(None, description="`cursor` from the previous page; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Regions, districts, hospitals, doctors and services changed since `cursor`.
+    Keep calling with the returned cursor while `has_more` is true.
+    """
+    try:
+        return await SyncService(db).changes(cursor, limit)
+    except LoggedHTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise_with_log(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, f"Failed to load changes: {e}"
+        )
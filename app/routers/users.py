@@ -19,6 +19,7 @@ from app.schemas.users import (
 )
 from app.service.users import UserDetailService
 from app.core.database import get_async_db
+from app.core.responses import json_list_response
 from app.exc import LoggedHTTPException, raise_with_log
 from app.core.security import verify_password, create_access_token
 from app.schemas.users import SignInRequestSchema, SignInResponseSchema
@@ -67,7 +68,7 @@ async def login(
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid phone number or password",
@@ -95,7 +96,7 @@ async def token(
     stmt = select(UserModel).where(UserModel.phone_number == form_data.username)
     result = await db.execute(stmt)
     user = result.scalars().first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
     access_token, expires_at = create_access_token(data={"sub": str(user.id)})
     return SignInResponseSchema(
@@ -140,7 +141,7 @@ async def get_all_users(
     """List all users."""
     try:
         users = await UserService(db).list_all()
-        return users
+        return json_list_response(RegisterResponseSchema, users)
 
     except LoggedHTTPException:
         raise
@@ -1,8 +1,9 @@
 import uuid
 from datetime import date, time, datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from .base import BaseSchema
+from app.core.working_hours import WEEKDAYS, parse_day
 
 
 class WorkingHoursSchema(BaseSchema):
@@ -15,6 +16,15 @@ class WorkingHoursSchema(BaseSchema):
     sunday: Optional[str] = None
 
 
+class WorkingHoursInputSchema(WorkingHoursSchema):
+    """Written hours: "HH:MM-HH:MM", several comma separated, null when closed."""
+
+    @field_validator(*WEEKDAYS)
+    def validate_ranges(cls, v):
+        parse_day(v)
+        return v
+
+
 class SlotSchema(BaseSchema):
     start: str  # "09:00"
     end: str  # "09:30"
@@ -26,6 +36,42 @@ class AvailableSlotsResponse(BaseSchema):
     slots: List[SlotSchema]
 
 
+class AvailabilityDaySchema(BaseSchema):
+    date: date
+    total: int  # slots in the doctor's hours that day
+    free: int
+    booked: int
+    # present unless include_slots=false (heatmap only)
+    slots: Optional[List[SlotSchema]] = None
+
+
+class AvailabilityResponse(BaseSchema):
+    doctor_id: uuid.UUID
+    date_from: date
+    date_to: date
+    slot_minutes: int
+    days: List[AvailabilityDaySchema]
+
+
+class EarliestSlotSchema(BaseSchema):
+    doctor_id: uuid.UUID
+    first_name: str
+    last_name: str
+    professional: Optional[str] = None
+    reyting: Optional[float] = None
+    hospital_id: uuid.UUID
+    hospital_name: str
+    date: date
+    start: str  # "09:00"
+    end: str  # "09:30"
+
+
+class EarliestSlotsResponse(BaseSchema):
+    items: List[EarliestSlotSchema]
+    # doctors that matched the filters and were checked
+    doctors_considered: int
+
+
 class BookingCreateSchema(BaseSchema):
     user_id: uuid.UUID
     date: date
@@ -1,10 +1,10 @@
 import uuid
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from .base import BaseSchema
 from .hospitals import HospitalBasicSchema
 from pydantic import BaseModel, Field
-from .doctor_bookings import WorkingHoursSchema
+from .doctor_bookings import WorkingHoursInputSchema, WorkingHoursSchema
 
 class DoctorCreateSchema(BaseModel):
     first_name: str
@@ -12,7 +12,7 @@ class DoctorCreateSchema(BaseModel):
     professional: Optional[str] = None
     about: Optional[str] = None
     hospital_id: uuid.UUID
-    working_hours: Optional[WorkingHoursSchema] = None
+    working_hours: Optional[WorkingHoursInputSchema] = None
 
 
 class DoctorUpdateSchema(BaseModel):
@@ -21,7 +21,7 @@ class DoctorUpdateSchema(BaseModel):
     professional: Optional[str] = None
     about: Optional[str] = None
     hospital_id: Optional[uuid.UUID] = None
-    working_hours: Optional[WorkingHoursSchema] = None
+    working_hours: Optional[WorkingHoursInputSchema] = None
 
 
 class DoctorResponseSchema(BaseSchema):
@@ -33,9 +33,55 @@ class DoctorResponseSchema(BaseSchema):
     reyting: Optional[float]
     hospital: HospitalBasicSchema
     working_hours: Optional[WorkingHoursSchema] = None
+    # images served (cacheable forever) at /photos/{digest}
+    photo_digest: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
 
 
 class DoctorBasicSchema(BaseSchema):
     id: uuid.UUID
     first_name: str
     last_name: str
+
+
+class DoctorSearchHitSchema(BaseSchema):
+    id: uuid.UUID
+    first_name: str
+    last_name: str
+    professional: Optional[str] = None
+    reyting: Optional[float] = None
+    hospital: HospitalBasicSchema
+    photo_digest: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+    score: float
+
+
+class DoctorSearchResponseSchema(BaseSchema):
+    items: List[DoctorSearchHitSchema]
+    # pass back as `offset` for the next page; null on the last one
+    next_offset: Optional[int] = None
+
+
+class SpecialtyCountSchema(BaseSchema):
+    professional: Optional[str] = None
+    count: int
+
+
+class DistrictFacetSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    count: int
+    specialties: List[SpecialtyCountSchema]
+
+
+class RegionFacetSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    count: int
+    districts: List[DistrictFacetSchema]
+
+
+class SpecialtyFacetsSchema(BaseSchema):
+    total: int
+    specialties: List[SpecialtyCountSchema]
+    regions: List[RegionFacetSchema]
@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from .base import BaseSchema
 from .locations import (
@@ -7,7 +7,9 @@ from .locations import (
     DistrictBasicSchema,
 )
 from pydantic import BaseModel, Field
-from .doctor_bookings import WorkingHoursSchema
+from .doctor_bookings import WorkingHoursInputSchema, WorkingHoursSchema
+from .reviews import ReviewResponseSchema
+from .service_prices import ServicePriceResponse
 
 
 class HospitalCreateSchema(BaseModel):
@@ -17,7 +19,9 @@ class HospitalCreateSchema(BaseModel):
     region_id: uuid.UUID
     district_id: uuid.UUID
     coordinates: Optional[str] = None
-    working_hours: Optional[WorkingHoursSchema] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    working_hours: Optional[WorkingHoursInputSchema] = None
     phone_number: str | None = None
 class HospitalUpdateSchema(BaseModel):
     name: Optional[str] = None
@@ -26,7 +30,9 @@ class HospitalUpdateSchema(BaseModel):
     region_id: Optional[uuid.UUID] = None
     district_id: Optional[uuid.UUID] = None
     coordinates: Optional[str] = None
-    working_hours: Optional[WorkingHoursSchema] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    working_hours: Optional[WorkingHoursInputSchema] = None
     phone_number: str | None = None
 #
 # ─── HOSPITAL RESPONSE SCHEMA ───────────────────────────────────────────────────────
@@ -44,5 +50,63 @@ class HospitalResponseSchema(BaseSchema):
     region: RegionBasicSchema
     district: DistrictBasicSchema
     coordinates: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     working_hours: Optional[WorkingHoursSchema] = None
-    phone_number: str | None = None
\ No newline at end of file
+    phone_number: str | None = None
+    # images served (cacheable forever) at /photos/{digest}
+    photo_digest: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+
+
+class NearbyHospitalSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    address: Optional[str] = None
+    reyting: Optional[float] = None
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+class NearbyDoctorSchema(BaseSchema):
+    id: uuid.UUID
+    first_name: str
+    last_name: str
+    professional: Optional[str] = None
+    reyting: Optional[float] = None
+    hospital_id: uuid.UUID
+    hospital_name: str
+    distance_km: float
+
+
+class NearbyResponseSchema(BaseSchema):
+    hospitals: List[NearbyHospitalSchema]
+    doctors: Optional[List[NearbyDoctorSchema]] = None
+
+
+# ─── HOSPITAL PAGE (one round trip for the detail screen) ──────────────────────────
+PAGE_SECTIONS = ("doctors", "services", "reviews")
+
+
+class HospitalPageDoctorSchema(BaseSchema):
+    id: uuid.UUID
+    first_name: str
+    last_name: str
+    professional: Optional[str] = None
+    reyting: Optional[float] = None
+    photo_digest: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+
+
+class ReviewSummarySchema(BaseSchema):
+    total: int
+    latest: List[ReviewResponseSchema]
+
+
+class HospitalPageSchema(BaseSchema):
+    hospital: HospitalResponseSchema
+    # sections left out with `include` are omitted from the response
+    doctors: Optional[List[HospitalPageDoctorSchema]] = None
+    services: Optional[List[ServicePriceResponse]] = None
+    reviews: Optional[ReviewSummarySchema] = None
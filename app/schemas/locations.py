@@ -23,6 +23,21 @@ class RegionWithDistrictsSchema(BaseSchema):
     districts: List[DistrictBasicSchema]
 
 
+class RegionTreeSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    districts: List[DistrictBasicSchema]
+
+
+class LocationTreeSchema(BaseSchema):
+    version: int
+    regions: List[RegionTreeSchema]
+
+
+class LocationVersionSchema(BaseSchema):
+    version: int
+
+
 class DistrictResponseSchema(BaseSchema):
     id: uuid.UUID
     name: str
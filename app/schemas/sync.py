@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .base import BaseSchema
+from .doctor_bookings import WorkingHoursSchema
+
+
+class SyncRegionSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    modified_at: datetime
+
+
+class SyncDistrictSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    region_id: uuid.UUID
+    modified_at: datetime
+
+
+class SyncHospitalSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    address: Optional[str] = None
+    orientir: Optional[str] = None
+    reyting: Optional[float] = None
+    region_id: uuid.UUID
+    district_id: uuid.UUID
+    coordinates: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    working_hours: Optional[WorkingHoursSchema] = None
+    phone_number: Optional[str] = None
+    photo_digest: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+    modified_at: datetime
+
+
+class SyncDoctorSchema(BaseSchema):
+    id: uuid.UUID
+    first_name: str
+    last_name: str
+    professional: Optional[str] = None
+    about: Optional[str] = None
+    reyting: Optional[float] = None
+    hospital_id: uuid.UUID
+    working_hours: Optional[WorkingHoursSchema] = None
+    photo_digest: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+    modified_at: datetime
+
+
+class SyncServiceSchema(BaseSchema):
+    id: uuid.UUID
+    name: str
+    description: Optional[str] = None
+    price: float
+    hospital_id: Optional[uuid.UUID] = None
+    doctor_id: Optional[uuid.UUID] = None
+    modified_at: datetime
+
+
+class SyncDeletedSchema(BaseSchema):
+    entity: str
+    id: uuid.UUID
+
+
+class SyncChangesSchema(BaseSchema):
+    """Upserts and deletions since the request cursor, oldest first."""
+
+    cursor: str
+    has_more: bool
+    regions: List[SyncRegionSchema] = []
+    districts: List[SyncDistrictSchema] = []
+    hospitals: List[SyncHospitalSchema] = []
+    doctors: List[SyncDoctorSchema] = []
+    services: List[SyncServiceSchema] = []
+    deleted: List[SyncDeletedSchema] = []
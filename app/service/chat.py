@@ -6,7 +6,7 @@ from fastapi import Depends
 from app.models.chat import ChatHistoryModel
 from app.schemas.chat import ChatRequestSchema
 from app.core.database import get_async_db
-from app.core.config import get_chat_response
+from app.core.ai import get_chat_response
 from fastapi import HTTPException, status
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -1,11 +1,104 @@
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+import heapq
+import itertools
 import uuid
+from typing import Any, Optional
+from sqlalchemy import any_, bindparam
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.future import select
 from fastapi import HTTPException
-from app.models import DoctorModel, QueueModel
+from app.core.config import config
+from app.models import DoctorModel, HospitalModel, QueueModel
+from app.models.queue import CANCELLED, OVERLAP_CONSTRAINT
+from app.core.slots import (
+    GRID_MINUTES,
+    SLOT_MINUTES,
+    booking_ranges,
+    busy_mask,
+    count,
+    free_starts,
+    iter_minutes,
+    minutes_of_day,
+    start_mask,
+)
+from app.core.working_hours import local_now
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+# Postgres error codes seen when booking
+EXCLUSION_VIOLATION = "23P01"
+UNIQUE_VIOLATION = "23505"
+# serialization failure, deadlock: safe to run the insert again
+RETRYABLE = ("40001", "40P01")
+
+
+def _hhmm(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def _appointment_range(day: date, start_time: str, end_time: str) -> tuple[datetime, datetime]:
+    """HH:MM pair on `day`; an end at or before the start runs past midnight."""
+    start = datetime.combine(day, datetime.strptime(start_time, "%H:%M").time())
+    end = datetime.combine(day, datetime.strptime(end_time, "%H:%M").time())
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def _pg_error(exc: DBAPIError) -> tuple[Optional[str], Optional[str]]:
+    """(sqlstate, constraint name) of a driver error; asyncpg keeps them on the cause."""
+    orig = exc.orig
+    cause = getattr(orig, "__cause__", None)
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(cause, "sqlstate", None)
+    return sqlstate, getattr(cause, "constraint_name", None)
+
+
+def day_availability(schedule, day: date, bookings, include_slots: bool = True) -> dict[str, Any]:
+    """Slot counts (and optionally the slot list) of one doctor-day from bitmasks."""
+    starts = start_mask(schedule, day)
+    free = free_starts(starts, busy_mask(booking_ranges(bookings, day)))
+    total, free_count = count(starts), count(free)
+    entry = {"date": day, "total": total, "free": free_count, "booked": total - free_count}
+    if include_slots:
+        entry["slots"] = [
+            {
+                "start": _hhmm(minute),
+                "end": _hhmm(minute + SLOT_MINUTES),
+                "status": "free" if free >> (minute // GRID_MINUTES) & 1 else "booked",
+            }
+            for minute in iter_minutes(starts)
+        ]
+    return entry
+
+
+def earliest_openings(
+    doctors, bookings, first_day: date, days: int, now: datetime, limit: int, per_doctor: int
+) -> list:
+    """
+    [(day, minute, doctor)] of the `limit` earliest free slots, `per_doctor`
+    at most each. `doctors` need `.id`, `.schedule` and `.reyting`;
+    `bookings` maps (doctor_id, day) -> [(start, end)] datetimes.
+    """
+    openings = []
+    for doctor in doctors:
+        found = 0
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            starts = start_mask(doctor.schedule, day)
+            if not starts:
+                continue
+            busy = busy_mask(booking_ranges(bookings.get((doctor.id, day), ()), day))
+            free = free_starts(starts, busy, minutes_of_day(now) if day == now.date() else 0)
+            for minute in itertools.islice(iter_minutes(free), per_doctor - found):
+                openings.append((day, minute, doctor))
+                found += 1
+            if found >= per_doctor:
+                break
+    return heapq.nsmallest(limit, openings, key=lambda o: (o[0], o[1], -(o[2].reyting or 0)))
+
+
 class DoctorBookingService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -16,122 +109,248 @@ class DoctorBookingService:
             raise HTTPException(status_code=404, detail="Doctor not found")
         return doctor.working_hours or {}
 
-    async def get_available_slots(self, doctor_id: uuid.UUID, date_str: str):
-        doctor = await self.db.get(DoctorModel, doctor_id)
-        if not doctor or not doctor.working_hours:
+    async def _doctor_schedule(self, doctor_id: uuid.UUID):
+        res = await self.db.execute(select(DoctorModel.schedule).where(DoctorModel.id == doctor_id))
+        schedule = res.scalar_one_or_none()
+        if not schedule:
             raise HTTPException(
                 status_code=404, detail="Doctor not found or no working hours set"
             )
+        return schedule
 
+    async def get_available_slots(self, doctor_id: uuid.UUID, date_str: str):
         date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-        day_name = date_obj.strftime("%A").lower()
-        hours_str = doctor.working_hours.get(day_name)
-        if not hours_str:
-            return {"date": date_str, "slots": []}
-
-        start_str, end_str = hours_str.split("-")
-        start_time = datetime.strptime(start_str, "%H:%M").time()
-        end_time = datetime.strptime(end_str, "%H:%M").time()
-
-        # Get booked slots from DB
-        booked_query = await self.db.execute(
-            select(QueueModel).filter(
-                QueueModel.doctor_id == doctor_id,
-                QueueModel.appointment_date == date_obj,
+        day = (await self.availability(doctor_id, date_obj, date_obj))["days"][0]
+        return {"date": date_str, "slots": day["slots"]}
+
+    async def availability(
+        self,
+        doctor_id: uuid.UUID,
+        date_from: date,
+        date_to: date,
+        include_slots: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Free/booked 30-minute slots of one doctor for every day in the range.
+
+        Each day is a pair of bitmasks (app.core.slots): slot starts from
+        the compiled schedule and free starts after the day's bookings are
+        applied as intervals, so a booking blocks every slot it overlaps.
+        Two queries for the whole range.
+        """
+        schedule = await self._doctor_schedule(doctor_id)
+        bookings = await self._bookings_by_day([doctor_id], date_from, date_to)
+
+        days = []
+        day = date_from
+        while day <= date_to:
+            days.append(
+                day_availability(schedule, day, bookings.get((doctor_id, day), ()), include_slots)
             )
-        )
-        booked_times = {
-            (q.appointment_start.time(), q.appointment_end.time())
-            for q in booked_query.scalars().all()
+            day += timedelta(days=1)
+        return {
+            "doctor_id": doctor_id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "slot_minutes": SLOT_MINUTES,
+            "days": days,
         }
 
-        # Generate 30-min slots
-        slots = []
-        current = datetime.combine(date_obj, start_time)
-        end_dt = datetime.combine(date_obj, end_time)
-        while current < end_dt:
-            next_time = current + timedelta(minutes=30)
-            status_val = (
-                "booked"
-                if (current.time(), next_time.time()) in booked_times
-                else "free"
-            )
-            slots.append(
-                {
-                    "start": current.strftime("%H:%M"),
-                    "end": next_time.strftime("%H:%M"),
-                    "status": status_val,
-                }
+    async def _bookings_by_day(
+        self, doctor_ids: list, first_day: date, last_day: date
+    ) -> dict:
+        """(doctor_id, day) -> [(start, end)] for every booking touching the range; one query."""
+        range_start = datetime.combine(first_day, datetime.min.time())
+        res = await self.db.execute(
+            select(QueueModel.doctor_id, QueueModel.appointment_start, QueueModel.appointment_end).where(
+                QueueModel.doctor_id == any_(
+                    bindparam("doctor_ids", doctor_ids, type_=ARRAY(UUID(as_uuid=True)))
+                ),
+                # bounds the (doctor_id, appointment_start) index scan on both
+                # sides; a booking lasts at most a day (see _appointment_range)
+                QueueModel.appointment_start >= range_start - timedelta(days=1),
+                QueueModel.appointment_start < datetime.combine(last_day + timedelta(days=1), datetime.min.time()),
+                QueueModel.appointment_end > range_start,
+                QueueModel.status != CANCELLED,
             )
-            current = next_time
+        )
+        by_day = defaultdict(list)
+        for doctor_id, start, end in res:
+            day = max(start.date(), first_day)
+            while day <= min(end.date(), last_day):
+                by_day[(doctor_id, day)].append((start, end))
+                day += timedelta(days=1)
+        return by_day
 
-        return {"date": date_str, "slots": slots}
+    async def earliest_free_slots(
+        self,
+        *,
+        professional: Optional[str] = None,
+        region_id: Optional[uuid.UUID] = None,
+        district_id: Optional[uuid.UUID] = None,
+        date_from: Optional[date] = None,
+        days: int = 7,
+        limit: int = 10,
+        per_doctor: int = 1,
+    ) -> dict[str, Any]:
+        """
+        The `limit` earliest free 30-minute slots across every doctor matching
+        the filters, at most `per_doctor` each.
 
-    async def book_slot(self, doctor_id: uuid.UUID, data):
-        doctor = await self.db.get(DoctorModel, doctor_id)
-        if not doctor:
-            raise HTTPException(status_code=404, detail="Doctor not found")
+        Two queries whatever the number of doctors or days: the matching
+        doctors with their compiled schedules, then all of their bookings in
+        the range. Free slots come from the bitmap engine (app.core.slots),
+        one mask per doctor-day.
+        """
+        now = local_now()
+        first_day = max(date_from or now.date(), now.date())
+        last_day = first_day + timedelta(days=days - 1)
 
-        date_obj = data.date
-        start_dt = datetime.combine(
-            date_obj, datetime.strptime(data.start_time, "%H:%M").time()
-        )
-        end_dt = datetime.combine(
-            date_obj, datetime.strptime(data.end_time, "%H:%M").time()
+        stmt = (
+            select(
+                DoctorModel.id,
+                DoctorModel.first_name,
+                DoctorModel.last_name,
+                DoctorModel.professional,
+                DoctorModel.reyting,
+                DoctorModel.hospital_id,
+                HospitalModel.name.label("hospital_name"),
+                DoctorModel.schedule,
+            )
+            .join(HospitalModel, HospitalModel.id == DoctorModel.hospital_id)
+            .where(DoctorModel.schedule.is_not(None))
+            .order_by(DoctorModel.reyting.desc().nulls_last(), DoctorModel.id)
+            .limit(config.SLOT_SEARCH_MAX_DOCTORS)
         )
+        if professional:
+            stmt = stmt.where(DoctorModel.professional.ilike(f"%{professional.strip()}%"))
+        if region_id is not None:
+            stmt = stmt.where(HospitalModel.region_id == region_id)
+        if district_id is not None:
+            stmt = stmt.where(HospitalModel.district_id == district_id)
+        doctors = (await self.db.execute(stmt)).all()
+        if not doctors:
+            return {"items": [], "doctors_considered": 0}
+
+        bookings = await self._bookings_by_day([d.id for d in doctors], first_day, last_day)
+
+        earliest = earliest_openings(doctors, bookings, first_day, days, now, limit, per_doctor)
+        return {
+            "items": [
+                {
+                    "doctor_id": doctor.id,
+                    "first_name": doctor.first_name,
+                    "last_name": doctor.last_name,
+                    "professional": doctor.professional,
+                    "reyting": doctor.reyting,
+                    "hospital_id": doctor.hospital_id,
+                    "hospital_name": doctor.hospital_name,
+                    "date": day,
+                    "start": _hhmm(minute),
+                    "end": _hhmm(minute + SLOT_MINUTES),
+                }
+                for day, minute, doctor in earliest
+            ],
+            "doctors_considered": len(doctors),
+        }
 
-        # Check if slot is booked
-        existing_booking = await self.db.execute(
-            select(QueueModel).filter(
-                QueueModel.doctor_id == doctor_id,
-                QueueModel.appointment_date == date_obj,
-                QueueModel.appointment_start == start_dt,
-                QueueModel.appointment_end == end_dt,
+    async def _by_idempotency_key(self, user_id: uuid.UUID, key: str) -> Optional[QueueModel]:
+        res = await self.db.execute(
+            select(QueueModel).where(
+                QueueModel.user_id == user_id, QueueModel.idempotency_key == key
             )
         )
-        if existing_booking.scalars().first():
-            raise HTTPException(status_code=400, detail="Slot already booked")
-
-        # Create booking
-        booking = QueueModel(
-            hospital_id=doctor.hospital_id,
-            doctor_id=doctor_id,
-            user_id=data.user_id,
-            appointment_date=date_obj,
-            appointment_start=start_dt,
-            appointment_end=end_dt,
-            status="waiting",
-        )
-        self.db.add(booking)
-        await self.db.commit()
-        await self.db.refresh(booking)
+        return res.scalar_one_or_none()
+
+    @staticmethod
+    def _replay(booking: QueueModel, doctor_id: uuid.UUID, start: datetime, end: datetime) -> QueueModel:
+        """The booking an Idempotency-Key already produced, if it was for the same slot."""
+        if (booking.doctor_id, booking.appointment_start, booking.appointment_end) != (doctor_id, start, end):
+            raise HTTPException(
+                status_code=422, detail="Idempotency-Key was already used for a different booking"
+            )
         return booking
 
+    async def book_slot(self, doctor_id: uuid.UUID, data, idempotency_key: Optional[str] = None):
+        """
+        Insert a booking; the database decides who gets the slot.
+
+        No check-then-insert: the exclusion constraint on (doctor_id,
+        tsrange(start, end)) rejects any booking overlapping a live one, so
+        of N concurrent requests for a slot exactly one commits and the rest
+        get 409. A repeated `idempotency_key` of the same user returns the
+        booking it first created instead of a second one, also when both
+        requests race. Serialization failures and deadlocks are retried.
+        """
+        start_dt, end_dt = _appointment_range(data.date, data.start_time, data.end_time)
+        if idempotency_key:
+            existing = await self._by_idempotency_key(data.user_id, idempotency_key)
+            if existing:
+                return self._replay(existing, doctor_id, start_dt, end_dt)
+
+        res = await self.db.execute(select(DoctorModel.hospital_id).where(DoctorModel.id == doctor_id))
+        hospital_id = res.scalar_one_or_none()
+        if hospital_id is None:
+            raise HTTPException(status_code=404, detail="Doctor not found")
+
+        for attempt in range(1, config.BOOKING_MAX_ATTEMPTS + 1):
+            booking = QueueModel(
+                hospital_id=hospital_id,
+                doctor_id=doctor_id,
+                user_id=data.user_id,
+                appointment_date=data.date,
+                appointment_start=start_dt,
+                appointment_end=end_dt,
+                status="waiting",
+                idempotency_key=idempotency_key,
+            )
+            self.db.add(booking)
+            try:
+                await self.db.commit()
+            except DBAPIError as exc:
+                await self.db.rollback()
+                sqlstate, constraint = _pg_error(exc)
+                if idempotency_key and sqlstate in (EXCLUSION_VIOLATION, UNIQUE_VIOLATION):
+                    # a concurrent retry with the same key committed first; it
+                    # trips the overlap constraint or the key index, whichever
+                    # Postgres checks first, and either way is a replay
+                    existing = await self._by_idempotency_key(data.user_id, idempotency_key)
+                    if existing:
+                        return self._replay(existing, doctor_id, start_dt, end_dt)
+                if sqlstate == EXCLUSION_VIOLATION or constraint == OVERLAP_CONSTRAINT:
+                    raise HTTPException(status_code=409, detail="Slot already booked")
+                if sqlstate not in RETRYABLE or attempt == config.BOOKING_MAX_ATTEMPTS:
+                    raise
+                continue
+            await self.db.refresh(booking)
+            return booking
+
     async def update_booking(self, booking_id: uuid.UUID, data):
         booking = await self.db.get(QueueModel, booking_id)
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
 
         if data.date or data.start_time or data.end_time:
-            date_obj = data.date or booking.appointment_date
-            start_time_obj = (
-                datetime.strptime(data.start_time, "%H:%M").time()
-                if data.start_time
-                else booking.appointment_start.time()
-            )
-            end_time_obj = (
-                datetime.strptime(data.end_time, "%H:%M").time()
-                if data.end_time
-                else booking.appointment_end.time()
+            date_obj = data.date or booking.appointment_date.date()
+            start_dt, end_dt = _appointment_range(
+                date_obj,
+                data.start_time or booking.appointment_start.strftime("%H:%M"),
+                data.end_time or booking.appointment_end.strftime("%H:%M"),
             )
             booking.appointment_date = date_obj
-            booking.appointment_start = datetime.combine(date_obj, start_time_obj)
-            booking.appointment_end = datetime.combine(date_obj, end_time_obj)
+            booking.appointment_start = start_dt
+            booking.appointment_end = end_dt
 
         if data.status:
             booking.status = data.status
 
-        await self.db.commit()
+        try:
+            await self.db.commit()
+        except IntegrityError as exc:
+            await self.db.rollback()
+            if _pg_error(exc)[0] == EXCLUSION_VIOLATION:
+                raise HTTPException(status_code=409, detail="Slot already booked")
+            raise
         await self.db.refresh(booking)
         return booking
 
@@ -1,26 +1,72 @@
 import uuid
-from fastapi import HTTPException, status
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import any_, bindparam, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
+from app.core.cache import Snapshot
+from app.core.config import config
+from app.core.database import ReadOnlySessionFactory, mark_changed, on_commit
+from app.core.projection import schema_options
+from app.core.search import prefix_tsquery, tokens
+from app.core.etag import collection_etag, entity_etag, fingerprint
 from app.models.hospitals import HospitalModel
 from app.models.doctors import DoctorModel
-from app.schemas.doctors import DoctorCreateSchema, DoctorUpdateSchema
+from app.schemas.doctors import (
+    DoctorCreateSchema,
+    DoctorResponseSchema,
+    DoctorSearchHitSchema,
+    DoctorUpdateSchema,
+)
 from app.exc import LoggedHTTPException
+from app.service.photos import pick_variant, save_photo
 from app.exc import LoggedHTTPException
-import base64
 from app.schemas.base import DEFAULT_WORKING_HOURS
+from app.core.working_hours import ScheduleIndex, to_local
+
+
+async def _build_schedule_index(db: AsyncSession) -> ScheduleIndex:
+    res = await db.execute(
+        select(DoctorModel.id, DoctorModel.schedule).where(DoctorModel.schedule.is_not(None))
+    )
+    return ScheduleIndex(res.all())
+
+
+schedule_index: Snapshot[ScheduleIndex] = Snapshot(
+    _build_schedule_index,
+    ttl=config.SCHEDULE_INDEX_TTL_SECONDS,
+    session_factory=ReadOnlySessionFactory,
+)
+on_commit("doctors", schedule_index.invalidate)
+
 
 class DoctorService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def list_doctors(self) -> list[DoctorModel]:
-        stmt = select(DoctorModel).options(selectinload(DoctorModel.hospital))
+    @staticmethod
+    def _list_stmt():
+        # only what DoctorResponseSchema renders; list rows are read-only
+        return select(DoctorModel).options(*schema_options(DoctorModel, DoctorResponseSchema))
+
+    async def list_doctors(self, available_at: Optional[datetime] = None) -> list[DoctorModel]:
+        """All doctors, or only those whose working hours cover `available_at`."""
+        stmt = self._list_stmt()
+        if available_at is not None:
+            working = (await schedule_index.get()).open_at(to_local(available_at))
+            if not working:
+                return []
+            stmt = stmt.where(DoctorModel.id == any_(
+                bindparam("working_ids", list(working), type_=ARRAY(UUID(as_uuid=True)))
+            ))
         res = await self.db.execute(stmt)
         return res.scalars().all()
+
     async def list_by_location(
         self,
         *,
@@ -36,8 +82,7 @@ class DoctorService:
                 "Provide exactly one of: region_id, district_id, or hospital_id.",
             )
 
-        # Base query loads hospital relation for the response schema
-        stmt = select(DoctorModel).options(selectinload(DoctorModel.hospital))
+        stmt = self._list_stmt()
 
         if hospital_id is not None:
             # Direct filter on doctors.hospital_id
@@ -56,6 +101,74 @@ class DoctorService:
         res = await self.db.execute(stmt)
         return res.scalars().all()
 
+    async def search(self, q: str, *, offset: int = 0, limit: int = 20) -> dict[str, Any]:
+        """
+        Doctors matching `q` by name, specialty or about text, best first.
+
+        Both sides are normalized (app.core.search), so Latin and Cyrillic
+        spellings meet. A row matches on the full-text vector (every word
+        as a prefix) or on trigram word similarity, which absorbs typos;
+        each arm is served by its own GIN index.
+        """
+        words = tokens(q)
+        if not words:
+            raise LoggedHTTPException(
+                status.HTTP_400_BAD_REQUEST, "Search query needs at least 2 letters or digits"
+            )
+        normalized = " ".join(words)
+        tsquery = func.to_tsquery(literal_column("'simple'"), prefix_tsquery(words))
+        score = (
+            func.ts_rank_cd(DoctorModel.search_vector, tsquery)
+            + func.word_similarity(normalized, DoctorModel.search_text)
+        ).label("score")
+        stmt = (
+            select(DoctorModel, score)
+            .options(*schema_options(DoctorModel, DoctorSearchHitSchema))
+            .where(
+                or_(
+                    DoctorModel.search_vector.op("@@")(tsquery),
+                    literal(normalized).op("<%")(DoctorModel.search_text),
+                )
+            )
+            .order_by(score.desc(), DoctorModel.reyting.desc().nulls_last(), DoctorModel.id)
+            .offset(offset)
+            .limit(limit + 1)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        items = [
+            {
+                "id": doc.id,
+                "first_name": doc.first_name,
+                "last_name": doc.last_name,
+                "professional": doc.professional,
+                "reyting": doc.reyting,
+                "hospital": doc.hospital,
+                "photo_digest": doc.photo_digest,
+                "photo_variants": doc.photo_variants,
+                "score": round(rank, 4),
+            }
+            for doc, rank in rows[:limit]
+        ]
+        return {"items": items, "next_offset": offset + limit if len(rows) > limit else None}
+
+    async def list_etag(self) -> str:
+        # responses embed the hospital name
+        return await collection_etag(
+            self.db, fingerprint(DoctorModel), fingerprint(HospitalModel)
+        )
+
+    async def etag(self, doctor_id: uuid.UUID) -> str | None:
+        hospital_id = (
+            select(DoctorModel.hospital_id)
+            .where(DoctorModel.id == doctor_id)
+            .scalar_subquery()
+        )
+        return await entity_etag(
+            self.db,
+            fingerprint(DoctorModel, DoctorModel.id == doctor_id),
+            fingerprint(HospitalModel, HospitalModel.id == hospital_id),
+        )
+
     async def get_doctor(self, doctor_id: uuid.UUID) -> DoctorModel:
         stmt = (
             select(DoctorModel)
@@ -82,6 +195,7 @@ class DoctorService:
         )
         self.db.add(doc)
         await self.db.flush()
+        mark_changed(self.db, "doctors")
         # re-fetch with hospital loaded
         return await self.get_doctor(doc.id)
 
@@ -102,26 +216,36 @@ class DoctorService:
         if payload.working_hours is not None:  # ⬅️
             doc.working_hours = payload.working_hours.dict()  # ⬅️
         await self.db.flush()
+        mark_changed(self.db, "doctors")
         return await self.get_doctor(doctor_id)
 
     async def delete_doctor(self, doctor_id: uuid.UUID) -> None:
         doc = await self.get_doctor(doctor_id)
         await self.db.delete(doc)
         await self.db.flush()
+        mark_changed(self.db, "doctors")
 
-    async def upload_photo(self, doctor_id: uuid.UUID, data: bytes):
-        """Base64-encode & save as TEXT."""
+    async def upload_photo(self, doctor_id: uuid.UUID, file: UploadFile) -> str:
+        """Store the upload and its thumbnails and point the row at them."""
         doc = await self.get_doctor(doctor_id)
-        doc.photo = base64.b64encode(data).decode("ascii")
+        doc.photo_digest, doc.photo_variants = await save_photo(file)
         await self.db.flush()
+        return doc.photo_digest
 
-    async def get_photo(self, doctor_id: uuid.UUID) -> str:
-        """Return stored Base64 string (or empty)."""
-        doc = await self.get_doctor(doctor_id)
-        return doc.photo or ""
+    async def get_photo_digest(self, doctor_id: uuid.UUID, size: Optional[str] = None) -> str:
+        res = await self.db.execute(
+            select(DoctorModel.photo_digest, DoctorModel.photo_variants).where(DoctorModel.id == doctor_id)
+        )
+        row = res.first()
+        if row is None:
+            raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Doctor not found")
+        if row.photo_digest is None:
+            raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Doctor has no photo")
+        return pick_variant(row.photo_digest, row.photo_variants, size)
 
     async def delete_photo(self, doctor_id: uuid.UUID) -> None:
-        """Remove the stored Base64 photo."""
+        """Unlink the photo; the blob itself is garbage-collected later."""
         doc = await self.get_doctor(doctor_id)
-        doc.photo = None
+        doc.photo_digest = None
+        doc.photo_variants = None
         await self.db.flush()
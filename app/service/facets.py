@@ -0,0 +1,132 @@
+import hashlib
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Snapshot
+from app.core.config import config
+from app.core.database import ReadOnlySessionFactory, on_commit
+from app.core.etag import make_etag
+from app.models.doctors import DoctorModel
+from app.models.hospitals import HospitalModel
+from app.service.locations import location_tree
+
+
+@dataclass(frozen=True)
+class FacetCell:
+    region_id: uuid.UUID
+    district_id: uuid.UUID
+    professional: Optional[str]
+    count: int
+
+
+@dataclass(frozen=True)
+class SpecialtyFacets:
+    """Doctor counts per (region, district, specialty); `version` is a content hash."""
+
+    version: int
+    cells: Tuple[FacetCell, ...]
+
+
+async def _build_specialty_facets(db: AsyncSession) -> SpecialtyFacets:
+    # the only query: one row per non-empty (region, district, specialty)
+    res = await db.execute(
+        select(
+            HospitalModel.region_id,
+            HospitalModel.district_id,
+            DoctorModel.professional,
+            func.count(),
+        )
+        .join(HospitalModel, HospitalModel.id == DoctorModel.hospital_id)
+        .group_by(HospitalModel.region_id, HospitalModel.district_id, DoctorModel.professional)
+        .order_by(HospitalModel.region_id, HospitalModel.district_id, DoctorModel.professional)
+    )
+    cells = tuple(FacetCell(*row) for row in res)
+    digest = hashlib.blake2b(digest_size=8)
+    for cell in cells:
+        digest.update(f"{cell.district_id}:{cell.professional}:{cell.count};".encode())
+    return SpecialtyFacets(version=int.from_bytes(digest.digest(), "big") >> 1, cells=cells)
+
+
+specialty_facets: Snapshot[SpecialtyFacets] = Snapshot(
+    _build_specialty_facets,
+    ttl=config.FACET_CACHE_TTL_SECONDS,
+    session_factory=ReadOnlySessionFactory,
+)
+# doctors come and go or change specialty; hospitals move between districts
+on_commit("doctors", specialty_facets.invalidate)
+on_commit("hospitals", specialty_facets.invalidate)
+
+
+def _count_list(counts: dict) -> list[dict[str, Any]]:
+    return [
+        {"professional": professional, "count": count}
+        for professional, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0] or ""))
+    ]
+
+
+class FacetService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def etag(self) -> str:
+        facets = await specialty_facets.get()
+        tree = await location_tree.get()
+        # region/district names come from the location tree
+        return make_etag("facets", facets.version, tree.version)
+
+    async def specialty_facets(
+        self,
+        *,
+        region_id: Optional[uuid.UUID] = None,
+        district_id: Optional[uuid.UUID] = None,
+        professional: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Doctor counts by specialty, overall and per region and district,
+        rolled up from the cached cells: O(facets), no query per request.
+        """
+        facets = await specialty_facets.get()
+        tree = await location_tree.get()
+        wanted = professional.strip().lower() if professional else None
+
+        totals: dict = defaultdict(int)
+        regions: dict = {}
+        for cell in facets.cells:
+            if region_id is not None and cell.region_id != region_id:
+                continue
+            if district_id is not None and cell.district_id != district_id:
+                continue
+            if wanted is not None and (cell.professional or "").strip().lower() != wanted:
+                continue
+            district = tree.districts_by_id.get(cell.district_id)
+            region = tree.regions_by_id.get(cell.region_id)
+            if district is None or region is None:
+                # location deleted since the facets were built
+                continue
+            totals[cell.professional] += cell.count
+            r = regions.setdefault(
+                region.id, {"id": region.id, "name": region.name, "count": 0, "districts": {}}
+            )
+            r["count"] += cell.count
+            d = r["districts"].setdefault(
+                district.id, {"id": district.id, "name": district.name, "count": 0, "specialties": defaultdict(int)}
+            )
+            d["count"] += cell.count
+            d["specialties"][cell.professional] += cell.count
+
+        region_list = []
+        for r in sorted(regions.values(), key=lambda r: r["name"]):
+            districts = sorted(r["districts"].values(), key=lambda d: d["name"])
+            for d in districts:
+                d["specialties"] = _count_list(d["specialties"])
+            region_list.append({**r, "districts": districts})
+        return {
+            "total": sum(totals.values()),
+            "specialties": _count_list(totals),
+            "regions": region_list,
+        }
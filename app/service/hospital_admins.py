@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
 from app.models import UserModel, HospitalModel
+from app.core.database import mark_changed
 from app.core.security import hash_password
 from app.schemas.hospital_admins import HospitalAdminResponseSchema
 
@@ -24,7 +25,7 @@ class HospitalAdminService:
         # create user
         user = UserModel(
             phone_number=data.phone_number,
-            hashed_password=hash_password(data.password),
+            hashed_password=await hash_password(data.password),
             email=data.email,
             first_name=data.first_name,
             last_name=data.last_name,
@@ -65,6 +66,7 @@ class HospitalAdminService:
         )
         hospital_id = res.scalar()
 
+        mark_changed(self.db, "users", admin_id)
         await self.db.commit()
 
         return HospitalAdminResponseSchema.model_validate({
@@ -90,6 +92,7 @@ class HospitalAdminService:
             self.db.add(hospital)
 
         await self.db.delete(admin)
+        mark_changed(self.db, "users", admin_id)
         await self.db.commit()
         return {"detail": "Hospital admin deleted"}
 
@@ -1,26 +1,246 @@
+import base64
 import uuid
-from fastapi import HTTPException, status
-from sqlalchemy import select
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import any_, bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.cache import Snapshot
+from app.core.config import config
+from app.core.database import ReadOnlySessionFactory, mark_changed, on_commit
+from app.core.etag import collection_etag, entity_etag, fingerprint
+from app.core.geo import GeoGrid, parse_coordinates
+from app.core.projection import schema_options
+from app.models.doctors import DoctorModel
 from app.models.hospitals import HospitalModel
-from app.schemas.hospitals import HospitalCreateSchema, HospitalUpdateSchema
+from app.models.locations import RegionModel, DistrictModel
+from app.models.reviews import ReviewsModel
+from app.models.service_prices import ServiceModel
+from app.models.users import UserModel
+from app.schemas.hospitals import (
+    PAGE_SECTIONS,
+    HospitalCreateSchema,
+    HospitalResponseSchema,
+    HospitalUpdateSchema,
+)
+from app.core.working_hours import ScheduleIndex, local_now
 from app.exc import LoggedHTTPException
-import base64
+from app.service.reviews import ReviewService
+from app.service.photos import pick_variant, save_photo
 from app.schemas.base import DEFAULT_WORKING_HOURS
 
+def encode_name_cursor(name: str, row_id: uuid.UUID) -> str:
+    raw = f"{name}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_name_cursor(token: str) -> Tuple[str, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        name, row_id = raw.rsplit("|", 1)
+        return name, uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise LoggedHTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+@dataclass(frozen=True)
+class GeoHospital:
+    id: uuid.UUID
+    name: str
+    address: Optional[str]
+    reyting: Optional[float]
+    latitude: float
+    longitude: float
+
+
+async def _build_geo_index(db: AsyncSession) -> GeoGrid[GeoHospital]:
+    res = await db.execute(
+        select(
+            HospitalModel.id,
+            HospitalModel.name,
+            HospitalModel.address,
+            HospitalModel.reyting,
+            HospitalModel.latitude,
+            HospitalModel.longitude,
+        ).where(HospitalModel.latitude.is_not(None), HospitalModel.longitude.is_not(None))
+    )
+    return GeoGrid(
+        ((row.latitude, row.longitude, GeoHospital(*row)) for row in res),
+        cell_deg=config.GEO_INDEX_CELL_DEGREES,
+    )
+
+
+geo_index: Snapshot[GeoGrid[GeoHospital]] = Snapshot(
+    _build_geo_index,
+    ttl=config.GEO_INDEX_TTL_SECONDS,
+    session_factory=ReadOnlySessionFactory,
+)
+on_commit("hospitals", geo_index.invalidate)
+
+
+async def _build_schedule_index(db: AsyncSession) -> ScheduleIndex:
+    res = await db.execute(
+        select(HospitalModel.id, HospitalModel.schedule).where(HospitalModel.schedule.is_not(None))
+    )
+    return ScheduleIndex(res.all())
+
+
+schedule_index: Snapshot[ScheduleIndex] = Snapshot(
+    _build_schedule_index,
+    ttl=config.SCHEDULE_INDEX_TTL_SECONDS,
+    session_factory=ReadOnlySessionFactory,
+)
+on_commit("hospitals", schedule_index.invalidate)
+
+
+def _apply_coordinates(hosp: HospitalModel, payload) -> None:
+    """Keep the legacy `coordinates` string and latitude/longitude in step."""
+    if payload.latitude is not None and payload.longitude is not None:
+        hosp.latitude, hosp.longitude = payload.latitude, payload.longitude
+        if payload.coordinates is None:
+            hosp.coordinates = f"{payload.latitude}, {payload.longitude}"
+    elif payload.coordinates is not None:
+        parsed = parse_coordinates(payload.coordinates)
+        hosp.latitude, hosp.longitude = parsed if parsed else (None, None)
+
+
 class HospitalService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def list_hospitals(self) -> list[HospitalModel]:
-        stmt = select(HospitalModel).options(
-            selectinload(HospitalModel.region),
-            selectinload(HospitalModel.district),
+    @staticmethod
+    def _list_stmt():
+        # only what HospitalResponseSchema renders; list rows are read-only
+        return select(HospitalModel).options(
+            *schema_options(HospitalModel, HospitalResponseSchema)
         )
+
+    async def list_hospitals(
+        self,
+        *,
+        region_id: Optional[uuid.UUID] = None,
+        district_id: Optional[uuid.UUID] = None,
+        min_rating: Optional[float] = None,
+        open_now: bool = False,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[list[HospitalModel], Optional[str]]:
+        """
+        One page of hospitals ordered by (name, id) plus the cursor of the next
+        page (None on the last one); every hospital when `limit` is None.
+        Keyset paging: every page is an index range scan, however deep the
+        client has scrolled.
+        """
+        stmt = self._list_stmt()
+        if region_id is not None:
+            stmt = stmt.where(HospitalModel.region_id == region_id)
+        if district_id is not None:
+            stmt = stmt.where(HospitalModel.district_id == district_id)
+        if min_rating is not None:
+            stmt = stmt.where(HospitalModel.reyting >= min_rating)
+        if open_now:
+            open_ids = (await schedule_index.get()).open_at(local_now())
+            if not open_ids:
+                return [], None
+            # one array parameter, however many hospitals are open
+            stmt = stmt.where(HospitalModel.id == any_(
+                bindparam("open_ids", list(open_ids), type_=ARRAY(UUID(as_uuid=True)))
+            ))
+        if cursor:
+            stmt = stmt.where(
+                tuple_(HospitalModel.name, HospitalModel.id) > decode_name_cursor(cursor)
+            )
+        stmt = stmt.order_by(HospitalModel.name, HospitalModel.id)
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
         res = await self.db.execute(stmt)
-        return res.scalars().all()
+        hospitals = res.scalars().all()
+        if limit is None or len(hospitals) <= limit:
+            return hospitals, None
+        hospitals = hospitals[:limit]
+        last = hospitals[-1]
+        return hospitals, encode_name_cursor(last.name, last.id)
+
+    async def nearby(
+        self,
+        lat: float,
+        lon: float,
+        *,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        specialty: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        The `limit` nearest hospitals from the in-memory grid and, with
+        `specialty`, the nearest doctors whose `professional` matches it.
+        """
+        grid = await geo_index.get()
+        nearest = grid.nearest(lat, lon, limit, radius_km)
+        result: dict[str, Any] = {
+            "hospitals": [
+                {**asdict(h), "distance_km": round(d, 3)} for d, h in nearest
+            ]
+        }
+        if specialty:
+            result["doctors"] = await self._nearest_doctors(
+                grid, lat, lon, radius_km, limit, specialty
+            )
+        return result
+
+    async def _nearest_doctors(self, grid, lat, lon, radius_km, limit, specialty) -> list[dict]:
+        # doctors only live in hospitals: widen to the closest candidate
+        # hospitals, then one indexed query for matching doctors among them
+        candidates = grid.nearest(lat, lon, config.NEARBY_DOCTOR_HOSPITALS, radius_km)
+        if not candidates:
+            return []
+        by_id = {h.id: (d, h) for d, h in candidates}
+        res = await self.db.execute(
+            select(
+                DoctorModel.id,
+                DoctorModel.first_name,
+                DoctorModel.last_name,
+                DoctorModel.professional,
+                DoctorModel.reyting,
+                DoctorModel.hospital_id,
+            ).where(
+                DoctorModel.hospital_id.in_(by_id),
+                DoctorModel.professional.ilike(f"%{specialty.strip()}%"),
+            )
+        )
+        doctors = []
+        for row in res:
+            distance, hospital = by_id[row.hospital_id]
+            doctors.append(
+                {
+                    **row._asdict(),
+                    "hospital_name": hospital.name,
+                    "distance_km": round(distance, 3),
+                }
+            )
+        doctors.sort(key=lambda d: (d["distance_km"], -(d["reyting"] or 0)))
+        return doctors[:limit]
+
+    async def list_etag(self) -> str:
+        # responses embed region/district names, so those tables count too
+        return await collection_etag(
+            self.db,
+            fingerprint(HospitalModel),
+            fingerprint(RegionModel),
+            fingerprint(DistrictModel),
+        )
+
+    async def etag(self, hospital_id: uuid.UUID) -> str | None:
+        return await entity_etag(
+            self.db,
+            fingerprint(HospitalModel, HospitalModel.id == hospital_id),
+            fingerprint(RegionModel),
+            fingerprint(DistrictModel),
+        )
 
     async def get_hospital(self, hospital_id: uuid.UUID) -> HospitalModel:
         stmt = (
@@ -37,6 +257,104 @@ class HospitalService:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "Hospital not found")
         return hospital
 
+    async def page_etag(self, hospital_id: uuid.UUID) -> str | None:
+        """Everything get_page may render, fingerprinted in one query."""
+        return await entity_etag(
+            self.db,
+            fingerprint(HospitalModel, HospitalModel.id == hospital_id),
+            fingerprint(RegionModel),
+            fingerprint(DistrictModel),
+            fingerprint(DoctorModel, DoctorModel.hospital_id == hospital_id),
+            fingerprint(ServiceModel, ServiceModel.hospital_id == hospital_id),
+            fingerprint(ReviewsModel, ReviewsModel.hospital_id == hospital_id),
+            # reviews show the author's name
+            fingerprint(
+                UserModel,
+                UserModel.id.in_(
+                    select(ReviewsModel.user_id).where(ReviewsModel.hospital_id == hospital_id)
+                ),
+            ),
+        )
+
+    async def get_page(
+        self,
+        hospital_id: uuid.UUID,
+        include: Iterable[str] = PAGE_SECTIONS,
+        reviews_limit: int = 3,
+    ) -> dict[str, Any]:
+        """
+        The hospital detail screen in one call: the hospital with its doctors,
+        services and a review summary. One query per requested section
+        (at most four), however many doctors or services there are.
+        """
+        include = set(include)
+        res = await self.db.execute(
+            select(HospitalModel)
+            .where(HospitalModel.id == hospital_id)
+            .options(joinedload(HospitalModel.region), joinedload(HospitalModel.district))
+        )
+        hospital = res.scalars().first()
+        if not hospital:
+            raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Hospital not found")
+        page: dict[str, Any] = {"hospital": hospital}
+
+        if "doctors" in include:
+            res = await self.db.execute(
+                select(
+                    DoctorModel.id,
+                    DoctorModel.first_name,
+                    DoctorModel.last_name,
+                    DoctorModel.professional,
+                    DoctorModel.reyting,
+                    DoctorModel.photo_digest,
+                    DoctorModel.photo_variants,
+                )
+                .where(DoctorModel.hospital_id == hospital_id)
+                .order_by(DoctorModel.reyting.desc().nulls_last(), DoctorModel.last_name)
+            )
+            page["doctors"] = [row._asdict() for row in res]
+
+        if "services" in include:
+            res = await self.db.execute(
+                select(ServiceModel)
+                .where(ServiceModel.hospital_id == hospital_id)
+                .order_by(ServiceModel.name)
+            )
+            page["services"] = res.scalars().all()
+
+        if "reviews" in include:
+            # newest `reviews_limit` reviews plus the total, in one statement
+            res = await self.db.execute(
+                select(
+                    ReviewsModel.id,
+                    ReviewsModel.user_id,
+                    ReviewsModel.hospital_id,
+                    ReviewsModel.comment,
+                    UserModel.first_name,
+                    UserModel.last_name,
+                    func.count().over().label("total"),
+                )
+                .join(UserModel, UserModel.id == ReviewsModel.user_id)
+                .where(ReviewsModel.hospital_id == hospital_id)
+                .order_by(ReviewsModel.created_at.desc(), ReviewsModel.id.desc())
+                .limit(reviews_limit or 1)
+            )
+            rows = res.all()
+            page["reviews"] = {
+                "total": rows[0].total if rows else 0,
+                "latest": [
+                    {
+                        "id": row.id,
+                        "user_id": row.user_id,
+                        "user_name": ReviewService._display_name(row),
+                        "hospital_id": row.hospital_id,
+                        "comment": row.comment,
+                    }
+                    for row in rows[:reviews_limit]
+                ],
+            }
+        return page
+
     async def create_hospital(self, payload: HospitalCreateSchema) -> HospitalModel:
         hosp = HospitalModel(
             name=payload.name,
@@ -49,8 +367,10 @@ class HospitalService:
             working_hours=payload.working_hours.dict() if payload.working_hours else DEFAULT_WORKING_HOURS,
             phone_number=payload.phone_number
         )
+        _apply_coordinates(hosp, payload)
         self.db.add(hosp)
         await self.db.flush()
+        mark_changed(self.db, "hospitals")
         return await self.get_hospital(hosp.id)
 
     async def update_hospital(
@@ -69,29 +389,44 @@ class HospitalService:
             hosp.district_id = payload.district_id
         if payload.coordinates is not None:
             hosp.coordinates = payload.coordinates
+        _apply_coordinates(hosp, payload)
         if payload.phone_number is not None:
             hosp.phone_number = payload.phone_number
+        if payload.working_hours is not None:
+            hosp.working_hours = payload.working_hours.model_dump()
         await self.db.flush()
+        mark_changed(self.db, "hospitals")
         return await self.get_hospital(hospital_id)
 
     async def delete_hospital(self, hospital_id: uuid.UUID) -> None:
         hosp = await self.get_hospital(hospital_id)
         await self.db.delete(hosp)
         await self.db.flush()
+        mark_changed(self.db, "hospitals")
+        # its doctors went with it (cascade)
+        mark_changed(self.db, "doctors")
 
-    async def upload_photo(self, hospital_id: uuid.UUID, data: bytes):
-        """Store as Base64 text."""
+    async def upload_photo(self, hospital_id: uuid.UUID, file: UploadFile) -> str:
+        """Store the upload and its thumbnails and point the row at them."""
         hosp = await self.get_hospital(hospital_id)
-        hosp.photo = base64.b64encode(data).decode("ascii")
+        hosp.photo_digest, hosp.photo_variants = await save_photo(file)
         await self.db.flush()
+        return hosp.photo_digest
 
-    async def get_photo(self, hospital_id: uuid.UUID) -> str:
-        """Return the Base64 text (or empty string)."""
-        hosp = await self.get_hospital(hospital_id)
-        return hosp.photo or ""
+    async def get_photo_digest(self, hospital_id: uuid.UUID, size: Optional[str] = None) -> str:
+        res = await self.db.execute(
+            select(HospitalModel.photo_digest, HospitalModel.photo_variants).where(HospitalModel.id == hospital_id)
+        )
+        row = res.first()
+        if row is None:
+            raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Hospital not found")
+        if row.photo_digest is None:
+            raise LoggedHTTPException(status.HTTP_404_NOT_FOUND, "Hospital has no photo")
+        return pick_variant(row.photo_digest, row.photo_variants, size)
 
     async def delete_photo(self, hospital_id: uuid.UUID) -> None:
-        """Remove the stored Base64 photo."""
+        """Unlink the photo; the blob itself is garbage-collected later."""
         hosp = await self.get_hospital(hospital_id)
-        hosp.photo = None
+        hosp.photo_digest = None
+        hosp.photo_variants = None
         await self.db.flush()
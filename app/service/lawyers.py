@@ -34,7 +34,7 @@ class UserService:
 
         user = UserModelLawyer(
             phone_number=payload.phone_number,
-            hashed_password=hash_password(payload.password),
+            hashed_password=await hash_password(payload.password),
             email=payload.email,
             first_name=payload.first_name,
             last_name=payload.last_name,
@@ -72,7 +72,7 @@ class UserService:
         if payload.phone_number is not None:
             user.phone_number = payload.phone_number
         if payload.password is not None:
-            user.hashed_password = hash_password(payload.password)
+            user.hashed_password = await hash_password(payload.password)
         if payload.email is not None:
             user.email = payload.email
         if payload.first_name is not None:
@@ -1,12 +1,20 @@
 # app/services/location_service.py
+import hashlib
 import uuid
 import traceback
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import Snapshot
+from app.core.config import config
+from app.core.database import ReadOnlySessionFactory, mark_changed, on_commit
+from app.core.etag import make_etag
 from app.models.locations import RegionModel, DistrictModel
 from app.schemas.locations import (
     RegionCreateSchema,
@@ -17,6 +25,97 @@ from app.schemas.locations import (
 from app.exc import LoggedHTTPException
 
 
+#
+# ─── IN-MEMORY REGION → DISTRICT TREE ─────────────────────────────────────────
+#
+
+
+@dataclass(frozen=True)
+class RegionRef:
+    id: uuid.UUID
+    name: str
+
+
+@dataclass(frozen=True)
+class DistrictNode:
+    id: uuid.UUID
+    name: str
+    region_id: uuid.UUID
+    region: RegionRef
+
+
+@dataclass(frozen=True)
+class RegionNode:
+    id: uuid.UUID
+    name: str
+    districts: Tuple[DistrictNode, ...]
+
+
+@dataclass(frozen=True)
+class LocationTree:
+    """
+    Immutable snapshot of all regions and districts.
+
+    `version` is a content hash, so every worker holding the same data
+    reports the same number and clients can compare it to skip refetching.
+    """
+
+    version: int
+    regions: Tuple[RegionNode, ...]
+    regions_by_id: Mapping[uuid.UUID, RegionNode]
+    districts: Tuple[DistrictNode, ...]
+    districts_by_id: Mapping[uuid.UUID, DistrictNode]
+
+
+async def _build_location_tree(db: AsyncSession) -> LocationTree:
+    region_rows = (
+        await db.execute(select(RegionModel.id, RegionModel.name).order_by(RegionModel.name))
+    ).all()
+    district_rows = (
+        await db.execute(
+            select(DistrictModel.id, DistrictModel.name, DistrictModel.region_id).order_by(
+                DistrictModel.name
+            )
+        )
+    ).all()
+
+    refs = {rid: RegionRef(id=rid, name=name) for rid, name in region_rows}
+    by_region: dict[uuid.UUID, list[DistrictNode]] = {rid: [] for rid in refs}
+    districts = []
+    for did, name, rid in district_rows:
+        node = DistrictNode(id=did, name=name, region_id=rid, region=refs[rid])
+        by_region[rid].append(node)
+        districts.append(node)
+
+    regions = tuple(
+        RegionNode(id=rid, name=ref.name, districts=tuple(by_region[rid]))
+        for rid, ref in refs.items()
+    )
+
+    digest = hashlib.blake2b(digest_size=8)
+    for rid, name in region_rows:
+        digest.update(f"r{rid}:{name};".encode())
+    for did, name, rid in district_rows:
+        digest.update(f"d{did}:{rid}:{name};".encode())
+
+    return LocationTree(
+        version=int.from_bytes(digest.digest(), "big") >> 1,
+        regions=regions,
+        regions_by_id=MappingProxyType({r.id: r for r in regions}),
+        districts=tuple(districts),
+        districts_by_id=MappingProxyType({d.id: d for d in districts}),
+    )
+
+
+# LOCATION_CACHE_TTL_SECONDS picks up writes made by other workers
+location_tree: Snapshot[LocationTree] = Snapshot(
+    _build_location_tree,
+    ttl=config.LOCATION_CACHE_TTL_SECONDS,
+    session_factory=ReadOnlySessionFactory,
+)
+on_commit("locations", location_tree.invalidate)
+
+
 class LocationService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -25,10 +124,25 @@ class LocationService:
     # ─── REGIONS ──────────────────────────────────────────────────────────────
     #
 
-    async def list_regions(self) -> list[RegionModel]:
-        stmt = select(RegionModel)
-        res = await self.db.execute(stmt)
-        return res.scalars().all()
+    def _mark_changed(self) -> None:
+        # the tree is dropped once the surrounding transaction commits
+        mark_changed(self.db, "locations")
+
+    async def get_tree(self) -> LocationTree:
+        return await location_tree.get()
+
+    async def etag(self) -> str:
+        # every read endpoint is served from the tree, so its version is enough
+        return make_etag("locations", (await self.get_tree()).version)
+
+    async def list_regions(self) -> Tuple[RegionNode, ...]:
+        return (await self.get_tree()).regions
+
+    async def get_region_with_districts(self, region_id: uuid.UUID) -> RegionNode:
+        region = (await self.get_tree()).regions_by_id.get(region_id)
+        if region is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Region not found")
+        return region
 
     async def get_region(self, region_id: uuid.UUID) -> RegionModel:
         stmt = (
@@ -47,6 +161,7 @@ class LocationService:
         region = RegionModel(name=payload.name)
         self.db.add(region)
         await self.db.flush()
+        self._mark_changed()
         return region
 
     async def update_region(
@@ -56,34 +171,26 @@ class LocationService:
         if payload.name is not None:
             region.name = payload.name
         await self.db.flush()
+        self._mark_changed()
         return region
 
     async def delete_region(self, region_id: uuid.UUID) -> None:
         region = await self.get_region(region_id)
         await self.db.delete(region)
         await self.db.flush()
+        self._mark_changed()
 
     #
     # ─── DISTRICTS ────────────────────────────────────────────────────────────
     #
 
-    async def list_districts(self) -> list[DistrictModel]:
-        stmt = select(DistrictModel).options(selectinload(DistrictModel.region))
-        res = await self.db.execute(stmt)
-        return res.scalars().all()
+    async def list_districts(self) -> Tuple[DistrictNode, ...]:
+        return (await self.get_tree()).districts
 
     async def list_districts_by_region(
         self, region_id: uuid.UUID
-    ) -> list[DistrictModel]:
-        # ensure region exists
-        await self.get_region(region_id)
-        stmt = (
-            select(DistrictModel)
-            .where(DistrictModel.region_id == region_id)
-            .options(selectinload(DistrictModel.region))
-        )
-        res = await self.db.execute(stmt)
-        return res.scalars().all()
+    ) -> Tuple[DistrictNode, ...]:
+        return (await self.get_region_with_districts(region_id)).districts
 
     async def get_district(self, district_id: uuid.UUID) -> DistrictModel:
         stmt = (
@@ -103,6 +210,7 @@ class LocationService:
         district = DistrictModel(name=payload.name, region_id=payload.region_id)
         self.db.add(district)
         await self.db.flush()
+        self._mark_changed()
 
         # now re‑fetch with region relationship eagerly loaded
         return await self.get_district(district.id)
@@ -118,9 +226,11 @@ class LocationService:
             await self.get_region(payload.region_id)
             district.region_id = payload.region_id
         await self.db.flush()
+        self._mark_changed()
         return district
 
     async def delete_district(self, district_id: uuid.UUID) -> None:
         district = await self.get_district(district_id)
         await self.db.delete(district)
         await self.db.flush()
+        self._mark_changed()
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+from typing import Dict, Tuple
+
+from fastapi import UploadFile, status
+from loguru import logger
+from sqlalchemy import select, union
+
+from app.core.blobstore import blob_store
+from app.core.config import config
+from app.core.database import AsyncSessionFactory
+from app.core.images import ImageDecodeError, ImageProcessor
+from app.exc import LoggedHTTPException
+from app.models.doctors import DoctorModel
+from app.models.hospitals import HospitalModel
+
+image_processor = ImageProcessor(
+    max_workers=config.IMAGE_WORKERS,
+    max_concurrency=config.IMAGE_MAX_CONCURRENCY,
+    image_format=config.IMAGE_VARIANT_FORMAT,
+)
+
+PHOTO_MODELS = (HospitalModel, DoctorModel)
+
+
+async def render_variants(digest: str) -> Dict[str, str]:
+    """Thumbnails of a stored image, written to the blob store: size key -> digest."""
+    try:
+        rendered = await image_processor.render(str(blob_store.path(digest)))
+    except ImageDecodeError:
+        raise LoggedHTTPException(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "Photo could not be decoded"
+        )
+    return {
+        key: await asyncio.to_thread(blob_store.put_bytes, data)
+        for key, data in rendered.items()
+    }
+
+
+async def save_photo(file: UploadFile) -> Tuple[str, Dict[str, str]]:
+    """Store an uploaded photo plus its variants; returns (digest, variants)."""
+    blob = await blob_store.save_upload(file, config.PHOTO_MAX_BYTES)
+    return blob.digest, await render_variants(blob.digest)
+
+
+def pick_variant(digest: str, variants: Dict[str, str] | None, size: str | None) -> str:
+    """Digest to serve for `size`; the original when no such variant exists."""
+    if size and variants and size in variants:
+        return variants[size]
+    return digest
+
+
+async def purge_orphan_blobs() -> int:
+    """
+    Delete blobs no row points at any more; scheduled by the bot worker.
+
+    Files younger than BLOB_GC_GRACE_SECONDS are kept: an upload lands on
+    disk before the transaction that references it commits.
+    """
+    referenced = set()
+    async with AsyncSessionFactory() as db:
+        res = await db.execute(
+            union(
+                *(
+                    select(model.photo_digest).where(model.photo_digest.is_not(None))
+                    for model in PHOTO_MODELS
+                )
+            )
+        )
+        referenced.update(res.scalars())
+        for model in PHOTO_MODELS:
+            res = await db.execute(
+                select(model.photo_variants).where(model.photo_variants.is_not(None))
+            )
+            for variants in res.scalars():
+                referenced.update(variants.values())
+
+    def sweep() -> int:
+        removed = 0
+        for digest in list(blob_store.iter_digests(config.BLOB_GC_GRACE_SECONDS)):
+            # re-checks the mtime: a re-upload of the same image since the
+            # listing has touched the file
+            if digest not in referenced and blob_store.delete(digest, config.BLOB_GC_GRACE_SECONDS):
+                removed += 1
+        return removed
+
+    removed = await asyncio.to_thread(sweep)
+    stale_tmp = await asyncio.to_thread(blob_store.purge_tmp, config.BLOB_GC_GRACE_SECONDS)
+    if removed or stale_tmp:
+        logger.info(f"blob GC removed {removed} unreferenced photos, {stale_tmp} stale temp files")
+    return removed
+
+
+async def backfill_variants(batch: int = 50) -> int:
+    """Render variants for photos stored before variants existed."""
+    done = 0
+    for model in PHOTO_MODELS:
+        while True:
+            async with AsyncSessionFactory() as db:
+                rows = (
+                    await db.execute(
+                        select(model)
+                        .where(model.photo_digest.is_not(None), model.photo_variants.is_(None))
+                        .limit(batch)
+                    )
+                ).scalars().all()
+                if not rows:
+                    break
+                for row in rows:
+                    try:
+                        row.photo_variants = await render_variants(row.photo_digest)
+                    except (LoggedHTTPException, FileNotFoundError) as e:
+                        logger.warning(f"{model.__tablename__} {row.id}: no variants ({e})")
+                        row.photo_variants = {}
+                    done += 1
+                await db.commit()
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Photo maintenance")
+    parser.add_argument("command", choices=["backfill-variants", "gc"])
+    args = parser.parse_args()
+
+    async def main() -> None:
+        try:
+            if args.command == "backfill-variants":
+                print(f"rendered variants for {await backfill_variants()} photos")
+            else:
+                print(f"removed {await purge_orphan_blobs()} orphan blobs")
+        finally:
+            image_processor.shutdown()
+
+    asyncio.run(main())
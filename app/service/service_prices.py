@@ -5,6 +5,7 @@ from sqlalchemy.future import select
 from sqlalchemy import func, or_
 from fastapi import HTTPException, status
 
+from app.core.etag import collection_etag, entity_etag, fingerprint
 from app.models.service_prices import ServiceModel  # adjust import path if different
 from app.models import HospitalModel, DoctorModel  # if you expose these via __init__
 from app.schemas.service_prices import (
@@ -85,6 +86,40 @@ class ServicePriceService:
             raise HTTPException(status_code=404, detail="Service not found")
         return entity
 
+    @staticmethod
+    def _conditions(
+        hospital_id: Optional[uuid.UUID],
+        doctor_id: Optional[uuid.UUID],
+        q: Optional[str],
+    ) -> list:
+        conditions = []
+        if hospital_id:
+            conditions.append(ServiceModel.hospital_id == hospital_id)
+        if doctor_id:
+            conditions.append(ServiceModel.doctor_id == doctor_id)
+        if q:
+            like = f"%{q.strip()}%"
+            conditions.append(
+                or_(ServiceModel.name.ilike(like), ServiceModel.description.ilike(like))
+            )
+        return conditions
+
+    async def etag(self, service_id: uuid.UUID) -> Optional[str]:
+        return await entity_etag(
+            self.db, fingerprint(ServiceModel, ServiceModel.id == service_id)
+        )
+
+    async def list_etag(
+        self,
+        hospital_id: Optional[uuid.UUID] = None,
+        doctor_id: Optional[uuid.UUID] = None,
+        q: Optional[str] = None,
+    ) -> str:
+        return await collection_etag(
+            self.db,
+            fingerprint(ServiceModel, *self._conditions(hospital_id, doctor_id, q)),
+        )
+
     async def list(
         self,
         hospital_id: Optional[uuid.UUID] = None,
@@ -97,16 +132,7 @@ class ServicePriceService:
         count_query = select(func.count(ServiceModel.id))
 
         # Filters
-        conditions = []
-        if hospital_id:
-            conditions.append(ServiceModel.hospital_id == hospital_id)
-        if doctor_id:
-            conditions.append(ServiceModel.doctor_id == doctor_id)
-        if q:
-            like = f"%{q.strip()}%"
-            conditions.append(
-                or_(ServiceModel.name.ilike(like), ServiceModel.description.ilike(like))
-            )
+        conditions = self._conditions(hospital_id, doctor_id, q)
 
         if conditions:
             query = query.filter(*conditions)
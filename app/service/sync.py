@@ -0,0 +1,129 @@
+import base64
+import heapq
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional, Tuple
+
+from fastapi import status
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import config
+from app.core.database import AsyncSessionFactory
+from app.exc import LoggedHTTPException
+from app.models.doctors import DoctorModel
+from app.models.hospitals import HospitalModel
+from app.models.locations import DistrictModel, RegionModel
+from app.models.service_prices import ServiceModel
+from app.models.sync import SyncTombstoneModel
+
+# response key -> (model, loader options); keys match the table names the
+# tombstone trigger records
+SYNCED = {
+    "regions": (RegionModel, ()),
+    "districts": (DistrictModel, ()),
+    "hospitals": (HospitalModel, ()),
+    "doctors": (DoctorModel, ()),
+    "services": (ServiceModel, ()),
+}
+
+Cursor = Tuple[datetime, uuid.UUID]
+
+# sorts after every id at a timestamp: "all rows up to and including ts"
+CURSOR_ID_MAX = uuid.UUID(int=(1 << 128) - 1)
+
+
+def encode_cursor(cursor: Optional[Cursor]) -> str:
+    if cursor is None:
+        return ""
+    ts, row_id = cursor
+    raw = f"{ts.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Cursor]:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        ts, row_id = raw.split("|")
+        return datetime.fromisoformat(ts), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise LoggedHTTPException(status.HTTP_400_BAD_REQUEST, "Invalid sync cursor")
+
+
+class SyncService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def changes(self, cursor: Optional[str], limit: int) -> dict[str, Any]:
+        """
+        Everything created, updated or deleted after `cursor`, oldest first.
+
+        Each table is read with a range scan on its (modified_at, id) index,
+        `limit + 1` rows at most, and the streams are merged; the cost follows
+        the number of changes, not the catalog size.
+        """
+        after = decode_cursor(cursor)
+        now = (await self.db.execute(select(func.localtimestamp()))).scalar_one()
+        if after and after[0] < now - timedelta(days=config.SYNC_TOMBSTONE_RETENTION_DAYS):
+            # tombstones that old are purged; the client must start over
+            raise LoggedHTTPException(status.HTTP_410_GONE, "Sync cursor expired, resync from scratch")
+        upper = now - timedelta(seconds=config.SYNC_SETTLE_SECONDS)
+
+        streams = []
+        for key, (model, options) in SYNCED.items():
+            stmt = select(model).options(*options)
+            rows = await self._page(stmt, model.modified_at, model.id, after, upper, limit)
+            streams.append([(row.modified_at, row.id, key, row) for row in rows])
+
+        tombstones = await self._page(
+            select(SyncTombstoneModel),
+            SyncTombstoneModel.modified_at,
+            SyncTombstoneModel.entity_id,
+            after,
+            upper,
+            limit,
+        )
+        streams.append([(t.modified_at, t.entity_id, "deleted", t) for t in tombstones])
+
+        merged = list(heapq.merge(*streams, key=lambda item: (item[0], item[1])))
+        page = merged[:limit]
+
+        result: dict[str, Any] = {key: [] for key in SYNCED}
+        result["deleted"] = []
+        for _, row_id, key, row in page:
+            if key == "deleted":
+                result["deleted"].append({"entity": row.entity, "id": row_id})
+            else:
+                result[key].append(row)
+
+        has_more = len(merged) > limit
+        if has_more:
+            last = (page[-1][0], page[-1][1])
+        else:
+            # everything up to `upper` was read: move the cursor there even when
+            # nothing changed, so an idle catalog does not age an up-to-date
+            # client's cursor into the 410 below
+            last = (upper, CURSOR_ID_MAX)
+        result["cursor"] = encode_cursor(last)
+        result["has_more"] = has_more
+        return result
+
+    async def _page(self, stmt, ts_col, id_col, after, upper, limit) -> list:
+        stmt = stmt.where(ts_col <= upper)
+        if after is not None:
+            stmt = stmt.where(tuple_(ts_col, id_col) > after)
+        stmt = stmt.order_by(ts_col, id_col).limit(limit + 1)
+        return (await self.db.execute(stmt)).scalars().all()
+
+
+async def purge_tombstones() -> int:
+    """Drop tombstones past the retention window; scheduled by the bot worker."""
+    cutoff = func.localtimestamp() - timedelta(days=config.SYNC_TOMBSTONE_RETENTION_DAYS)
+    async with AsyncSessionFactory() as db:
+        res = await db.execute(
+            delete(SyncTombstoneModel).where(SyncTombstoneModel.modified_at < cutoff)
+        )
+        await db.commit()
+        return res.rowcount
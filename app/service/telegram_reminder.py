@@ -1,4 +1,3 @@
-import os
 import uuid
 import asyncio
 from datetime import datetime
@@ -10,25 +9,27 @@ from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemo
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # --- your project imports ---
+from app.core.config import config
 from app.core.database import get_async_db
+from app.core.security import verify_password
 from app.models.users import UserModel
 from app.models.medicine_reminder import MedicineReminderModel
 
 # ---------------- CONFIG ----------------
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
-if not BOT_TOKEN:
-    raise RuntimeError("TELEGRAM_BOT_TOKEN env var is required")
-
-bot = Bot(token=BOT_TOKEN)
+# Bot and scheduler are only started by the worker entry point (app.bot_worker);
+# importing this module has no side effects.
 dp = Dispatcher()
 scheduler = AsyncIOScheduler()
-scheduler.start()
+
+
+def create_bot() -> Bot:
+    if not config.telegram.bot_token:
+        raise RuntimeError("TELEGRAM_BOT_TOKEN env var is required")
+    return Bot(token=config.telegram.bot_token)
 
 # ---------------- SERVICE ----------------
 class MedicineReminderService:
@@ -83,10 +84,13 @@ async def verify_login(phone: str, password: str) -> Optional[UserModel]:
         stmt = select(UserModel).where(UserModel.phone_number == phone)
         res = await db.execute(stmt)
         user = res.scalars().first()
-        if user and pwd_context.verify(password, user.hashed_password):
+        if user and await verify_password(password, user.hashed_password):
             return user
         return None
 
+async def send_reminder(bot: Bot, chat_id: int, text: str):
+    await bot.send_message(chat_id, f"⏰ Eslatma: {text} ichish vaqti keldi!")
+
 # ---------------- HANDLERS ----------------
 @dp.message(Command("start"))
 async def start_cmd(message: types.Message):
@@ -171,7 +175,7 @@ async def logout_cmd(message: types.Message):
 
 # === 3) SAVE REMINDER (specific pattern) ===
 @dp.message(F.text.regexp(r"^\d{2}:\d{2}\s+.+$"))
-async def save_reminder(message: types.Message):
+async def save_reminder(message: types.Message, bot: Bot):
     if message.from_user.id not in user_sessions:
         await message.answer("❌ Iltimos, avval /login orqali tizimga kiring.", reply_markup=MAIN_KB)
         return
@@ -195,13 +199,10 @@ async def save_reminder(message: types.Message):
                 remind_time=remind_time,
             )
 
-        async def send_reminder(chat_id: int, text: str):
-            await bot.send_message(chat_id, f"⏰ Eslatma: {text} ichish vaqti keldi!")
-
         scheduler.add_job(
             send_reminder,
             "cron",
-            args=[message.chat.id, medicine_name],
+            args=[bot, message.chat.id, medicine_name],
             hour=remind_time.hour,
             minute=remind_time.minute,
         )
@@ -231,8 +232,7 @@ async def maybe_password(message: types.Message):
         await message.answer("❌ Telefon raqam yoki parol noto‘g‘ri!", reply_markup=MAIN_KB)
 
 # --- runner ---
-async def main():
-    await dp.start_polling(bot)
-
 if __name__ == "__main__":
+    from app.bot_worker import main
+
     asyncio.run(main())
@@ -1,4 +1,5 @@
 # app/services/user_service.py
+from app.core.database import mark_changed
 from app.core.security import hash_password
 from app.schemas.users import RegisterRequestSchema, UpdateUserRequestSchema
 import uuid
@@ -35,7 +36,7 @@ class UserService:
         # 2) build & persist
         user = UserModel(
             phone_number=payload.phone_number,
-            hashed_password=hash_password(payload.password),
+            hashed_password=await hash_password(payload.password),
             email=payload.email,
             first_name=payload.first_name,
             last_name=payload.last_name,
@@ -73,7 +74,7 @@ class UserService:
         if payload.phone_number is not None:
             user.phone_number = payload.phone_number
         if payload.password is not None:
-            user.hashed_password = hash_password(payload.password)
+            user.hashed_password = await hash_password(payload.password)
         if payload.email is not None:
             user.email = payload.email
         if payload.first_name is not None:
@@ -82,12 +83,14 @@ class UserService:
             user.last_name = payload.last_name
 
         await self.db.flush()
+        mark_changed(self.db, "users", user_id)
         return user
 
     async def delete(self, user_id: uuid.UUID) -> None:
         user = await self.get_one(user_id)
         await self.db.delete(user)
         await self.db.flush()
+        mark_changed(self.db, "users", user_id)
 
 
 class UserDetailService:
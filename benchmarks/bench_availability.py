@@ -0,0 +1,95 @@
+"""
+One doctor's month of availability: per-slot loop vs bitmap engine.
+
+  per-slot : the former get_available_slots, once per day - strptime the
+             day's working hours, step 30 minutes with datetime.combine /
+             strftime, look each slot up in a set of (start, end) tuples
+  bitmap   : day_availability - masks from the compiled schedule, bookings
+             applied as intervals (app.core.slots)
+  heatmap  : day_availability(include_slots=False), counts only
+
+    python -m benchmarks.bench_availability --days 31 --load 0.6
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from app.core.working_hours import WEEKDAYS, compile_schedule
+from app.service.doctor_bookings import day_availability
+
+HOURS = {day: "08:00-12:00,13:00-18:00" for day in WEEKDAYS[:6]}
+
+
+def fake_bookings(first_day: date, days: int, load: float) -> dict:
+    bookings = {}
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        current = datetime.combine(day, datetime.min.time()) + timedelta(hours=8)
+        rows = []
+        while current.hour < 18:
+            if random.random() < load:
+                rows.append((current, current + timedelta(minutes=30)))
+            current += timedelta(minutes=30)
+        bookings[day] = rows
+    return bookings
+
+
+def per_slot_day(working_hours: dict, day: date, bookings: list) -> dict:
+    slots = []
+    hours_str = working_hours.get(day.strftime("%A").lower())
+    if hours_str:
+        booked_times = {(s.time(), e.time()) for s, e in bookings}
+        for part in hours_str.split(","):
+            start_str, end_str = part.split("-")
+            current = datetime.combine(day, datetime.strptime(start_str, "%H:%M").time())
+            end_dt = datetime.combine(day, datetime.strptime(end_str, "%H:%M").time())
+            while current < end_dt:
+                next_time = current + timedelta(minutes=30)
+                status_val = "booked" if (current.time(), next_time.time()) in booked_times else "free"
+                slots.append(
+                    {"start": current.strftime("%H:%M"), "end": next_time.strftime("%H:%M"), "status": status_val}
+                )
+                current = next_time
+    return {"date": day, "slots": slots}
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--load", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(1)
+    first = date.today()
+    days = [first + timedelta(days=i) for i in range(args.days)]
+    bookings = fake_bookings(first, args.days, args.load)
+    schedule = compile_schedule(HOURS)
+
+    # same answer on aligned bookings before timing anything
+    for day in days:
+        assert per_slot_day(HOURS, day, bookings[day])["slots"] == day_availability(schedule, day, bookings[day])["slots"]
+
+    rows = [
+        ("per-slot", lambda: [per_slot_day(HOURS, d, bookings[d]) for d in days]),
+        ("bitmap", lambda: [day_availability(schedule, d, bookings[d]) for d in days]),
+        ("heatmap", lambda: [day_availability(schedule, d, bookings[d], False) for d in days]),
+    ]
+    print(f"{args.days} days, {args.load:.0%} booked")
+    for name, fn in rows:
+        print(f"{name:<9} {timed(fn, args.repeat) * 1000:9.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Concurrent bookings of one slot against a real database.
+
+  race    : `--requests` book_slot calls for the same slot at once, each in
+            its own session; exactly one must commit, the rest get 409
+  retries : the same number of calls for another slot all carrying one
+            Idempotency-Key (a mobile client retrying); every call must get
+            the same booking back and only one row may exist
+
+Uses DATABASE__ASYNC_DSN, an existing doctor and user (the first ones unless
+given) and a date years ahead; the rows it creates are deleted afterwards.
+
+    python -m benchmarks.bench_booking_race --requests 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+
+from app.core.database import AsyncSessionFactory
+from app.models import DoctorModel, QueueModel, UserModel
+from app.models.reviews import ReviewsModel  # noqa: F401  UserModel.reviews needs the mapper
+from app.schemas.doctor_bookings import BookingCreateSchema
+from app.service.doctor_bookings import DoctorBookingService
+
+
+async def book(doctor_id, payload, key, outcomes: Counter, timings: list, ids: set) -> None:
+    t0 = time.perf_counter()
+    async with AsyncSessionFactory() as db:
+        try:
+            booking = await DoctorBookingService(db).book_slot(doctor_id, payload, key)
+            outcomes[201] += 1
+            ids.add(booking.id)
+        except HTTPException as exc:
+            outcomes[exc.status_code] += 1
+        except Exception as exc:  # anything else is a bug worth seeing in the summary
+            outcomes[type(exc).__name__] += 1
+    timings.append((time.perf_counter() - t0) * 1000)
+
+
+async def burst(name: str, doctor_id, payload, keys: list) -> tuple[Counter, set]:
+    outcomes: Counter = Counter()
+    timings: list[float] = []
+    ids: set = set()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(book(doctor_id, payload, key, outcomes, timings, ids) for key in keys))
+    elapsed = time.perf_counter() - t0
+
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(
+        f"{name:<8} {len(keys)} requests in {elapsed:6.2f}s = {len(keys) / elapsed:7.1f} req/s"
+        f"  p50={statistics.median(timings):7.1f}ms  p99={p99:7.1f}ms  outcomes={dict(outcomes)}"
+    )
+    return outcomes, ids
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--doctor-id", type=uuid.UUID)
+    parser.add_argument("--user-id", type=uuid.UUID)
+    args = parser.parse_args()
+
+    async with AsyncSessionFactory() as db:
+        doctor_id = args.doctor_id or (await db.execute(select(DoctorModel.id).limit(1))).scalar_one()
+        user_id = args.user_id or (await db.execute(select(UserModel.id).limit(1))).scalar_one()
+
+    day = date.today() + timedelta(days=3 * 365 + random.randrange(365))
+    race = BookingCreateSchema(user_id=user_id, date=day, start_time="10:00", end_time="10:30")
+    retry = BookingCreateSchema(user_id=user_id, date=day, start_time="11:00", end_time="11:30")
+    try:
+        outcomes, ids = await burst("race", doctor_id, race, [None] * args.requests)
+        assert outcomes[201] == 1 and outcomes[409] == args.requests - 1, outcomes
+
+        key = f"bench-{uuid.uuid4()}"
+        outcomes, ids = await burst("retries", doctor_id, retry, [key] * args.requests)
+        assert outcomes[201] == args.requests and len(ids) == 1, (outcomes, ids)
+        async with AsyncSessionFactory() as db:
+            rows = await db.scalar(select(func.count()).where(QueueModel.idempotency_key == key))
+        assert rows == 1, rows
+        print("ok: one booking per slot, one row per Idempotency-Key")
+    finally:
+        async with AsyncSessionFactory() as db:
+            await db.execute(
+                delete(QueueModel).where(
+                    QueueModel.doctor_id == doctor_id,
+                    QueueModel.appointment_date == day,
+                )
+            )
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
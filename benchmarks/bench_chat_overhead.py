@@ -0,0 +1,133 @@
+"""
+Per-message client overhead of get_chat_response against a local stub server.
+
+Starts an OpenAI-compatible stub (/v1/chat/completions answers instantly)
+and sends the same conversation through:
+
+  legacy : encoding_for_model + new sync OpenAI client + asyncio.to_thread
+           on every message (the previous implementation)
+  current: app.core.ai.get_chat_response (cached tokenizer, shared
+           AsyncOpenAI client with keep-alive connections)
+
+    python -m benchmarks.bench_chat_overhead --messages 300
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+
+MODEL = "gpt-3.5-turbo"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(port: int) -> uvicorn.Server:
+    stub = FastAPI()
+
+    @stub.post("/v1/chat/completions")
+    async def completions():
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": MODEL,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "ok"},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    server = uvicorn.Server(
+        uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def legacy_chat_response(messages: list[dict], base_url: str) -> str:
+    import tiktoken
+    from openai import OpenAI
+
+    enc = tiktoken.encoding_for_model(MODEL)
+    sum(len(enc.encode(m["content"])) for m in messages)
+    client = OpenAI(api_key="stub", base_url=base_url)
+    resp = await asyncio.to_thread(
+        client.chat.completions.create,
+        model=MODEL,
+        temperature=0.2,
+        messages=messages,
+        max_tokens=400,
+    )
+    return resp.choices[0].message.content
+
+
+async def measure(fn, n: int) -> list[float]:
+    timings = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> float:
+    timings.sort()
+    mean = statistics.fmean(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{name:<8} mean={mean:7.3f}ms  p50={statistics.median(timings):7.3f}ms  p99={p99:7.3f}ms")
+    return mean
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=300)
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}/v1"
+    server = start_stub(port)
+
+    os.environ.update(
+        AI__BASE_URL=base_url,
+        AI__OPENAI_API_KEY="stub",
+        AI__MODEL_NAME=MODEL,
+        AI__TEMPERATURE="0.2",
+    )
+    from app.core.ai import close_openai_client, get_chat_response
+
+    messages = [
+        {"role": "system", "content": "You are a professional medical assistant."},
+        {"role": "user", "content": "Boshim og'riyapti, qaysi shifokorga borishim kerak?"},
+    ]
+
+    legacy = report(
+        "legacy",
+        await measure(lambda: legacy_chat_response(messages, base_url), args.messages),
+    )
+    current = report(
+        "current", await measure(lambda: get_chat_response(messages), args.messages)
+    )
+    print(f"overhead saved per message: {legacy - current:.3f}ms")
+
+    await close_openai_client()
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+/doctors/search latency on a large synthetic catalog.
+
+Inside one transaction that is rolled back at the end, inserts `--doctors`
+synthetic doctors (Latin and Cyrillic names, specialties, about texts),
+ANALYZEs, then times DoctorService.search for exact, prefix, Cyrillic and
+misspelled queries against the database in DATABASE__ASYNC_DSN:
+
+    python -m benchmarks.bench_doctor_search --doctors 100000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import insert, text
+
+from app.core.database import AsyncSessionFactory
+from app.core.search import normalize
+from app.models.doctors import DoctorModel
+from app.models.hospitals import HospitalModel
+from app.models.locations import DistrictModel, RegionModel
+from app.service.doctors import DoctorService
+
+FIRST = ["Alisher", "Дилшод", "Otabek", "Шахноза", "Gulnora", "Жасур", "Sardor", "Ўткир", "Nodira", "Farrux"]
+LAST = ["Karimov", "Шарипов", "Toshmatov", "Юсупова", "Rahimova", "Ғуломов", "Qodirov", "Xolmatov", "Назаров"]
+SPECIALTIES = ["Kardiolog", "Невролог", "Pediatr", "Stomatolog", "Окулист", "Terapevt", "Xirurg", "Dermatolog"]
+QUERIES = {
+    "exact": "Sharipov",
+    "cyrillic": "Шарипов кардиолог",
+    "prefix": "kard",
+    "typo": "Sharipvo",
+    "about": "tajriba",
+}
+
+
+def fake_rows(n: int, hospital_id: uuid.UUID) -> list[dict]:
+    rows = []
+    for _ in range(n):
+        first, last, prof = random.choice(FIRST), random.choice(LAST), random.choice(SPECIALTIES)
+        about = f"{random.randint(1, 30)} yillik tajriba, {prof.lower()}"
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "first_name": first,
+                "last_name": last,
+                "professional": prof,
+                "about": about,
+                "hospital_id": hospital_id,
+                "search_text": normalize(first, last, prof),
+                "search_about": normalize(about),
+            }
+        )
+    return rows
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    async with AsyncSessionFactory() as db:
+        region_id, district_id, hospital_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        await db.execute(insert(RegionModel).values(id=region_id, name="bench"))
+        await db.execute(insert(DistrictModel).values(id=district_id, name="bench", region_id=region_id))
+        await db.execute(
+            insert(HospitalModel).values(
+                id=hospital_id, name="bench", region_id=region_id, district_id=district_id
+            )
+        )
+        rows = fake_rows(args.doctors, hospital_id)
+        for i in range(0, len(rows), 5000):
+            await db.execute(insert(DoctorModel), rows[i:i + 5000])
+        await db.execute(text("ANALYZE doctors"))
+
+        svc = DoctorService(db)
+        try:
+            for name, q in QUERIES.items():
+                await svc.search(q)  # warm the plan and the buffer cache
+                timings = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    page = await svc.search(q)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                timings.sort()
+                print(
+                    f"{name:<9} {q!r:<22} hits/page={len(page['items']):>2}  "
+                    f"p50={statistics.median(timings):7.2f}ms  p95={timings[int(len(timings) * 0.95) - 1]:7.2f}ms"
+                )
+        finally:
+            await db.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
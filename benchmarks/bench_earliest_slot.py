@@ -0,0 +1,123 @@
+"""
+Earliest-free-slot search over many doctors, without the database.
+
+  per-call : what the app had to do before - for every doctor and day,
+             re-parse working_hours with strptime, walk 30-minute slots and
+             test each against that day's bookings (get_available_slots)
+  bitmap   : earliest_openings - compiled schedules, one bitmask per
+             doctor-day (app.core.slots)
+
+Synthetic doctors work 09:00-17:00 (some split shifts) and have random
+bookings filling `--load` of their slots:
+
+    python -m benchmarks.bench_earliest_slot --doctors 300 --days 14 --load 0.8
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from app.core.working_hours import WEEKDAYS, compile_schedule
+from app.service.doctor_bookings import earliest_openings
+
+SHIFTS = ["09:00-17:00", "08:00-12:00,13:00-18:00", "10:00-14:00", "09:00-13:00,14:00-16:30"]
+
+
+def fake_doctors(n: int) -> list:
+    doctors = []
+    for _ in range(n):
+        hours = {day: random.choice(SHIFTS) for day in WEEKDAYS[:6]}
+        hours["sunday"] = None
+        doctors.append(
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                working_hours=hours,
+                schedule=compile_schedule(hours),
+                reyting=round(random.uniform(3, 5), 1),
+            )
+        )
+    return doctors
+
+
+def fake_bookings(doctors, first_day: date, days: int, load: float) -> dict:
+    bookings = defaultdict(list)
+    for doctor in doctors:
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            hours = doctor.working_hours[WEEKDAYS[day.weekday()]]
+            for part in (hours or "").split(","):
+                if not part:
+                    continue
+                start, end = (datetime.combine(day, datetime.strptime(x, "%H:%M").time()) for x in part.split("-"))
+                while start + timedelta(minutes=30) <= end:
+                    if random.random() < load:
+                        bookings[(doctor.id, day)].append((start, start + timedelta(minutes=30)))
+                    start += timedelta(minutes=30)
+    return bookings
+
+
+def per_call(doctors, bookings, first_day: date, days: int, now: datetime, limit: int) -> list:
+    openings = []
+    for doctor in doctors:
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            hours = doctor.working_hours.get(day.strftime("%A").lower())
+            if not hours:
+                continue
+            booked = {(s.time(), e.time()) for s, e in bookings.get((doctor.id, day), ())}
+            found = None
+            for part in hours.split(","):
+                start_str, end_str = part.split("-")
+                current = datetime.combine(day, datetime.strptime(start_str, "%H:%M").time())
+                end_dt = datetime.combine(day, datetime.strptime(end_str, "%H:%M").time())
+                while current < end_dt and found is None:
+                    nxt = current + timedelta(minutes=30)
+                    if current >= now and (current.time(), nxt.time()) not in booked:
+                        found = current
+                    current = nxt
+            if found is not None:
+                openings.append((found, doctor))
+                break
+    openings.sort(key=lambda o: o[0])
+    return openings[:limit]
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=300)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--load", type=float, default=0.8, help="share of slots already booked")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(1)
+    now = datetime.combine(date.today(), datetime.min.time()) + timedelta(hours=8)
+    doctors = fake_doctors(args.doctors)
+    bookings = fake_bookings(doctors, now.date(), args.days, args.load)
+
+    old = timed(lambda: per_call(doctors, bookings, now.date(), args.days, now, args.limit), args.repeat)
+    new = timed(
+        lambda: earliest_openings(doctors, bookings, now.date(), args.days, now, args.limit, 1),
+        args.repeat,
+    )
+    print(f"{args.doctors} doctors x {args.days} days, {args.load:.0%} booked")
+    print(f"per-call {old:8.2f}ms")
+    print(f"bitmap   {new:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold-import cost of app.main, measured with `python -X importtime`.
+
+Prints the slowest modules (cumulative time) and fails when the total
+exceeds the budget in import_budget.json, or when a module that must be
+loaded lazily (openai, aiogram, ...) shows up in the import graph:
+
+    python -m benchmarks.bench_import_time            # check against budget
+    python -m benchmarks.bench_import_time --update   # store a new budget
+
+Each run takes the best of --runs fresh interpreters to smooth out noise.
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+ROOT = Path(__file__).resolve().parent.parent
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(target: str) -> dict[str, tuple[int, int]]:
+    """module -> (self_us, cumulative_us) for one cold `import target`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import {target} failed:\n{proc.stderr[-2000:]}")
+    modules: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            modules[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--headroom", type=float, default=1.25)
+    args = parser.parse_args()
+
+    runs = [measure(args.target) for _ in range(args.runs)]
+    best = min(runs, key=lambda r: r[args.target][1])
+    total_ms = best[args.target][1] / 1000
+
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    ranked = sorted(best.items(), key=lambda kv: kv[1][1], reverse=True)
+    for name, (self_us, cum_us) in ranked[: args.top]:
+        print(f"{cum_us / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {name}")
+    print(f"\ntotal import {args.target}: {total_ms:.1f}ms ({len(best)} modules)")
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    if args.update:
+        budget["max_total_ms"] = round(total_ms * args.headroom, 1)
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"budget updated: {budget['max_total_ms']}ms")
+        return
+
+    failures = []
+    if total_ms > budget["max_total_ms"]:
+        failures.append(f"total {total_ms:.1f}ms exceeds budget {budget['max_total_ms']}ms")
+    for name in budget["lazy_modules"]:
+        if name in best:
+            failures.append(f"{name} is imported eagerly ({best[name][1] / 1000:.1f}ms)")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+    print(f"OK: within budget of {budget['max_total_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Latency of an unrelated endpoint while a burst of logins is being verified.
+
+Two tiny ASGI apps expose /login (one Argon2 verify) and /ping (no work).
+"inline" verifies on the event loop like the old verify_password did;
+"pool" goes through PasswordHasher. While `--logins` logins are in flight
+/ping is hit repeatedly and its latency percentiles are reported:
+
+    python -m benchmarks.bench_login_storm --logins 200 --pings 400
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.passwords import PasswordHasher, hash_password_sync, verify_password_sync
+
+
+def build_app(hasher: PasswordHasher | None, hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        if hasher is None:
+            ok = verify_password_sync("secret-password", hashed)
+        else:
+            ok = await hasher.verify("secret-password", hashed)
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+async def run(app: FastAPI, logins: int, pings: int) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        timings: list[float] = []
+
+        async def ping_loop() -> None:
+            for _ in range(pings):
+                t0 = time.perf_counter()
+                await client.get("/ping")
+                timings.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0.001)
+
+        storm = [client.post("/login") for _ in range(logins)]
+        await asyncio.gather(ping_loop(), *storm)
+        return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{name:<7} /ping p50={p50:8.2f}ms  p99={p99:8.2f}ms  max={timings[-1]:8.2f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--pings", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    hashed = hash_password_sync("secret-password")
+
+    report("inline", await run(build_app(None, hashed), args.logins, args.pings))
+
+    hasher = PasswordHasher(max_workers=args.workers, max_concurrency=args.concurrency)
+    try:
+        # start the worker processes before measuring
+        await hasher.verify("secret-password", hashed)
+        report("pool", await run(build_app(hasher, hashed), args.logins, args.pings))
+        print(f"hasher: {hasher.stats()}")
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Bytes and client decode time of one list screen's avatars.
+
+A list screen shows `--per-screen` doctors with a photo each. Compared:
+
+  base64   : the original JPEG inlined in the JSON, as before the blob store
+  original : the original fetched from /photos/{digest}
+  thumb    : the "thumb" variant rendered by ImageProcessor
+
+Decode time is a full Pillow decode of every image on the screen, a stand-in
+for what the phone does before it can paint:
+
+    python -m benchmarks.bench_photo_variants --per-screen 20 --side 2400
+"""
+import argparse
+import asyncio
+import base64
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from PIL import Image
+
+from app.core.images import ImageProcessor, render_variants
+
+
+def synthetic_photo(side: int, seed: int) -> bytes:
+    """A noisy gradient: compresses roughly like a camera photo, unlike a flat fill."""
+    noise = Image.effect_noise((side, side), 40 + seed % 20)
+    gradient = Image.linear_gradient("L").resize((side, side))
+    img = Image.merge("RGB", (noise, gradient, gradient.transpose(Image.Transpose.ROTATE_90)))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=88)
+    return out.getvalue()
+
+
+def decode_ms(images: list[bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for data in images:
+            with Image.open(io.BytesIO(data)) as img:
+                img.load()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+async def render_all(paths: list[str], workers: int, concurrency: int) -> tuple[list[dict], float]:
+    processor = ImageProcessor(max_workers=workers, max_concurrency=concurrency)
+    try:
+        await processor.render(paths[0])  # spawn the workers before timing
+        t0 = time.perf_counter()
+        rendered = await asyncio.gather(*(processor.render(p) for p in paths))
+        return rendered, (time.perf_counter() - t0) * 1000
+    finally:
+        processor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--per-screen", type=int, default=20)
+    parser.add_argument("--side", type=int, default=2400)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    originals = [synthetic_photo(args.side, i) for i in range(args.per_screen)]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, data in enumerate(originals):
+            path = os.path.join(tmp, f"{i}.jpg")
+            with open(path, "wb") as f:
+                f.write(data)
+            paths.append(path)
+
+        t0 = time.perf_counter()
+        render_variants(paths[0])
+        inline_ms = (time.perf_counter() - t0) * 1000
+        rendered, pool_ms = asyncio.run(render_all(paths, args.workers, args.concurrency))
+
+    thumbs = [variants["thumb"] for variants in rendered]
+    inlined = [base64.b64encode(data) for data in originals]
+    rows = [
+        ("base64", sum(len(b) for b in inlined), decode_ms(originals, args.repeat)),
+        ("original", sum(len(b) for b in originals), decode_ms(originals, args.repeat)),
+        ("thumb", sum(len(b) for b in thumbs), decode_ms(thumbs, args.repeat)),
+    ]
+    print(f"{args.per_screen} avatars per screen, {args.side}x{args.side} JPEG sources")
+    for name, size, ms in rows:
+        print(f"{name:<9} {size / 1024:10.1f} KiB  decode {ms:8.1f}ms")
+    print(
+        f"render: {inline_ms:.1f}ms for one photo inline, "
+        f"{pool_ms:.1f}ms for the screen on {args.workers} workers"
+    )
+
+
+if __name__ == "__main__":
+    main()
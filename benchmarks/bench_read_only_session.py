@@ -0,0 +1,74 @@
+"""
+Per-request cost of the read-write vs read-only session modes of get_db.
+
+Runs the same small catalog read through both session factories against the
+database in DATABASE__ASYNC_DSN and reports latency percentiles:
+
+    python -m benchmarks.bench_read_only_session --requests 2000
+
+read-write : BEGIN, SELECT, COMMIT (what every GET paid before)
+read-only  : BEGIN READ ONLY, SELECT, released on close without COMMIT
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionFactory, ReadOnlySessionFactory, async_engine
+from app.models.locations import RegionModel
+
+
+async def _read_write_request() -> None:
+    async with AsyncSessionFactory() as session:
+        await session.execute(select(RegionModel.id).limit(20))
+        await session.commit()
+
+
+async def _read_only_request() -> None:
+    async with ReadOnlySessionFactory() as session:
+        await session.execute(select(RegionModel.id).limit(20))
+
+
+async def _measure(fn, n: int, concurrency: int) -> list[float]:
+    timings: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            await fn()
+            timings.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return timings
+
+
+def _report(name: str, timings: list[float]) -> float:
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    mean = statistics.fmean(timings)
+    print(f"{name:<11} mean={mean:7.3f}ms  p50={p50:7.3f}ms  p99={p99:7.3f}ms")
+    return mean
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    # warm the pool so connection setup is not measured
+    await _measure(_read_write_request, args.concurrency * 2, args.concurrency)
+
+    rw = _report("read-write", await _measure(_read_write_request, args.requests, args.concurrency))
+    ro = _report("read-only", await _measure(_read_only_request, args.requests, args.concurrency))
+    print(f"saved per request: {rw - ro:.3f}ms ({(rw - ro) / rw * 100:.1f}%)")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Serialization cost of a /doctors response with 10k rows.
+
+  default : what FastAPI did per request - validate against the response
+            model, jsonable_encoder, then stdlib json.dumps
+  orjson  : same validation, rendered by ORJSONResponse
+  adapter : json_list_response - one cached TypeAdapter validates the ORM
+            rows and pydantic-core writes the JSON bytes directly
+
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import list_adapter
+from app.schemas.base import DEFAULT_WORKING_HOURS
+from app.schemas.doctors import DoctorResponseSchema
+
+
+def fake_doctors(n: int) -> list[SimpleNamespace]:
+    hospitals = [
+        SimpleNamespace(id=uuid.uuid4(), name=f"Klinika {i}") for i in range(max(n // 50, 1))
+    ]
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            first_name=f"Ism{i}",
+            last_name=f"Familiya{i}",
+            professional="Kardiolog",
+            about="Tajribali shifokor, 10 yillik tajriba." * 3,
+            reyting=4.5,
+            hospital=hospitals[i % len(hospitals)],
+            working_hours=dict(DEFAULT_WORKING_HOURS),
+        )
+        for i in range(n)
+    ]
+
+
+def default_path(rows) -> bytes:
+    validated = TypeAdapter(List[DoctorResponseSchema]).validate_python(rows, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def orjson_path(rows) -> bytes:
+    validated = TypeAdapter(List[DoctorResponseSchema]).validate_python(rows, from_attributes=True)
+    return orjson.dumps(jsonable_encoder(validated))
+
+
+def adapter_path(rows) -> bytes:
+    adapter = list_adapter(DoctorResponseSchema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def bench(name: str, fn, rows, repeat: int) -> float:
+    fn(rows)
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn(rows)
+        timings.append((time.perf_counter() - t0) * 1000)
+    median = statistics.median(timings)
+    print(f"{name:<8} median={median:8.2f}ms  min={min(timings):8.2f}ms  bytes={len(body)}")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = fake_doctors(args.rows)
+    base = bench("default", default_path, rows, args.repeat)
+    bench("orjson", orjson_path, rows, args.repeat)
+    fast = bench("adapter", adapter_path, rows, args.repeat)
+    print(f"speed-up: {base / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+
+# app.core.config reads these at import time; real values come from .env
+os.environ.setdefault("AI__TEMPERATURE", "0")
+os.environ.setdefault("AI__MODEL_NAME", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
@@ -0,0 +1,134 @@
+import os
+import time
+import uuid
+
+import pytest
+
+from app.core.blobstore import RANGE_NOT_SATISFIABLE, BlobStore, _parse_range
+
+OLD = time.time() - 7200
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(92))
+
+
+def test_reupload_refreshes_mtime_of_existing_blob(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put_bytes(b"same image")
+    os.utime(store.path(digest), (OLD, OLD))
+    assert list(store.iter_digests(3600)) == [digest]
+
+    assert store.put_bytes(b"same image") == digest
+    assert list(store.iter_digests(3600)) == []
+
+
+def test_delete_skips_blob_touched_since_listing(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put_bytes(b"image")
+    os.utime(store.path(digest), (OLD, OLD))
+    listed = list(store.iter_digests(3600))
+
+    store.put_bytes(b"image")  # re-upload between listing and sweep
+    assert not store.delete(listed[0], 3600)
+    assert store.path(digest).exists()
+
+    os.utime(store.path(digest), (OLD, OLD))
+    assert store.delete(digest, 3600)
+    assert not store.path(digest).exists()
+
+
+def test_purge_tmp_removes_only_stale_files(tmp_path):
+    store = BlobStore(str(tmp_path))
+    tmp = store._tmp_dir()
+    stale, fresh = tmp / "stale", tmp / "fresh"
+    stale.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    os.utime(stale, (OLD, OLD))
+
+    assert store.purge_tmp(3600) == 1
+    assert not stale.exists() and fresh.exists()
+
+
+def test_oversized_photo_upload_is_refused_before_parsing(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.core.config import config
+    from app.main import create_app
+
+    monkeypatch.setattr(config, "PHOTO_MAX_BYTES", 1024)
+    client = TestClient(create_app())
+    url = f"/doctors/{uuid.uuid4()}/photo"
+    body = b"\\xff\\xd8\\xff" + b"\\0" * (200 * 1024)
+
+    # declared Content-Length
+    response = client.post(url, files={"file": ("big.jpg", body, "image/jpeg")})
+    assert response.status_code == 413
+
+    # chunked, no Content-Length: cut off while streaming
+    def chunks():
+        for _ in range(100):
+            yield b"\\0" * 64 * 1024
+
+    response = client.post(
+        url,
+        content=chunks(),
+        headers={"Content-Type": "multipart/form-data; boundary=x"},
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=95-200", (95, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=100-", RANGE_NOT_SATISFIABLE),
+        ("bytes=-0", RANGE_NOT_SATISFIABLE),
+        # not supported or malformed: ignored, full body
+        ("bytes=0-9,20-29", None),
+        ("bytes=9-0", None),
+        ("bytes=-", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert _parse_range(header, 100) == expected
+
+
+@pytest.fixture
+def blob_client(tmp_path, monkeypatch):
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+
+    from app.core import blobstore
+
+    store = BlobStore(str(tmp_path))
+    monkeypatch.setattr(blobstore, "blob_store", store)
+    digest = store.put_bytes(PNG)
+    app = FastAPI()
+
+    @app.get("/blob")
+    async def get_blob(request: Request):
+        return await blobstore.blob_response(request, digest)
+
+    return TestClient(app), f'"{digest}"'
+
+
+@pytest.mark.parametrize(
+    "headers, status, body",
+    [
+        ({"Range": "bytes=0-9"}, 206, PNG[:10]),
+        ({"Range": "bytes=0-9,20-29"}, 200, PNG),
+        ({"Range": "bytes=9-0"}, 200, PNG),
+        ({"Range": f"bytes={len(PNG)}-"}, 416, b""),
+        ({"Range": "bytes=0-9", "If-Range": '"stale"'}, 200, PNG),
+        ({"Range": "bytes=0-9", "If-Range": "ETAG"}, 206, PNG[:10]),
+    ],
+)
+def test_blob_response_ranges(blob_client, headers, status, body):
+    client, etag = blob_client
+    headers = {k: etag if v == "ETAG" else v for k, v in headers.items()}
+    response = client.get("/blob", headers=headers)
+    assert response.status_code == status
+    assert response.content == body
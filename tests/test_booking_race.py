@@ -0,0 +1,122 @@
+"""
+Concurrent bookings against a real Postgres migrated to head (btree_gist).
+
+Set TEST_DATABASE__ASYNC_DSN to run, e.g.
+postgresql+asyncpg://postgres@localhost:5432/medlife_test
+"""
+import asyncio
+import os
+import uuid
+from collections import Counter
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.reviews import ReviewsModel  # noqa: F401  UserModel.reviews needs the mapper
+from app.models import DistrictModel, DoctorModel, HospitalModel, QueueModel, RegionModel, UserModel
+from app.schemas.doctor_bookings import BookingCreateSchema
+from app.service.doctor_bookings import DoctorBookingService
+
+DSN = os.getenv("TEST_DATABASE__ASYNC_DSN")
+CONCURRENCY = 500
+
+pytestmark = [
+    pytest.mark.skipif(not DSN, reason="TEST_DATABASE__ASYNC_DSN not set"),
+    pytest.mark.asyncio(loop_scope="module"),
+]
+
+DAY = date(2031, 3, 4)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def sessions():
+    engine = create_async_engine(DSN, pool_size=50, max_overflow=0, pool_timeout=120)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    yield factory
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def doctor(sessions):
+    suffix = uuid.uuid4().hex[:8]
+    region = RegionModel(name=f"race-{suffix}")
+    district = DistrictModel(name="race", region=region)
+    hospital = HospitalModel(name="race", region=region, district=district)
+    doctor = DoctorModel(first_name="Race", last_name="Test", hospital=hospital)
+    user = UserModel(phone_number=f"+race{suffix}", hashed_password="x")
+    async with sessions() as db:
+        db.add_all([region, district, hospital, doctor, user])
+        await db.commit()
+    yield doctor.id, user.id
+    async with sessions() as db:
+        await db.execute(delete(QueueModel).where(QueueModel.doctor_id == doctor.id))
+        for model, row_id in (
+            (UserModel, user.id),
+            (HospitalModel, hospital.id),
+            (DistrictModel, district.id),
+            (RegionModel, region.id),
+        ):
+            await db.execute(delete(model).where(model.id == row_id))
+        await db.commit()
+
+
+async def burst(sessions, doctor_id, payload, keys):
+    outcomes, ids = Counter(), set()
+
+    async def one(key):
+        async with sessions() as db:
+            try:
+                booking = await DoctorBookingService(db).book_slot(doctor_id, payload, key)
+            except HTTPException as exc:
+                outcomes[exc.status_code] += 1
+            else:
+                outcomes[201] += 1
+                ids.add(booking.id)
+
+    await asyncio.gather(*(one(key) for key in keys))
+    return outcomes, ids
+
+
+def slot(user_id, start, end):
+    return BookingCreateSchema(user_id=user_id, date=DAY, start_time=start, end_time=end)
+
+
+async def test_one_winner_per_slot(sessions, doctor):
+    doctor_id, user_id = doctor
+    outcomes, ids = await burst(sessions, doctor_id, slot(user_id, "09:00", "09:30"), [None] * CONCURRENCY)
+    assert outcomes == {201: 1, 409: CONCURRENCY - 1}
+
+
+async def test_overlapping_range_is_rejected(sessions, doctor):
+    doctor_id, user_id = doctor
+    async with sessions() as db:
+        with pytest.raises(HTTPException) as exc:
+            await DoctorBookingService(db).book_slot(doctor_id, slot(user_id, "09:15", "09:45"))
+    assert exc.value.status_code == 409
+
+
+async def test_idempotency_key_replays_under_concurrency(sessions, doctor):
+    doctor_id, user_id = doctor
+    key = f"test-{uuid.uuid4()}"
+    outcomes, ids = await burst(sessions, doctor_id, slot(user_id, "10:00", "10:30"), [key] * CONCURRENCY)
+    assert outcomes == {201: CONCURRENCY}
+    assert len(ids) == 1
+    async with sessions() as db:
+        rows = await db.scalar(select(func.count()).where(QueueModel.idempotency_key == key))
+    assert rows == 1
+
+
+async def test_idempotency_key_reused_for_another_slot(sessions, doctor):
+    doctor_id, user_id = doctor
+    key = f"test-{uuid.uuid4()}"
+    async with sessions() as db:
+        await DoctorBookingService(db).book_slot(doctor_id, slot(user_id, "11:00", "11:30"), key)
+    async with sessions() as db:
+        with pytest.raises(HTTPException) as exc:
+            await DoctorBookingService(db).book_slot(doctor_id, slot(user_id, "12:00", "12:30"), key)
+    assert exc.value.status_code == 422
@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from app.core.security import SUPER_ADMIN_ROLE_ID, get_current_user
+from app.models.users import UserModel
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(config, "DEBUG_ENDPOINTS_ENABLED", True)
+    app = create_app()
+    yield app, TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def as_user(app, role_id):
+    user = UserModel(id=uuid.uuid4(), phone_number="+998000000000", role_id=role_id)
+    app.dependency_overrides[get_current_user] = lambda: user
+
+
+def test_debug_endpoints_disabled_by_default():
+    from app.main import create_app
+
+    assert config.DEBUG_ENDPOINTS_ENABLED is False
+    assert TestClient(create_app()).get("/debug/pool").status_code == 404
+
+
+def test_debug_requires_authentication(client):
+    _, http = client
+    assert http.get("/debug/pool").status_code == 401
+
+
+def test_debug_rejects_non_admins(client):
+    app, http = client
+    as_user(app, uuid.UUID("8497eb6c-0eea-40e7-8467-f8e393f56811"))
+    assert http.get("/debug/pool").status_code == 403
+
+
+def test_debug_allows_super_admins(client):
+    app, http = client
+    as_user(app, SUPER_ADMIN_ROLE_ID)
+    assert http.get("/debug/pool").status_code == 200
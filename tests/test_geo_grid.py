@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from app.core.geo import GeoGrid, haversine_km
+
+TASHKENT = (41.3, 69.25)
+
+
+class CountingCells(dict):
+    lookups = 0
+
+    def get(self, key, default=None):
+        self.lookups += 1
+        return super().get(key, default)
+
+
+@pytest.fixture(scope="module")
+def points():
+    rnd = random.Random(15)
+    return [
+        (TASHKENT[0] + rnd.uniform(-0.5, 0.5), TASHKENT[1] + rnd.uniform(-0.5, 0.5), i)
+        for i in range(5000)
+    ]
+
+
+def counting_grid(points):
+    grid = GeoGrid(points)
+    grid._cells = CountingCells(grid._cells)
+    return grid
+
+
+def brute_force(points, lat, lon, k, radius_km=None):
+    dists = sorted((haversine_km(lat, lon, p_lat, p_lon), i) for p_lat, p_lon, i in points)
+    return [(d, i) for d, i in dists if radius_km is None or d <= radius_km][:k]
+
+
+def box_cells(grid):
+    min_row, max_row, min_col, max_col = grid._bounds
+    return (max_row - min_row + 1) * (max_col - min_col + 1)
+
+
+@pytest.mark.parametrize(
+    "lat, lon, radius_km",
+    [
+        (*TASHKENT, None),
+        (*TASHKENT, 2.0),
+        (41.31, 69.8, 5.0),
+        (0.0, 0.0, None),
+        (-89.0, -179.0, None),
+        (89.0, 179.0, None),
+    ],
+)
+def test_nearest_matches_brute_force_within_one_box_pass(points, lat, lon, radius_km):
+    grid = counting_grid(points)
+    assert grid.nearest(lat, lon, 10, radius_km) == brute_force(points, lat, lon, 10, radius_km)
+    assert grid._cells.lookups <= box_cells(grid)
+
+
+def test_local_lookup_touches_few_cells(points):
+    grid = counting_grid(points)
+    grid.nearest(*TASHKENT, 10)
+    assert grid._cells.lookups <= 25
+
+
+@pytest.mark.parametrize(
+    "lat, lon",
+    [(-89.0, -179.0), (89.0, 0.0), (0.0, 0.0), (41.3, 90.0)],
+)
+def test_radius_short_of_the_box_returns_without_scanning(points, lat, lon):
+    grid = counting_grid(points)
+    assert grid.nearest(lat, lon, 10, radius_km=1000) == []
+    assert grid._cells.lookups == 0
+
+
+def test_far_query_over_sparse_box_scans_points_not_cells():
+    rnd = random.Random(16)
+    points = [(rnd.uniform(37, 46), rnd.uniform(56, 74), i) for i in range(2000)]
+    grid = counting_grid(points)
+    assert box_cells(grid) > grid.size
+    assert grid.nearest(-89.0, -179.0, 10) == brute_force(points, -89.0, -179.0, 10)
+    assert grid._cells.lookups == 0
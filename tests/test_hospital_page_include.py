@@ -0,0 +1,34 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_read_db
+from app.core.security import get_current_user
+from app.models.users import UserModel
+
+
+@pytest.fixture(scope="module")
+def client():
+    from app.main import create_app
+
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: UserModel(phone_number="+998000000000")
+    # validation fails before the session is used
+    app.dependency_overrides[get_read_db] = lambda: None
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.mark.parametrize(
+    "include",
+    ["doctorsreviews", "doctors,", ",doctors", "doctors,,reviews", "doctors,photos"],
+)
+def test_unknown_or_malformed_sections_are_rejected(client, include):
+    response = client.get(f"/hospitals/{uuid.uuid4()}/page", params={"include": include})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("include", ["", "doctors", "reviews,doctors", "doctors,services,reviews"])
+def test_known_sections_pass_validation(client, include):
+    response = client.get(f"/hospitals/{uuid.uuid4()}/page", params={"include": include})
+    assert response.status_code != 422
@@ -0,0 +1,69 @@
+"""The list endpoints SELECT exactly the columns their response renders."""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.doctors import DoctorModel
+from app.models.hospitals import HospitalModel
+from app.schemas.doctors import DoctorResponseSchema
+from app.schemas.hospitals import HospitalResponseSchema
+from app.service.doctors import DoctorService
+from app.service.hospitals import HospitalService
+
+# selected to drive relationship loads, not rendered themselves
+LOADER_KEYS = {"hospital_id", "region_id", "district_id"}
+
+
+def selected_columns(stmt) -> list[str]:
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return [name for name, *_ in compiled._result_columns]
+
+
+def test_doctor_list_columns():
+    # GET /doctors, /doctors/by-location
+    assert selected_columns(DoctorService._list_stmt()) == [
+        "id",
+        "first_name",
+        "last_name",
+        "professional",
+        "about",
+        "photo_digest",
+        "photo_variants",
+        "reyting",
+        "working_hours",
+        "hospital_id",
+    ]
+
+
+def test_hospital_list_columns():
+    # GET /hospitals
+    assert selected_columns(HospitalService._list_stmt()) == [
+        "id",
+        "name",
+        "address",
+        "orientir",
+        "photo_digest",
+        "photo_variants",
+        "reyting",
+        "region_id",
+        "district_id",
+        "coordinates",
+        "latitude",
+        "longitude",
+        "working_hours",
+        "phone_number",
+    ]
+
+
+@pytest.mark.parametrize(
+    "stmt, model, schema",
+    [
+        (DoctorService._list_stmt(), DoctorModel, DoctorResponseSchema),
+        (HospitalService._list_stmt(), HospitalModel, HospitalResponseSchema),
+    ],
+)
+def test_list_selects_only_rendered_columns(stmt, model, schema):
+    projected = set(selected_columns(stmt))
+    assert projected - set(schema.model_fields) - LOADER_KEYS == set()
+    # the wide/internal columns stay out of list queries
+    assert {"schedule", "created_at", "modified_at"} <= set(selected_columns(select(model))) - projected
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_pool, pool_stats, registry
+
+
+@pytest.mark.asyncio
+async def test_checkout_after_dispose_keeps_metrics():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=InstrumentedQueuePool)
+    metrics = instrument_pool(engine.sync_engine, "test-dispose")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        old_pool = engine.sync_engine.pool
+
+        await engine.dispose()
+        assert engine.sync_engine.pool is not old_pool
+
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+
+        assert registry["test-dispose"] is metrics
+        assert metrics.pool is engine.sync_engine.pool
+        assert metrics.checkouts == 2
+        assert metrics.checkins == 2
+        assert metrics.checkout_wait.n == 2
+        assert pool_stats()["test-dispose"]["checked_out"] == 0
+    finally:
+        registry.pop("test-dispose", None)
+        await engine.dispose()
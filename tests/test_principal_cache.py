@@ -0,0 +1,35 @@
+import uuid
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.database import mark_changed
+from app.core.security import principal_cache
+
+
+def cached_principal():
+    user_id = uuid.uuid4()
+    principal_cache.set(user_id, {"id": user_id})
+    return user_id
+
+
+def test_principal_is_dropped_only_after_commit():
+    user_id, other_id = cached_principal(), cached_principal()
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("SELECT 1"))
+        mark_changed(session, "users", user_id)
+        assert principal_cache.get(user_id) is not None  # not committed yet
+        session.commit()
+    assert principal_cache.get(user_id) is None
+    assert principal_cache.get(other_id) is not None
+
+
+def test_rolled_back_change_keeps_principal():
+    user_id = cached_principal()
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("SELECT 1"))
+        mark_changed(session, "users", user_id)
+        session.rollback()
+        session.execute(text("SELECT 1"))
+        session.commit()
+    assert principal_cache.get(user_id) is not None
@@ -0,0 +1,19 @@
+from fastapi.testclient import TestClient
+
+from app.core import query_stats
+from app.core.config import config
+from app.core.query_stats import UNMATCHED_ROUTE
+
+
+def test_unmatched_requests_share_one_route_key(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(config, "QUERY_STATS_ENABLED", True)
+    monkeypatch.setattr(query_stats, "route_stats", {})
+    client = TestClient(create_app())
+    for path in ("/wp-login.php", "/.env", "/no/such/route"):
+        assert client.get(path).status_code == 404
+    client.request("PROPFIND", "/.git/config")
+
+    assert list(query_stats.route_stats) == [UNMATCHED_ROUTE]
+    assert query_stats.route_stats[UNMATCHED_ROUTE].requests == 4
@@ -0,0 +1,56 @@
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.database import PRIMARY_COOKIE, get_db, should_use_primary
+
+
+def make_app():
+    from app.main import create_app
+
+    app = create_app()
+
+    @app.post("/_write")
+    async def write(db=Depends(get_db)):
+        await db.execute(text("CREATE TEMP TABLE t (x INTEGER)"))
+        return {}
+
+    @app.get("/_read")
+    async def read():
+        return {"primary": should_use_primary()}
+
+    return app
+
+
+def test_write_pins_client_to_primary_across_workers(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(
+        database, "AsyncSessionFactory", sessionmaker(bind=engine, class_=AsyncSession)
+    )
+    monkeypatch.setattr(database, "read_engine", object())  # a replica is configured
+    monkeypatch.setattr(database, "_recent_writers", database.TTLCache(100, 60))
+
+    with TestClient(make_app()) as worker_a:
+        response = worker_a.post("/_write")
+    assert response.status_code == 200
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{PRIMARY_COOKIE}=1;")
+    assert "Max-Age=5" in cookie and "HttpOnly" in cookie
+
+    # another worker process: no in-memory record of the write
+    database._recent_writers.clear()
+    with TestClient(make_app()) as worker_b:
+        assert worker_b.get("/_read").json() == {"primary": False}
+        worker_b.cookies.set(PRIMARY_COOKIE, "1")
+        assert worker_b.get("/_read").json() == {"primary": True}
+
+
+def test_reads_do_not_set_the_cookie(monkeypatch):
+    monkeypatch.setattr(database, "read_engine", object())
+    with TestClient(make_app()) as client:
+        response = client.get("/_read")
+    assert response.json() == {"primary": False}
+    assert PRIMARY_COOKIE not in response.headers.get("set-cookie", "")
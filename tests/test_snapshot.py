@@ -0,0 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.cache import Snapshot
+
+
+@asynccontextmanager
+async def session_factory():
+    yield "primary"
+
+
+@pytest.mark.asyncio
+async def test_build_overlapping_invalidate_is_not_cached():
+    rows = ["before"]
+    build_started, release = asyncio.Event(), asyncio.Event()
+    sessions = []
+
+    async def build(db):
+        sessions.append(db)
+        value = list(rows)
+        build_started.set()
+        await release.wait()
+        return value
+
+    snapshot = Snapshot(build, ttl=300, session_factory=session_factory)
+    reader = asyncio.create_task(snapshot.get())
+    await build_started.wait()
+
+    # a write commits while the build is still reading
+    rows[:] = ["after"]
+    snapshot.invalidate()
+    release.set()
+
+    assert await reader == ["after"]
+    assert await snapshot.get() == ["after"]
+    assert snapshot.stats()["discarded_builds"] == 1
+    assert sessions == ["primary", "primary"]
+
+
+@pytest.mark.asyncio
+async def test_value_is_reused_until_invalidated():
+    calls = 0
+
+    async def build(db):
+        nonlocal calls
+        calls += 1
+        return calls
+
+    snapshot = Snapshot(build, ttl=300, session_factory=session_factory)
+    assert await snapshot.get() == 1
+    assert await snapshot.get() == 1
+    snapshot.invalidate()
+    assert await snapshot.get() == 2